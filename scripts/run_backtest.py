@@ -3,6 +3,7 @@ User-facing script to configure and run a backtest.
 """
 from __future__ import annotations
 import argparse
+from pathlib import Path
 import pandas as pd
 
 # Important: Import all strategy files so the @register_strategy decorator runs
@@ -20,6 +21,38 @@ from qt.backtest.costs import NoCost
 from qt.evaluation.tearsheet import create_plotly_tearsheet
 
 
+# Explicit column types for CSV input: skips per-column dtype inference.
+# Symbols are categorical, so consumers read the universe from the
+# categories and group by integer codes instead of scanning strings.
+CSV_DTYPES = {
+    "symbol": "category",
+    "open": "float64",
+    "high": "float64",
+    "low": "float64",
+    "close": "float64",
+    "volume": "float64",
+    "interval": "string",
+    "venue": "string",
+}
+
+
+def load_bars(path: str) -> pd.DataFrame:
+    """
+    Loads bar data from a Parquet or CSV file into a UTC timestamp-indexed
+    DataFrame. Parquet is columnar and typed, so it skips parsing entirely;
+    CSV is parsed with the pyarrow engine and explicit dtypes.
+    """
+    if Path(path).suffix.lower() in (".parquet", ".pq"):
+        data = pd.read_parquet(path)
+        data["symbol"] = data["symbol"].astype("category")
+    else:
+        data = pd.read_csv(path, dtype=CSV_DTYPES, engine="pyarrow")
+
+    data["ts_utc"] = pd.to_datetime(data["ts_utc"], utc=True)
+    data.set_index("ts_utc", inplace=True)
+    return data
+
+
 def main() -> None:
     """
     Parses command-line arguments to configure and run a backtest.
@@ -35,16 +68,14 @@ def main() -> None:
         "--data",
         required=True,
         type=str,
-        help="Path to the CSV file containing historical market data.",
+        help="Path to the CSV or Parquet file containing historical market data.",
     )
     args = parser.parse_args()
 
     # --- 1. Load Data ---
     # This is a temporary substitute for the real DataLoader (Phase 3)
     try:
-        data = pd.read_csv(args.data)
-        data["ts_utc"] = pd.to_datetime(data["ts_utc"], utc=True)
-        data.set_index("ts_utc", inplace=True)
+        data = load_bars(args.data)
     except FileNotFoundError:
         print(f"Error: Data file not found at {args.data}")
         return
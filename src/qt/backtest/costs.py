@@ -3,6 +3,8 @@ Models for simulating trading costs (commissions and fees).
 """
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import final
 
 from qt.types import Fill
 
@@ -15,10 +17,38 @@ class CostModel(ABC):
         """Calculates the fee for a given fill."""
         raise NotImplementedError
 
+    def calculate_fee_raw(
+        self, order_id: str, ts_utc: datetime, symbol: str, qty: float, price: float
+    ) -> float:
+        """
+        Calculates the fee for a fill of `qty` units of `symbol` at `price`.
+
+        This lets the execution simulator price a fill before building it.
+        The default wraps the arguments in a Fill and delegates to
+        `calculate_fee`; models should override it to skip that temporary
+        Fill.
+        """
+        return self.calculate_fee(
+            Fill(order_id=order_id, ts_utc=ts_utc, symbol=symbol, qty=qty, price=price)
+        )
+
 
 class NoCost(CostModel):
-    """A simple model that assumes zero trading costs."""
+    """
+    A simple model that assumes zero trading costs.
+
+    Its fee methods are final: the execution simulator never calls them for
+    a NoCost (or subclass) model and charges no fee instead.
+    """
 
+    @final
     def calculate_fee(self, fill: Fill) -> float:
         """Returns a fee of 0."""
         return 0.0
+
+    @final
+    def calculate_fee_raw(
+        self, order_id: str, ts_utc: datetime, symbol: str, qty: float, price: float
+    ) -> float:
+        """Returns a fee of 0."""
+        return 0.0
@@ -2,17 +2,68 @@
 Handles loading historical data and populating the event queue.
 """
 from __future__ import annotations
-from typing import Dict, List, DefaultDict
-from collections import defaultdict
+from typing import Dict, Iterator, List
+import numpy as np
 import pandas as pd
 
 from qt.events import BarEvent
 from qt.types import Bar
 from qt.utils.logger import get_logger
 from .event_queue import EventQueue
+from .symbol_table import SymbolTable, default_symbol_table
 
 logger = get_logger(__name__)
 
+# Numeric bar fields stored column-wise in the point-in-time history
+_HISTORY_FIELDS = ("open", "high", "low", "close", "volume")
+# Remaining bar fields, stored as object arrays
+_OBJECT_FIELDS = ("interval", "venue", "currency", "adj_close", "source")
+
+
+class _BarHistory:
+    """
+    Append-only, column-oriented (SoA) bar history for a single symbol.
+
+    Each field lives in a preallocated NumPy array that is doubled on
+    overflow, so appends are amortized O(1) and reading the last N bars is
+    an O(1) slice (a view, not a copy).
+    """
+
+    def __init__(self, symbol: str, capacity: int = 256) -> None:
+        self.symbol = symbol
+        self.n = 0
+        self.ts = np.empty(capacity, dtype=np.int64)
+        self.columns: Dict[str, np.ndarray] = {
+            field: np.empty(capacity, dtype=np.float64) for field in _HISTORY_FIELDS
+        }
+        self.objects: Dict[str, np.ndarray] = {
+            field: np.empty(capacity, dtype=object) for field in _OBJECT_FIELDS
+        }
+
+    def _grow(self) -> None:
+        capacity = 2 * len(self.ts)
+        self.ts = np.resize(self.ts, capacity)
+        self.columns = {k: np.resize(v, capacity) for k, v in self.columns.items()}
+        self.objects = {k: np.resize(v, capacity) for k, v in self.objects.items()}
+
+    def append(self, ts_ns: int, bar: Bar) -> None:
+        i = self.n
+        if i == len(self.ts):
+            self._grow()
+        columns, objects = self.columns, self.objects
+        self.ts[i] = ts_ns
+        columns["open"][i] = bar.open
+        columns["high"][i] = bar.high
+        columns["low"][i] = bar.low
+        columns["close"][i] = bar.close
+        columns["volume"][i] = bar.volume
+        objects["interval"][i] = bar.interval
+        objects["venue"][i] = bar.venue
+        objects["currency"][i] = bar.currency
+        objects["adj_close"][i] = bar.adj_close
+        objects["source"][i] = bar.source
+        self.n = i + 1
+
 
 class DataHandler:
     """
@@ -21,65 +72,233 @@ class DataHandler:
     """
 
     def __init__(
-        self, event_queue: EventQueue, historical_data: pd.DataFrame
+        self,
+        event_queue: EventQueue,
+        historical_data: pd.DataFrame,
+        symbol_table: SymbolTable | None = None,
     ) -> None:
         """
         Initializes the DataHandler.
+
+        Args:
+            event_queue: The queue to push BarEvents onto.
+            historical_data: Bars for all symbols, indexed by timestamp.
+            symbol_table: Symbol id interner; defaults to the shared table.
         """
         self.event_queue = event_queue
         self.historical_data = historical_data
-        self.latest_prices: Dict[str, float] = {}
-        self.current_history: DefaultDict[str, List[Bar]] = defaultdict(list)
+        self.symbol_table = (
+            symbol_table if symbol_table is not None else default_symbol_table
+        )
+        if not historical_data.empty:
+            for symbol in sorted(historical_data["symbol"].unique()):
+                self.symbol_table.id(symbol)
+        # Latest close per symbol id (NaN until the symbol's first bar)
+        self.latest_prices = np.full(len(self.symbol_table), np.nan)
+        self.current_history: Dict[str, _BarHistory] = {}
+        # Timezone of the recorded timestamps (None for naive input)
+        self._ts_tz = None
 
-    def update_data(self) -> None:
-        """
-        Groups bars by timestamp, creates a single BarEvent for each timestamp,
-        and pushes them to the event queue.
+    def iter_bar_events(self, chunk_size: int = 10_000) -> Iterator[BarEvent]:
         """
-        logger.info("Preparing and pushing historical data...")
+        Lazily yields one BarEvent per unique timestamp, in chronological order.
+
+        Bar objects are only built for one chunk of roughly `chunk_size` rows
+        at a time, so peak memory is O(chunk_size) rather than O(total bars).
+        The point-in-time history and latest prices are updated as each event
+        is yielded, so a consumer never sees data from a later timestamp.
 
+        Args:
+            chunk_size: Approximate number of rows materialized per chunk.
+                Chunks always end on a timestamp boundary.
+        """
         if self.historical_data.empty:
             logger.warning("No historical data provided to the DataHandler.")
             return
 
-        sorted_df = self.historical_data.sort_index()
-
-        for timestamp, group in sorted_df.groupby(level=0):
-            bars_for_timestamp: Dict[str, Bar] = {
-                row.symbol: Bar(
-                    ts_utc=timestamp,
-                    symbol=row.symbol,
-                    open=row.open,
-                    high=row.high,
-                    low=row.low,
-                    close=row.close,
-                    volume=row.volume,
-                    interval=row.interval,
-                    venue=row.venue,
+        if self.historical_data.index.is_monotonic_increasing:
+            # Time-ordered input (the common case) needs no O(N log N) sort
+            logger.debug("Historical data is already sorted by timestamp.")
+            sorted_df = self.historical_data
+        else:
+            logger.debug("Sorting historical data by timestamp.")
+            sorted_df = self.historical_data.sort_index(kind="stable")
+        n_rows = len(sorted_df)
+
+        # Column arrays are extracted once; each chunk slices them and only
+        # converts its own rows to Python objects.
+        symbols = sorted_df["symbol"].to_numpy(dtype=object)
+        opens = sorted_df["open"].to_numpy(dtype=np.float64)
+        highs = sorted_df["high"].to_numpy(dtype=np.float64)
+        lows = sorted_df["low"].to_numpy(dtype=np.float64)
+        closes = sorted_df["close"].to_numpy(dtype=np.float64)
+        volumes = sorted_df["volume"].to_numpy(dtype=np.float64)
+        intervals = sorted_df["interval"].to_numpy(dtype=object)
+        venues = sorted_df["venue"].to_numpy(dtype=object)
+        sym_id_arr = self.symbol_table.ids(symbols)
+
+        # Group boundaries: first row offset of every unique timestamp. The
+        # index is sorted, so a linear scan of the int64 nanoseconds finds
+        # them without the sort that np.unique would do.
+        ts_i8 = sorted_df.index.asi8
+        starts = np.flatnonzero(ts_i8[1:] != ts_i8[:-1]) + 1
+        starts = np.concatenate(([0], starts))
+        ends = np.append(starts[1:], n_rows)
+
+        first_group = 0
+        while first_group < len(starts):
+            # Extend the chunk to the first group boundary at or past chunk_size
+            chunk_start = int(starts[first_group])
+            last_group = int(
+                np.searchsorted(ends, chunk_start + chunk_size, side="left")
+            )
+            last_group = min(max(last_group, first_group), len(starts) - 1)
+            chunk_end = int(ends[last_group])
+            rows = slice(chunk_start, chunk_end)
+
+            chunk_symbols = symbols[rows].tolist()
+            chunk_opens = opens[rows].tolist()
+            chunk_highs = highs[rows].tolist()
+            chunk_lows = lows[rows].tolist()
+            chunk_closes = closes[rows].tolist()
+            chunk_volumes = volumes[rows].tolist()
+            chunk_intervals = intervals[rows].tolist()
+            chunk_venues = venues[rows].tolist()
+
+            groups = range(first_group, last_group + 1)
+            timestamps = sorted_df.index[starts[groups.start : groups.stop]]
+            for timestamp, group in zip(timestamps, groups):
+                start = int(starts[group]) - chunk_start
+                end = int(ends[group]) - chunk_start
+                bars_for_timestamp: Dict[str, Bar] = {
+                    symbol: Bar(
+                        ts_utc=timestamp,
+                        symbol=symbol,
+                        open=open_,
+                        high=high,
+                        low=low,
+                        close=close,
+                        volume=volume,
+                        interval=interval,
+                        venue=venue,
+                    )
+                    for symbol, open_, high, low, close, volume, interval, venue in zip(
+                        chunk_symbols[start:end],
+                        chunk_opens[start:end],
+                        chunk_highs[start:end],
+                        chunk_lows[start:end],
+                        chunk_closes[start:end],
+                        chunk_volumes[start:end],
+                        chunk_intervals[start:end],
+                        chunk_venues[start:end],
+                    )
+                }
+                group_rows = slice(chunk_start + start, chunk_start + end)
+                bar_event = BarEvent(
+                    timestamp=timestamp,
+                    bars=bars_for_timestamp,
+                    sym_ids=sym_id_arr[group_rows],
+                    lows=lows[group_rows],
+                    highs=highs[group_rows],
+                    closes=closes[group_rows],
                 )
-                for row in group.itertuples()
-            }
-            bar_event = BarEvent(timestamp=timestamp, bars=bars_for_timestamp)
-            self.event_queue.put(bar_event)
 
-            # Update history and latest prices immediately
-            self._update_history(bar_event)
+                # Update history and latest prices as the event is released
+                self._update_history(bar_event)
+                yield bar_event
+
+            first_group = last_group + 1
 
-        logger.info(f"Successfully pushed events for {len(sorted_df.index.unique())} unique timestamps.")
+    def update_data(self) -> None:
+        """
+        Groups bars by timestamp, creates a single BarEvent for each timestamp,
+        and pushes them all to the event queue.
+
+        This materializes the whole history up front; the engine streams
+        `iter_bar_events` instead.
+        """
+        logger.info("Preparing and pushing historical data...")
+        bar_events: List[BarEvent] = list(self.iter_bar_events())
+        # The events are already in chronological order, so bulk-load them
+        self.event_queue.put_many(bar_events)
+        logger.info(f"Successfully pushed events for {len(bar_events)} unique timestamps.")
 
     def _update_history(self, bar_event: BarEvent) -> None:
         """
         Updates the point-in-time history with the latest bar data.
-        The engine will call this method after processing each BarEvent.
+        Called for each BarEvent as it is released by `iter_bar_events`.
         """
+        timestamp = pd.Timestamp(bar_event.timestamp)
+        ts_ns = timestamp.value
+        if not self.current_history:
+            self._ts_tz = timestamp.tz
         for symbol, bar in bar_event.bars.items():
-            self.current_history[symbol].append(bar)
-            self.latest_prices[symbol] = bar.close
+            history = self.current_history.get(symbol)
+            if history is None:
+                history = self.current_history[symbol] = _BarHistory(symbol)
+            history.append(ts_ns, bar)
+
+        if bar_event.sym_ids is not None:
+            sym_ids, closes = bar_event.sym_ids, bar_event.closes
+        else:
+            bars = bar_event.bars
+            sym_ids = np.fromiter(
+                (self.symbol_table.id(symbol) for symbol in bars), dtype=np.intp, count=len(bars)
+            )
+            closes = np.fromiter(
+                (bar.close for bar in bars.values()), dtype=np.float64, count=len(bars)
+            )
+
+        if len(self.latest_prices) < len(self.symbol_table):
+            grown = np.full(len(self.symbol_table), np.nan)
+            grown[: len(self.latest_prices)] = self.latest_prices
+            self.latest_prices = grown
+        self.latest_prices[sym_ids] = closes
+
+    def get_history_arrays(
+        self, symbol: str, lookback: int | None = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Gets the recent historical data for a symbol as NumPy views.
+
+        This is the fast path for indicator math: no copy and no DataFrame
+        construction, just slices into the underlying column buffers.
+
+        Args:
+            symbol: The symbol to get history for.
+            lookback: The number of recent bars to return.
+
+        Returns:
+            A dict mapping "ts_utc" (datetime64[ns], UTC) and the numeric bar
+            fields to read-only array views. Returns an empty dict if
+            insufficient history is available.
+        """
+        history = self.current_history.get(symbol)
+        if history is None:
+            return {}  # No bars for this symbol yet
+        n = history.n
+
+        if lookback is None:
+            lookback = n
+
+        if n < lookback or n == 0:
+            return {}  # Not enough data yet
+
+        start = n - lookback
+        arrays = {"ts_utc": history.ts[start:n].view("datetime64[ns]")}
+        for field, column in history.columns.items():
+            arrays[field] = column[start:n]
+        for array in arrays.values():
+            array.flags.writeable = False
+        return arrays
 
     def get_history(self, symbol: str, lookback: int = None) -> pd.DataFrame:
         """
         Gets the recent historical data for a symbol as a DataFrame.
 
+        Prefer `get_history_arrays` in per-bar code; this wraps the same
+        column views in a DataFrame for convenience.
+
         Args:
             symbol: The symbol to get history for.
             lookback: The number of recent bars to return.
@@ -88,25 +307,40 @@ class DataHandler:
             A pandas DataFrame of the historical bars. Returns an empty
             DataFrame if insufficient history is available.
         """
-        history = self.current_history.get(symbol, [])
-
-        if lookback is None:
-            lookback = len(history)
-
-        if len(history) < lookback:
+        arrays = self.get_history_arrays(symbol, lookback)
+        if not arrays:
             return pd.DataFrame() # Not enough data yet
 
-        # Get the most recent `lookback` bars
-        recent_bars = history[-lookback:]
-        
-        # Convert list of Bar objects to a DataFrame
-        df = pd.DataFrame([bar.__dict__ for bar in recent_bars])
-        df.set_index("ts_utc", inplace=True)
-        return df
+        history = self.current_history[symbol]
+        window = slice(history.n - len(arrays["ts_utc"]), history.n)
+        index = pd.DatetimeIndex(arrays["ts_utc"], name="ts_utc")
+        if self._ts_tz is not None:
+            # Nanoseconds are stored as UTC; restore the recorded timezone
+            index = index.tz_localize("UTC").tz_convert(self._ts_tz)
+        return pd.DataFrame(
+            {
+                "symbol": symbol,
+                **{field: arrays[field] for field in _HISTORY_FIELDS},
+                **{field: column[window] for field, column in history.objects.items()},
+            },
+            index=index,
+        )
 
     def get_latest_prices(self) -> Dict[str, float]:
         """
         Returns the most recent known prices for all symbols.
         """
+        symbols = self.symbol_table.symbols
+        known = np.flatnonzero(~np.isnan(self.latest_prices))
+        return {
+            symbols[sid]: price
+            for sid, price in zip(known.tolist(), self.latest_prices[known].tolist())
+        }
+
+    def get_latest_price_array(self) -> np.ndarray:
+        """
+        Returns the most recent known prices indexed by symbol id
+        (NaN for symbols without a bar yet). This is a live view.
+        """
         return self.latest_prices
 
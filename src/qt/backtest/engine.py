@@ -2,9 +2,12 @@
 The core backtesting engine, driven by an event queue.
 """
 from __future__ import annotations
-from typing import Dict, List
+from typing import Any, Callable, Dict, List, Optional
 from datetime import datetime, timezone
-import uuid
+import itertools
+
+import numpy as np
+import pandas as pd
 
 from qt.events import BarEvent, OrderEvent, FillEvent
 from qt.types import Order, TargetPositions
@@ -19,6 +22,9 @@ from .metrics import generate_performance_summary
 
 logger = get_logger(__name__)
 
+# Targets for bars on which a batch strategy emits nothing (never mutated)
+_NO_TARGETS: TargetPositions = {}
+
 
 class BacktestEngine:
     """
@@ -34,12 +40,33 @@ class BacktestEngine:
         execution_simulator: ExecutionSimulator,
     ) -> None:
         """Initializes the backtesting engine with all its components."""
+        # Price arrays and the order book are indexed by symbol id, so every
+        # component must intern symbols through the same table.
+        symbol_table = data_handler.symbol_table
+        if (
+            portfolio.symbol_table is not symbol_table
+            or execution_simulator.open_limit_orders.symbol_table is not symbol_table
+        ):
+            raise ValueError(
+                "DataHandler, Portfolio and ExecutionSimulator must share one SymbolTable."
+            )
         self.event_queue = event_queue
         self.data_handler = data_handler
         self.strategy = strategy
         self.portfolio = portfolio
         self.execution_simulator = execution_simulator
         self.latest_market_data: Dict[str, BarEvent] = {}
+        # Order ids only need to be unique within a backtest, so a counter
+        # replaces uuid4 (an os.urandom syscall per order).
+        self._order_ids = itertools.count(1)
+
+        # Handler table indexed by Event.KIND. Each handler takes the event
+        # subclass of its KIND, hence the `Any` parameter.
+        self._handlers: List[Callable[[Any], None]] = [
+            self._handle_bar_event,
+            self._handle_order_event,
+            self._handle_fill_event,
+        ]
 
     def run(self) -> dict:
         """
@@ -48,62 +75,103 @@ class BacktestEngine:
         logger.info("--- Starting Backtest ---")
 
         logger.info("Initializing strategy with historical data...")
-        self.strategy.initialize(self.data_handler.historical_data)
+        historical_data = self.data_handler.historical_data
+        self.strategy.initialize_cached(historical_data)
         logger.info("Strategy initialized.")
 
-        # 1. Populate the event queue with market data
-        self.data_handler.update_data()
+        # One snapshot is recorded per timestamp
+        self.portfolio.reserve_snapshots(historical_data.index.nunique())
 
-        # 2. Main Event Loop
-        while not self.event_queue.is_empty():
-            event = self.event_queue.get()
-            
-            # --- Event Routing ---
-            if isinstance(event, BarEvent):
-                self._handle_bar_event(event)
-            elif isinstance(event, OrderEvent):
-                self._handle_order_event(event)
-            elif isinstance(event, FillEvent):
-                self._handle_fill_event(event)
+        # Batch-capable strategies produce all their targets up front; only
+        # the bars that carry a new target are kept, keyed by event number.
+        batch_targets = self._compute_batch_targets() if self.strategy.supports_batch else None
+
+        # 1. Main Event Loop. Bars are already sorted, so they are streamed
+        # straight from the data handler; the queue only holds derived events.
+        self._drain_event_queue()
+        for i, bar_event in enumerate(self.data_handler.iter_bar_events()):
+            if batch_targets is None:
+                self._handle_bar_event(bar_event)
+            else:
+                self._handle_bar_event(bar_event, batch_targets.get(i, _NO_TARGETS))
+            self._drain_event_queue()
 
         logger.info("--- Backtest Finished ---")
 
-        # 3. Generate final performance summary
+        # 2. Generate final performance summary
         equity_curve = self.portfolio.get_equity_curve()
         return generate_performance_summary(equity_curve)
 
-    def _handle_bar_event(self, event: BarEvent) -> None:
+    def _compute_batch_targets(self) -> Dict[int, TargetPositions]:
+        """
+        Calls `Strategy.process_batch` once for every unique bar timestamp and
+        converts the non-NaN rows of the result into per-event targets.
+        """
+        index = pd.DatetimeIndex(self.data_handler.historical_data.index)
+        timestamps_i8 = np.unique(index.as_unit("ns").asi8)
+        weights = self.strategy.process_batch(timestamps_i8)
+
+        universe = self.strategy.universe
+        has_target = ~np.isnan(weights)
+        batch_targets: Dict[int, TargetPositions] = {}
+        for i in np.flatnonzero(has_target.any(axis=1)).tolist():
+            row = weights[i]
+            batch_targets[i] = {
+                universe[j]: float(row[j]) for j in np.flatnonzero(has_target[i]).tolist()
+            }
+        return batch_targets
+
+    def _drain_event_queue(self) -> None:
+        """
+        Routes every event currently on the queue to its handler.
+        """
+        handlers = self._handlers
+        while not self.event_queue.is_empty():
+            event = self.event_queue.get()
+            handlers[event.KIND](event)
+
+    def _handle_bar_event(
+        self, event: BarEvent, target_positions: Optional[TargetPositions] = None
+    ) -> None:
         """
         Handles a BarEvent, which is the main heartbeat of the simulation.
+
+        `target_positions` are the precomputed targets of a batch-capable
+        strategy; when omitted, the strategy's `on_data` is called.
         """
         # Update the latest prices and history in the data handler
         self.latest_market_data = event.bars
         
         # Record a snapshot of the portfolio's value at this timestamp
-        self.portfolio.record_snapshot(event.timestamp, self.data_handler.get_latest_prices())
+        self.portfolio.record_snapshot(event.timestamp, self.data_handler.get_latest_price_array())
         
-        # Check for any open limit orders that might be filled by this new bar
+        # Check for any open limit orders that might be filled by this new bar.
+        # Fills happen within the current tick, so they are applied directly
+        # instead of round-tripping through the event queue.
         fill_event_from_limit = self.execution_simulator.check_open_orders(event)
         if fill_event_from_limit:
-            self.event_queue.put(fill_event_from_limit)
-        
+            self._handle_fill_event(fill_event_from_limit)
+
         # Give the new bar to the strategy to get its desired positions
-        target_positions = self.strategy.on_data(event)
-        
-        # If the strategy emits new targets, generate orders
+        if target_positions is None:
+            target_positions = self.strategy.on_data(event)
+
+        # If the strategy emits new targets, generate orders and execute them
+        # immediately; limit orders simply rest on the simulator's book.
         if target_positions:
             orders = self._generate_orders_from_targets(target_positions, event.timestamp)
             if orders:
                 order_event = OrderEvent(timestamp=event.timestamp, orders=orders)
-                self.event_queue.put(order_event)
+                self._handle_order_event(order_event)
 
     def _handle_order_event(self, event: OrderEvent) -> None:
         """
-        Handles an OrderEvent by passing it to the execution simulator.
+        Handles an OrderEvent by passing it to the execution simulator and
+        applying any resulting fills to the portfolio straight away.
         """
         fill_event = self.execution_simulator.process_new_orders(event, self.latest_market_data)
         if fill_event:
-            self.event_queue.put(fill_event)
+            self._handle_fill_event(fill_event)
 
     def _handle_fill_event(self, event: FillEvent) -> None:
         """
@@ -128,11 +196,11 @@ class BacktestEngine:
             # Simple logic: Go long if target > 0 and we are flat.
             if target_weight > 0 and current_qty == 0:
                 # This is a placeholder for real sizing logic
-                orders.append(Order(id=str(uuid.uuid4()), ts_utc=timestamp, symbol=symbol, side="BUY", qty=100, type=OrderType.MARKET))
+                orders.append(Order(id=f"ord-{next(self._order_ids)}", ts_utc=timestamp, symbol=symbol, side="BUY", qty=100, type=OrderType.MARKET))
             
             # Simple logic: Go flat if target is 0 and we are long.
             elif target_weight == 0 and current_qty > 0:
-                 orders.append(Order(id=str(uuid.uuid4()), ts_utc=timestamp, symbol=symbol, side="SELL", qty=current_qty, type=OrderType.MARKET))
+                 orders.append(Order(id=f"ord-{next(self._order_ids)}", ts_utc=timestamp, symbol=symbol, side="SELL", qty=current_qty, type=OrderType.MARKET))
         
         return orders
 
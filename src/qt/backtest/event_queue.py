@@ -1,36 +1,72 @@
 """
-A time-based priority queue for handling events in chronological order.
+A time-based queue for handling events in chronological order.
 """
 from __future__ import annotations
-import heapq
-from typing import List
+import bisect
+from collections import deque
+from typing import Deque, Iterable
 
 from qt.events import Event
 
 
 class EventQueue:
     """
-    A priority queue that stores and yields events in chronological order.
+    A queue that stores and yields events in chronological order.
+
+    Backtest events arrive almost entirely in time order: bars are loaded
+    pre-sorted, and derived events (orders, fills) are stamped with the
+    current bar's timestamp. Instead of paying O(log N) heap operations per
+    event, the queue keeps two FIFO deques:
+
+    - `_events`: the main, monotone stream (e.g. all future bars).
+    - `_pending`: events that are earlier than the tail of the main stream,
+      typically same-tick orders and fills. These are drained before the
+      next bar is popped.
+
+    Both `put` and `get` are O(1) in the common case. Only a genuinely
+    out-of-order insertion into `_pending` falls back to a sorted insert.
     """
 
     def __init__(self) -> None:
-        self._events: List[Event] = []
+        self._events: Deque[Event] = deque()
+        self._pending: Deque[Event] = deque()
 
     def put(self, event: Event) -> None:
         """
-        Pushes a new event onto the queue.
-        heapq ensures the event with the smallest timestamp is always at the front.
+        Pushes a new event onto the queue, keeping both streams sorted.
+        Events with equal timestamps are yielded in insertion order.
+        """
+        events = self._events
+        if not events or not event < events[-1]:
+            events.append(event)
+            return
+
+        pending = self._pending
+        if not pending or not event < pending[-1]:
+            pending.append(event)
+        else:
+            # Rare slow path: keep `_pending` sorted (FIFO among equal timestamps)
+            pending.insert(bisect.bisect_right(pending, event), event)
+
+    def put_many(self, events: Iterable[Event]) -> None:
+        """
+        Pushes a batch of events onto the queue. For an already sorted batch
+        (e.g. all historical bars) every insertion is a plain append.
         """
-        heapq.heappush(self._events, event)
+        for event in events:
+            self.put(event)
 
     def get(self) -> Event:
         """
         Pops the event with the earliest timestamp from the queue.
         """
-        return heapq.heappop(self._events)
+        pending = self._pending
+        if pending and (not self._events or pending[0] < self._events[0]):
+            return pending.popleft()
+        return self._events.popleft()
 
     def is_empty(self) -> bool:
         """
         Checks if the queue is empty.
         """
-        return len(self._events) == 0
+        return not self._events and not self._pending
@@ -6,14 +6,18 @@ configured slippage/cost models, generates Fill events. This version is
 stateful to handle open LIMIT orders.
 """
 from __future__ import annotations
-from typing import List, Dict
+from typing import Callable, List, Dict
+from datetime import datetime
+import logging
 
 from qt.events import OrderEvent, FillEvent, BarEvent
 from qt.types import Order, Bar, Fill
 from qt.enums import OrderType
 from qt.utils.logger import get_logger
-from .slippage import SlippageModel
-from .costs import CostModel
+from .slippage import SlippageModel, NoSlippage
+from .costs import CostModel, NoCost
+from .order_book import LimitOrderBook
+from .symbol_table import SymbolTable
 
 logger = get_logger(__name__)
 
@@ -24,11 +28,39 @@ class ExecutionSimulator:
     This stateful version handles both MARKET and LIMIT orders.
     """
 
-    def __init__(self, slippage_model: SlippageModel, cost_model: CostModel) -> None:
+    def __init__(
+        self,
+        slippage_model: SlippageModel | Callable[[Order, Bar], float],
+        cost_model: CostModel,
+        symbol_table: SymbolTable | None = None,
+    ) -> None:
+        """
+        Args:
+            slippage_model: A SlippageModel, or any `(order, bar) -> price`
+                callable.
+            cost_model: The model used to compute fees.
+            symbol_table: Symbol id interner for the limit order book;
+                defaults to the shared table.
+        """
         self.slippage_model = slippage_model
+        # Resolve the pricing function once. None means "fill at the close",
+        # which skips the method dispatch for the common NoSlippage case.
+        self._execution_price: Callable[[Order, Bar], float] | None
+        if type(slippage_model) is NoSlippage:
+            self._execution_price = None
+        elif isinstance(slippage_model, SlippageModel):
+            self._execution_price = slippage_model.get_execution_price
+        else:
+            self._execution_price = slippage_model
         self.cost_model = cost_model
+        # Zero-cost fills skip the fee model call entirely. NoCost's fee
+        # methods are final, so this holds for its subclasses too.
+        self._zero_cost = isinstance(cost_model, NoCost)
+        # Market orders under frictionless execution (NoSlippage + NoCost)
+        # fill at the close with no fee, so neither model is consulted.
+        self._frictionless = self._execution_price is None and self._zero_cost
         # This "order book" is the key to handling limit orders.
-        self.open_limit_orders: Dict[str, Order] = {}
+        self.open_limit_orders = LimitOrderBook(symbol_table)
 
     def process_new_orders(self, order_event: OrderEvent, market_data: Dict[str, Bar]) -> FillEvent | None:
         """
@@ -36,18 +68,26 @@ class ExecutionSimulator:
         immediately, while limit orders are placed on the open orders book.
         """
         fills: List[Fill] = []
+        fill_market_order = (
+            self._fill_market_order_frictionless
+            if self._frictionless
+            else self._fill_market_order
+        )
+        log_info = logger.isEnabledFor(logging.INFO)
         for order in order_event.orders:
-            if order.type == OrderType.MARKET:
-                fill = self._fill_market_order(order, market_data)
+            order_type = order.type
+            if order_type == OrderType.MARKET:
+                fill = fill_market_order(order, market_data, log_info)
                 if fill:
                     fills.append(fill)
-            elif order.type == OrderType.LIMIT:
-                logger.info(f"Placing LIMIT order {order.id} on the book for {order.symbol}.")
+            elif order_type == OrderType.LIMIT:
+                if log_info:
+                    logger.info("Placing LIMIT order %s on the book for %s.", order.id, order.symbol)
                 self.open_limit_orders[order.id] = order
-        
+
         if not fills:
             return None
-        return FillEvent(timestamp=order_event.timestamp, fills=fills)
+        return FillEvent(timestamp=order_event.timestamp, fills=tuple(fills))
 
     def check_open_orders(self, bar_event: BarEvent) -> FillEvent | None:
         """
@@ -55,74 +95,89 @@ class ExecutionSimulator:
         if any should be filled. Called by the engine on every BarEvent.
         """
         fills: List[Fill] = []
-        filled_order_ids: List[str] = []
-
-        for order_id, order in self.open_limit_orders.items():
-            if order.symbol not in bar_event.bars:
-                continue
+        log_info = logger.isEnabledFor(logging.INFO)
 
+        # Vectorized scan of the whole book; only filled orders come back
+        for order in self.open_limit_orders.pop_marketable(bar_event):
             bar = bar_event.bars[order.symbol]
-            
-            # Check for fill condition
-            should_fill = False
-            if order.side == "BUY" and bar.low <= order.limit_price:
-                should_fill = True
-            elif order.side == "SELL" and bar.high >= order.limit_price:
-                should_fill = True
-
-            if should_fill:
-                # In a simple model, we fill at the limit price
-                execution_price = order.limit_price
-                
-                # Create a temporary fill to calculate cost
-                signed_qty = order.qty if order.side == "BUY" else -order.qty
-                temp_fill = Fill(
-                    order_id=order.id, ts_utc=bar.ts_utc, symbol=order.symbol,
-                    qty=signed_qty, price=execution_price
-                )
-                fee = self.cost_model.calculate_fee(temp_fill)
-                
-                # Create the final fill with the fee
-                final_fill = Fill(
-                    order_id=order.id, ts_utc=bar.ts_utc, symbol=order.symbol,
-                    qty=signed_qty, price=execution_price, fee=fee
-                )
-                
-                fills.append(final_fill)
-                filled_order_ids.append(order_id)
-                logger.info(f"LIMIT order {order.id} filled: {order.side} {order.qty} {order.symbol} @ ${execution_price:.2f}")
 
-        # Remove the filled orders from the open book
-        for order_id in filled_order_ids:
-            del self.open_limit_orders[order_id]
+            # In a simple model, we fill at the limit price. The book never
+            # returns orders without one as marketable.
+            execution_price = order.limit_price
+            assert execution_price is not None
+
+            signed_qty = order.qty if order.side == "BUY" else -order.qty
+            final_fill = self._make_fill(order, bar.ts_utc, signed_qty, execution_price)
+
+            fills.append(final_fill)
+            if log_info:
+                logger.info(
+                    "LIMIT order %s filled: %s %s %s @ $%.2f",
+                    order.id, order.side, order.qty, order.symbol, execution_price,
+                )
 
         if not fills:
             return None
-        return FillEvent(timestamp=bar_event.timestamp, fills=fills)
+        return FillEvent(timestamp=bar_event.timestamp, fills=tuple(fills))
 
-    def _fill_market_order(self, order: Order, market_data: Dict[str, Bar]) -> Fill | None:
-        """Helper function to process a single market order."""
-        if order.symbol not in market_data:
+    def _fill_market_order(
+        self, order: Order, market_data: Dict[str, Bar], log_info: bool = True
+    ) -> Fill | None:
+        """
+        Helper function to process a single market order. `log_info` lets
+        batch callers check the log level once instead of per order.
+        """
+        bar = market_data.get(order.symbol)
+        if bar is None:
             logger.warning(f"No market data for {order.symbol} at {order.ts_utc}. Cannot execute order.")
             return None
 
-        bar = market_data[order.symbol]
-        execution_price = self.slippage_model.get_execution_price(order, bar)
+        execution_price = bar.close if self._execution_price is None else self._execution_price(order, bar)
         signed_qty = order.qty if order.side == "BUY" else -order.qty
         
-        # Create a temporary fill to calculate the fee
-        temp_fill = Fill(
-            order_id=order.id, ts_utc=order.ts_utc, symbol=order.symbol,
-            qty=signed_qty, price=execution_price
-        )
-        fee = self.cost_model.calculate_fee(temp_fill)
+        final_fill = self._make_fill(order, order.ts_utc, signed_qty, execution_price)
 
-        # Create the final fill with the fee included
-        final_fill = Fill(
-            order_id=order.id, ts_utc=order.ts_utc, symbol=order.symbol,
-            qty=signed_qty, price=execution_price, fee=fee
-        )
-
-        logger.info(f"Simulated fill for order {order.id}: {order.side} {order.qty} {order.symbol} @ ${execution_price:.2f}")
+        if log_info:
+            logger.info(
+                "Simulated fill for order %s: %s %s %s @ $%.2f",
+                order.id, order.side, order.qty, order.symbol, execution_price,
+            )
         return final_fill
 
+    def _fill_market_order_frictionless(
+        self, order: Order, market_data: Dict[str, Bar], log_info: bool = True
+    ) -> Fill | None:
+        """
+        `_fill_market_order` for NoSlippage + NoCost: fills at the bar close
+        with a zero fee, building the Fill directly.
+        """
+        bar = market_data.get(order.symbol)
+        if bar is None:
+            logger.warning(f"No market data for {order.symbol} at {order.ts_utc}. Cannot execute order.")
+            return None
+
+        signed_qty = order.qty if order.side == "BUY" else -order.qty
+        fill = Fill(
+            order_id=order.id, ts_utc=order.ts_utc, symbol=order.symbol,
+            qty=signed_qty, price=bar.close,
+        )
+        if log_info:
+            logger.info(
+                "Simulated fill for order %s: %s %s %s @ $%.2f",
+                order.id, order.side, order.qty, order.symbol, bar.close,
+            )
+        return fill
+
+    def _make_fill(self, order: Order, ts_utc: datetime, qty: float, price: float) -> Fill:
+        """
+        Builds the Fill for an order, including its fee. The fee is priced
+        up front so the Fill is constructed exactly once.
+        """
+        if self._zero_cost:
+            fee = 0.0
+        else:
+            fee = self.cost_model.calculate_fee_raw(order.id, ts_utc, order.symbol, qty, price)
+        return Fill(
+            order_id=order.id, ts_utc=ts_utc, symbol=order.symbol,
+            qty=qty, price=price, fee=fee,
+        )
@@ -1,30 +1,90 @@
 """
 Functions for calculating portfolio performance metrics.
+
+Each public `calculate_*` function takes an equity curve Series. The math
+lives in private `_*_from_arrays` helpers working on plain NumPy arrays, so
+`generate_performance_summary` can extract the values, returns and
+timestamps once and share them across all metrics.
 """
 from __future__ import annotations
+import math
 import pandas as pd
 import numpy as np
 
+from qt.utils.jit import NUMBA_AVAILABLE, njit
 from qt.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
-def _infer_trading_periods_per_year(equity_curve: pd.Series) -> int:
+_NS_PER_DAY = 86_400 * 10**9
+_NS_PER_YEAR = 365.25 * _NS_PER_DAY
+
+
+def _index_ns(index: pd.Index) -> np.ndarray:
     """
-    Infers the number of trading periods per year from the equity curve index.
+    Returns a datetime index as int64 nanoseconds (a view when already ns).
     """
-    if equity_curve.empty or len(equity_curve.index) < 2:
+    return pd.DatetimeIndex(index).as_unit("ns").asi8
+
+
+def _to_arrays(equity_curve: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the equity values (float64) and the index as int64 nanoseconds.
+    """
+    values = equity_curve.to_numpy(dtype=np.float64, copy=False)
+    return values, _index_ns(equity_curve.index)
+
+
+def _returns_from_values(values: np.ndarray) -> np.ndarray:
+    """
+    Simple period returns, equivalent to `pct_change().dropna()`.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = values[1:] / values[:-1] - 1.0
+    return returns[~np.isnan(returns)]
+
+
+def _returns(equity_curve: pd.Series) -> np.ndarray:
+    """
+    Simple returns of an equity curve as a contiguous float64 array.
+    """
+    return _returns_from_values(_to_arrays(equity_curve)[0])
+
+
+def _std(x: np.ndarray) -> float:
+    """Sample standard deviation (ddof=1); NaN for fewer than two values."""
+    if len(x) < 2:
+        return np.nan
+    return float(np.std(x, ddof=1))
+
+
+def _downside_deviation(x: np.ndarray, target: float) -> float:
+    """
+    Target downside deviation: the root mean square of the shortfall below
+    `target` over all periods (periods at or above it count as zero).
+    NaN for an empty array.
+    """
+    if len(x) == 0:
+        return np.nan
+    shortfall = np.minimum(x - target, 0.0)
+    return math.sqrt(np.dot(shortfall, shortfall) / len(x))
+
+
+def _periods_per_year_from_ts(ts_ns: np.ndarray) -> int:
+    """
+    Array version of `_infer_trading_periods_per_year`.
+    """
+    if len(ts_ns) < 2:
         return 252 # Default to daily for equities
 
     # Calculate the median time difference between consecutive data points
-    median_interval = equity_curve.index.to_series().diff().median()
-
-    if pd.isna(median_interval):
+    median_interval = np.median(np.diff(ts_ns))
+    if median_interval == 0:
         return 252
 
     # Calculate the number of such intervals in a year
-    periods_per_year = pd.Timedelta(days=365.25) / median_interval
+    periods_per_year = _NS_PER_YEAR / median_interval
 
     # If the data is roughly daily, use 252 for a more standard equity calculation.
     # Otherwise, use the calculated value (for crypto, hourly, etc.)
@@ -32,21 +92,181 @@ def _infer_trading_periods_per_year(equity_curve: pd.Series) -> int:
         return 252
     elif 350 < periods_per_year < 370:
         return 365
-    
+
     return int(periods_per_year)
 
 
+def _total_return_from_arrays(values: np.ndarray) -> float:
+    start_nav = values[0]
+    end_nav = values[-1]
+    if start_nav == 0:
+        return 0.0
+    return (end_nav / start_nav) - 1
+
+
+def _cagr_from_total_return(total_return: float, ts_ns: np.ndarray) -> float:
+    """
+    CAGR from an already computed total return, as
+    expm1(log1p(total_return) / num_years) rather than a fractional power.
+    """
+    num_years = ((ts_ns[-1] - ts_ns[0]) // _NS_PER_DAY) / 365.25
+    if num_years <= 0:
+        return 0.0
+    if total_return < -1:
+        # A negative ending NAV has no real compound growth rate
+        return np.nan
+    if total_return == -1:
+        return -1.0
+    return math.expm1(math.log1p(total_return) / num_years)
+
+
+def _cagr_from_arrays(values: np.ndarray, ts_ns: np.ndarray) -> float:
+    if values[0] <= 0:
+        return 0.0
+    return _cagr_from_total_return(_total_return_from_arrays(values), ts_ns)
+
+
+def _return_stats(returns: np.ndarray, target_return: float) -> dict:
+    """
+    Computes the return statistics shared by the Sharpe and Sortino ratios.
+    The standard deviation is a sample (ddof=1) deviation; the downside
+    deviation is taken relative to `target_return`.
+    """
+    return {
+        "mean": returns.mean() if len(returns) else np.nan,
+        "std": _std(returns),
+        "downside_std": _downside_deviation(returns, target_return),
+    }
+
+
+def _sharpe_from_stats(stats: dict, target_return: float, annualization: float) -> float:
+    """
+    `target_return` is the per-period risk-free rate and `annualization`
+    is sqrt(periods per year), both hoisted out by the caller.
+    """
+    std = stats["std"]
+    if std == 0:
+        return 0.0
+    # Subtracting a constant shifts the mean but leaves the std unchanged
+    sharpe_ratio = (stats["mean"] - target_return) / std
+    return sharpe_ratio * annualization
+
+
+def _sortino_from_stats(stats: dict, target_return: float, annualization: float) -> float:
+    """See `_sharpe_from_stats` for the scalar arguments."""
+    downside_deviation = stats["downside_std"]
+    if downside_deviation == 0 or np.isnan(downside_deviation):
+        return 0.0
+    sortino_ratio = (stats["mean"] - target_return) / downside_deviation
+    return sortino_ratio * annualization
+
+
+@njit(cache=True)
+def _max_drawdown_nb(values):
+    """Numba kernel: tracks the running peak and worst drawdown in one pass."""
+    peak = values[0]
+    max_dd = 0.0
+    for x in values:
+        if x > peak:
+            peak = x
+        dd = x / peak - 1.0
+        if dd < max_dd:
+            max_dd = dd
+    return max_dd
+
+
+def _max_drawdown_np(values: np.ndarray) -> float:
+    """Vectorized NumPy equivalent of `_max_drawdown_nb`."""
+    running_max = np.maximum.accumulate(values)
+    drawdown = (values - running_max) / running_max
+    return float(drawdown.min())
+
+
+_max_drawdown_from_arrays = _max_drawdown_nb if NUMBA_AVAILABLE else _max_drawdown_np
+
+
+@njit(cache=True)
+def _rolling_sharpe_nb(returns, window, target_return, annualization):
+    """
+    Numba kernel: Sharpe ratio over each trailing `window` of returns.
+
+    Keeps a running sum and sum of squares, so each step adds the newest
+    return and drops the oldest instead of re-reducing the whole window.
+    The sums are taken of returns shifted by the first return, which avoids
+    catastrophic cancellation in the variance when returns barely vary.
+    """
+    n = returns.shape[0]
+    out = np.full(n, np.nan)
+    if n == 0:
+        return out
+    shift = returns[0]
+    s = 0.0
+    q = 0.0
+    for i in range(n):
+        r = returns[i] - shift
+        s += r
+        q += r * r
+        if i >= window:
+            old = returns[i - window] - shift
+            s -= old
+            q -= old * old
+        if i >= window - 1:
+            mean = s / window
+            var = (q - s * mean) / (window - 1)
+            if var > 0.0:
+                out[i] = (mean + shift - target_return) / np.sqrt(var) * annualization
+            else:
+                out[i] = 0.0
+    return out
+
+
+def _rolling_sharpe_np(returns, window, target_return, annualization):
+    """Vectorized NumPy equivalent of `_rolling_sharpe_nb` (cumulative sums)."""
+    out = np.full(len(returns), np.nan)
+    if len(returns) < window:
+        return out
+    shifted = returns - returns[0]
+    c1 = np.concatenate(([0.0], np.cumsum(shifted)))
+    c2 = np.concatenate(([0.0], np.cumsum(shifted * shifted)))
+    s = c1[window:] - c1[:-window]
+    q = c2[window:] - c2[:-window]
+    mean = s / window
+    var = (q - s * mean) / (window - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(
+            var > 0.0,
+            (mean + returns[0] - target_return) / np.sqrt(var) * annualization,
+            0.0,
+        )
+    out[window - 1 :] = sharpe
+    return out
+
+
+_rolling_sharpe = _rolling_sharpe_nb if NUMBA_AVAILABLE else _rolling_sharpe_np
+
+
+def _calmar_from_arrays(cagr: float, max_dd: float) -> float:
+    if max_dd >= 0:
+        return 0.0
+    return cagr / abs(max_dd)
+
+
+def _infer_trading_periods_per_year(equity_curve: pd.Series) -> int:
+    """
+    Infers the number of trading periods per year from the equity curve index.
+    """
+    if equity_curve.empty or len(equity_curve.index) < 2:
+        return 252 # Default to daily for equities
+    return _periods_per_year_from_ts(_index_ns(equity_curve.index))
+
+
 def calculate_total_return(equity_curve: pd.Series) -> float:
     """
     Calculates the total return over the entire period.
     """
     if equity_curve.empty or len(equity_curve) < 2:
         return 0.0
-    start_nav = equity_curve.iloc[0]
-    end_nav = equity_curve.iloc[-1]
-    if start_nav == 0:
-        return 0.0
-    return (end_nav / start_nav) - 1
+    return _total_return_from_arrays(_to_arrays(equity_curve)[0])
 
 
 def calculate_annualized_volatility(
@@ -57,8 +277,8 @@ def calculate_annualized_volatility(
     """
     if equity_curve.empty or len(equity_curve) < 2:
         return 0.0
-    returns = equity_curve.pct_change().dropna()
-    return returns.std() * np.sqrt(trading_periods_per_year)
+    returns = _returns(equity_curve)
+    return _std(returns) * math.sqrt(trading_periods_per_year)
 
 
 def calculate_cagr(equity_curve: pd.Series) -> float:
@@ -67,60 +287,47 @@ def calculate_cagr(equity_curve: pd.Series) -> float:
     """
     if equity_curve.empty or len(equity_curve) < 2:
         return 0.0
-    start_nav = equity_curve.iloc[0]
-    end_nav = equity_curve.iloc[-1]
-    if start_nav <= 0:
-        return 0.0
-    num_years = (equity_curve.index[-1] - equity_curve.index[0]).days / 365.25
-    if num_years <= 0:
-        return 0.0
-    cagr = (end_nav / start_nav) ** (1 / num_years) - 1
-    return cagr
+    return _cagr_from_arrays(*_to_arrays(equity_curve))
 
 
 def calculate_sharpe_ratio(
     equity_curve: pd.Series,
     risk_free_rate: float,
     trading_periods_per_year: int,
+    _stats: dict | None = None,
 ) -> float:
     """
     Calculates the annualized Sharpe Ratio.
+
+    `_stats` optionally supplies precomputed return statistics (see
+    `_return_stats`) so callers computing several ratios reduce once.
     """
     if equity_curve.empty or len(equity_curve) < 2:
         return 0.0
-    returns = equity_curve.pct_change().dropna()
-    if returns.std() == 0:
-        return 0.0
-    
-    excess_returns = returns - (risk_free_rate / trading_periods_per_year)
-    sharpe_ratio = excess_returns.mean() / excess_returns.std()
-    annualized_sharpe = sharpe_ratio * np.sqrt(trading_periods_per_year)
-    return annualized_sharpe
+    target_return = risk_free_rate / trading_periods_per_year
+    if _stats is None:
+        _stats = _return_stats(_returns(equity_curve), target_return)
+    return _sharpe_from_stats(_stats, target_return, math.sqrt(trading_periods_per_year))
 
 
 def calculate_sortino_ratio(
     equity_curve: pd.Series,
     risk_free_rate: float,
     trading_periods_per_year: int,
+    _stats: dict | None = None,
 ) -> float:
     """
     Calculates the annualized Sortino Ratio.
+
+    `_stats` optionally supplies precomputed return statistics (see
+    `_return_stats`) so callers computing several ratios reduce once.
     """
     if equity_curve.empty or len(equity_curve) < 2:
         return 0.0
-    returns = equity_curve.pct_change().dropna()
     target_return = risk_free_rate / trading_periods_per_year
-    
-    downside_returns = returns[returns < target_return]
-    downside_deviation = downside_returns.std()
-
-    if downside_deviation == 0 or pd.isna(downside_deviation):
-        return 0.0
-
-    expected_return = returns.mean()
-    sortino_ratio = (expected_return - target_return) / downside_deviation
-    annualized_sortino = sortino_ratio * np.sqrt(trading_periods_per_year)
-    return annualized_sortino
+    if _stats is None:
+        _stats = _return_stats(_returns(equity_curve), target_return)
+    return _sortino_from_stats(_stats, target_return, math.sqrt(trading_periods_per_year))
 
 
 def calculate_max_drawdown(equity_curve: pd.Series) -> float:
@@ -129,10 +336,7 @@ def calculate_max_drawdown(equity_curve: pd.Series) -> float:
     """
     if equity_curve.empty:
         return 0.0
-    running_max = equity_curve.cummax()
-    drawdown = (equity_curve - running_max) / running_max
-    max_drawdown = drawdown.min()
-    return max_drawdown
+    return _max_drawdown_from_arrays(_to_arrays(equity_curve)[0])
 
 
 def calculate_calmar_ratio(equity_curve: pd.Series) -> float:
@@ -141,9 +345,38 @@ def calculate_calmar_ratio(equity_curve: pd.Series) -> float:
     """
     cagr = calculate_cagr(equity_curve)
     max_dd = calculate_max_drawdown(equity_curve)
-    if max_dd >= 0:
-        return 0.0
-    return cagr / abs(max_dd)
+    return _calmar_from_arrays(cagr, max_dd)
+
+
+def calculate_rolling_sharpe(
+    equity_curve: pd.Series,
+    window: int,
+    risk_free_rate: float = 0.0,
+    trading_periods_per_year: int | None = None,
+) -> pd.Series:
+    """
+    Calculates the annualized Sharpe Ratio over a trailing window of returns.
+
+    Equivalent to `returns.rolling(window).apply(sharpe)`, but computed in
+    one pass with running sums. The result is aligned with the equity
+    curve and is NaN until `window` returns are available. The curve is
+    expected to contain no NaNs.
+    """
+    if window < 2:
+        raise ValueError(f"window must be at least 2, got {window}")
+    if trading_periods_per_year is None:
+        trading_periods_per_year = _infer_trading_periods_per_year(equity_curve)
+    values = equity_curve.to_numpy(dtype=np.float64, copy=False)
+    out = np.full(len(values), np.nan)
+    if len(values) > 1:
+        returns = values[1:] / values[:-1] - 1.0
+        out[1:] = _rolling_sharpe(
+            returns,
+            window,
+            risk_free_rate / trading_periods_per_year,
+            math.sqrt(trading_periods_per_year),
+        )
+    return pd.Series(out, index=equity_curve.index, name="rolling_sharpe")
 
 
 def generate_performance_summary(
@@ -151,30 +384,38 @@ def generate_performance_summary(
 ) -> dict:
     """
     Generates a dictionary of key performance indicators.
+
+    The equity values, returns and timestamps are extracted once and shared
+    by every metric instead of each metric re-deriving them from the Series.
     """
     logger.info("Generating performance summary...")
     if equity_curve.empty or len(equity_curve) < 2:
         logger.warning("Equity curve is too short to generate performance summary.")
         return {}
 
+    values, ts_ns = _to_arrays(equity_curve)
+    returns = _returns_from_values(values)
+
     # Infer the annualization factor once from the data
-    periods_per_year = _infer_trading_periods_per_year(equity_curve)
+    periods_per_year = _periods_per_year_from_ts(ts_ns)
     logger.info(f"Inferred {periods_per_year} trading periods per year.")
 
+    # Scalars and statistics shared by volatility, Sharpe and Sortino
+    annualization = math.sqrt(periods_per_year)
+    target_return = risk_free_rate / periods_per_year
+    stats = _return_stats(returns, target_return)
+
+    # CAGR reuses the total return instead of re-reading the endpoints
+    total_return = _total_return_from_arrays(values)
+    cagr = _cagr_from_total_return(total_return, ts_ns) if values[0] > 0 else 0.0
+    max_dd = _max_drawdown_from_arrays(values)
     summary = {
-        "total_return": calculate_total_return(equity_curve),
-        "cagr": calculate_cagr(equity_curve),
-        "annualized_volatility": calculate_annualized_volatility(
-            equity_curve, periods_per_year
-        ),
-        "sharpe_ratio": calculate_sharpe_ratio(
-            equity_curve, risk_free_rate, periods_per_year
-        ),
-        "sortino_ratio": calculate_sortino_ratio(
-            equity_curve, risk_free_rate, periods_per_year
-        ),
-        "calmar_ratio": calculate_calmar_ratio(equity_curve),
-        "max_drawdown": calculate_max_drawdown(equity_curve),
+        "total_return": total_return,
+        "cagr": cagr,
+        "annualized_volatility": stats["std"] * annualization,
+        "sharpe_ratio": _sharpe_from_stats(stats, target_return, annualization),
+        "sortino_ratio": _sortino_from_stats(stats, target_return, annualization),
+        "calmar_ratio": _calmar_from_arrays(cagr, max_dd),
+        "max_drawdown": max_dd,
     }
     return summary
-
@@ -0,0 +1,187 @@
+"""
+A column-oriented book of resting LIMIT orders.
+
+The ExecutionSimulator checks the open limit orders against every new bar.
+The book keeps its orders in parallel NumPy arrays sorted by (symbol, side,
+price aggressiveness), so the orders a bar can fill are always a prefix of
+their (symbol, side) run. Finding them takes a few binary searches per bar
+symbol, O(B log N), instead of a pass over the whole book (the NumPy
+fallback without Numba is a single vectorized pass).
+"""
+from __future__ import annotations
+from typing import Dict, Iterator, List, MutableMapping
+
+import numpy as np
+
+from qt.events import BarEvent
+from qt.types import Order
+from qt.utils.jit import NUMBA_AVAILABLE, njit
+from .symbol_table import SymbolTable, default_symbol_table
+
+
+@njit(cache=True)
+def _mark_marketable_nb(group, key, sym_ids, lows, highs, mask):
+    """
+    Sets `mask` for every order the bars can fill and returns whether any
+    can. `group` is `2 * symbol id + side` (0 BUY, 1 SELL) and `key` is
+    -limit for buys and +limit for sells, both sorted, so an order fills
+    iff its key is <= -low (BUY) or <= high (SELL).
+    """
+    found = False
+    for b in range(sym_ids.shape[0]):
+        for side in range(2):
+            g = 2 * sym_ids[b] + side
+            lo = np.searchsorted(group, g, side="left")
+            hi = np.searchsorted(group, g, side="right")
+            if lo == hi:
+                continue
+            threshold = -lows[b] if side == 0 else highs[b]
+            if np.isnan(threshold):
+                continue
+            k = lo + np.searchsorted(key[lo:hi], threshold, side="right")
+            if k > lo:
+                mask[lo:k] = True
+                found = True
+    return found
+
+
+def _mark_marketable_np(group, key, sym_ids, lows, highs, mask):
+    """
+    Vectorized NumPy equivalent of `_mark_marketable_nb`: one pass over the
+    book comparing each key with its (symbol, side) threshold.
+    """
+    if sym_ids.shape[0] == 0:
+        return False
+    size = max(int(group[-1]) // 2, int(sym_ids.max())) + 1
+    thresholds = np.full(2 * size, np.nan)
+    thresholds[2 * sym_ids] = -lows
+    thresholds[2 * sym_ids + 1] = highs
+    np.less_equal(key, thresholds[group], out=mask)
+    return bool(mask.any())
+
+
+_mark_marketable = _mark_marketable_nb if NUMBA_AVAILABLE else _mark_marketable_np
+
+
+class LimitOrderBook(MutableMapping[str, Order]):
+    """
+    Open LIMIT orders keyed by order id.
+
+    Behaves like a `Dict[str, Order]` (insertion ordered), while mirroring
+    the fields needed for fill detection into parallel arrays sorted for
+    binary search. Symbols with no bar in the current event, and orders
+    without a limit price, never fill.
+    """
+
+    def __init__(
+        self, symbol_table: SymbolTable | None = None, capacity: int = 64
+    ) -> None:
+        self.symbol_table = (
+            symbol_table if symbol_table is not None else default_symbol_table
+        )
+        self._orders: Dict[str, Order] = {}
+        self._n = 0
+        self._next_seq = 0
+        self._ids = np.empty(capacity, dtype=object)
+        self._group = np.empty(capacity, dtype=np.int64)  # 2 * symbol id + side
+        self._key = np.empty(capacity, dtype=np.float64)  # -limit BUY, +limit SELL
+        self._seq = np.empty(capacity, dtype=np.int64)  # insertion order
+
+    # --- Mapping interface ---
+
+    def __getitem__(self, order_id: str) -> Order:
+        return self._orders[order_id]
+
+    def __setitem__(self, order_id: str, order: Order) -> None:
+        if order_id in self._orders:
+            del self[order_id]
+        n = self._n
+        if n == len(self._ids):
+            self._grow()
+
+        is_buy = order.side == "BUY"
+        group = 2 * self.symbol_table.id(order.symbol) + (0 if is_buy else 1)
+        if order.limit_price is None:
+            key = np.nan  # sorts last and never fills
+        else:
+            key = -order.limit_price if is_buy else order.limit_price
+
+        # Insertion point: end of the equal-key run within the group
+        lo = int(np.searchsorted(self._group[:n], group, side="left"))
+        hi = int(np.searchsorted(self._group[:n], group, side="right"))
+        i = lo + int(np.searchsorted(self._key[lo:hi], key, side="right"))
+        for column in (self._ids, self._group, self._key, self._seq):
+            column[i + 1 : n + 1] = column[i:n]
+        self._ids[i] = order_id
+        self._group[i] = group
+        self._key[i] = key
+        self._seq[i] = self._next_seq
+        self._next_seq += 1
+        self._orders[order_id] = order
+        self._n = n + 1
+
+    def __delitem__(self, order_id: str) -> None:
+        del self._orders[order_id]
+        keep = self._ids[: self._n] != order_id
+        self._compact(keep)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._orders)
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    # --- Fill detection ---
+
+    def pop_marketable(self, bar_event: BarEvent) -> List[Order]:
+        """
+        Removes and returns, in book order, every order whose limit price was
+        reached by the bars in the given event.
+        """
+        n = self._n
+        if n == 0:
+            return []
+
+        if bar_event.sym_ids is not None:
+            sym_ids, lows, highs = bar_event.sym_ids, bar_event.lows, bar_event.highs
+        else:
+            ids: List[int] = []
+            bar_lows: List[float] = []
+            bar_highs: List[float] = []
+            for symbol, bar in bar_event.bars.items():
+                sid = self.symbol_table.get(symbol)
+                if sid is not None:
+                    ids.append(sid)
+                    bar_lows.append(bar.low)
+                    bar_highs.append(bar.high)
+            sym_ids = np.array(ids, dtype=np.intp)
+            lows = np.array(bar_lows, dtype=np.float64)
+            highs = np.array(bar_highs, dtype=np.float64)
+
+        mask = np.zeros(n, dtype=np.bool_)
+        if not _mark_marketable(self._group[:n], self._key[:n], sym_ids, lows, highs, mask):
+            return []
+
+        hits = np.flatnonzero(mask)
+        hits = hits[np.argsort(self._seq[hits], kind="stable")]
+        filled = [self._orders.pop(order_id) for order_id in self._ids[hits]]
+        self._compact(~mask)
+        return filled
+
+    # --- Internal helpers ---
+
+    def _grow(self) -> None:
+        capacity = 2 * len(self._ids)
+        self._ids = np.resize(self._ids, capacity)
+        self._group = np.resize(self._group, capacity)
+        self._key = np.resize(self._key, capacity)
+        self._seq = np.resize(self._seq, capacity)
+
+    def _compact(self, keep: np.ndarray) -> None:
+        """Drops the rows where `keep` is False, preserving the sort order."""
+        n = self._n
+        m = int(keep.sum())
+        for column in (self._ids, self._group, self._key, self._seq):
+            column[:m] = column[:n][keep]
+        self._ids[m:n] = None
+        self._n = m
@@ -5,33 +5,251 @@ This stateful class tracks cash, positions, and calculates the Net Asset Value (
 at each time step. It's updated by the backtest engine whenever a fill event occurs.
 """
 from __future__ import annotations
-from typing import Dict, List
+import logging
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Tuple
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
 from qt.events import FillEvent
 from qt.types import Position, PortfolioSnapshot
+from qt.utils.jit import NUMBA_AVAILABLE, njit
 from qt.utils.logger import get_logger
+from .symbol_table import SymbolTable, default_symbol_table
 
 logger = get_logger(__name__)
 
+# Fill batches at least this large are applied by the compiled kernel; for
+# smaller ones the call and array setup cost more than the Python loop.
+_MIN_JIT_FILLS = 16
+
+
+@njit(cache=True)
+def _apply_fill(
+    qty: float, avg_price: float, fill_qty: float, fill_price: float
+) -> Tuple[float, float, float]:
+    """
+    Applies a signed fill to a position with a single code path.
+
+    Returns the new quantity, the new average price and the realized PnL.
+    The closed quantity is zero for a trade in the same direction, and
+    min(|qty|, |fill_qty|) otherwise; the average price is re-weighted when
+    increasing, kept when reducing, and reset to the fill price on a flip.
+    """
+    new_qty = qty + fill_qty
+    same_direction = qty * fill_qty > 0
+    qty_closed = 0.0 if same_direction else min(abs(qty), abs(fill_qty))
+    position_direction = 1 if qty > 0 else -1
+    pnl = position_direction * (fill_price - avg_price) * qty_closed
+
+    if same_direction:
+        new_avg_price = (avg_price * qty + fill_price * fill_qty) / new_qty
+    elif qty * new_qty > 0:
+        new_avg_price = avg_price
+    else:
+        new_avg_price = fill_price
+    return new_qty, new_avg_price, pnl
+
+
+@njit(cache=True)
+def _apply_fills_nb(
+    slots: np.ndarray,
+    fill_qty: np.ndarray,
+    fill_price: np.ndarray,
+    fill_fee: np.ndarray,
+    qty: np.ndarray,
+    avg_price: np.ndarray,
+    realized_pnl: np.ndarray,
+    cash: float,
+) -> float:
+    """
+    Numba kernel: applies a batch of fills to the position arrays in place
+    and returns the updated cash. Slots whose quantity ends at zero are left
+    for the caller to remove.
+    """
+    for k in range(slots.shape[0]):
+        i = slots[k]
+        cash -= fill_qty[k] * fill_price[k]
+        cash -= fill_fee[k]
+        if qty[i] == 0.0:
+            # (Re)opened position: PnL of a closed position is not carried
+            realized_pnl[i] = 0.0
+        new_qty, new_avg_price, pnl = _apply_fill(
+            qty[i], avg_price[i], fill_qty[k], fill_price[k]
+        )
+        realized_pnl[i] += pnl
+        qty[i] = new_qty
+        avg_price[i] = new_avg_price
+    return cash
+
+
+class _Holdings(NamedTuple):
+    """Frozen copy of the position arrays, taken once per fill epoch."""
+
+    symbols: List[str]
+    sids: np.ndarray
+    qty: np.ndarray
+    avg_price: np.ndarray
+    realized_pnl: np.ndarray
+
+
+class PositionBook(Mapping[str, Position]):
+    """
+    Open positions stored column-wise (SoA).
+
+    Quantities, average prices and realized PnL live in parallel arrays
+    indexed by slot. Slots are looked up through an array indexed by symbol
+    id, so the only string hash per fill is the symbol table's. Marking the book to market
+    is then a single dot product instead of a loop over Position objects.
+
+    Reads through the Mapping interface return fresh `Position` objects; the
+    book itself is only modified by the Portfolio.
+    """
+
+    def __init__(self, symbol_table: SymbolTable, capacity: int = 16) -> None:
+        self.symbol_table = symbol_table
+        self._slot_of = np.full(max(len(symbol_table), capacity), -1, dtype=np.intp)
+        self._symbols: List[str] = []
+        self.n = 0
+        self.sids = np.empty(capacity, dtype=np.intp)
+        self.qty = np.empty(capacity, dtype=np.float64)
+        self.avg_price = np.empty(capacity, dtype=np.float64)
+        self.realized_pnl = np.empty(capacity, dtype=np.float64)
+
+    # --- Mapping interface ---
+
+    def __getitem__(self, symbol: str) -> Position:
+        i = self.slot(symbol)
+        if i is None:
+            raise KeyError(symbol)
+        return Position(
+            symbol=symbol,
+            qty=self.qty.item(i),
+            avg_price=self.avg_price.item(i),
+            realized_pnl=self.realized_pnl.item(i),
+        )
+
+    def __contains__(self, symbol: object) -> bool:
+        return isinstance(symbol, str) and self.slot(symbol) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._symbols)
+
+    def __len__(self) -> int:
+        return self.n
+
+    # --- Mutation (Portfolio only) ---
+
+    def slot(self, symbol: str) -> int | None:
+        """Returns the slot of an open position, or None."""
+        sid = self.symbol_table.get(symbol)
+        return None if sid is None else self.slot_of_id(sid)
+
+    def slot_of_id(self, sid: int) -> int | None:
+        """Returns the slot of the open position in symbol id `sid`, or None."""
+        if sid >= len(self._slot_of):
+            return None
+        i = self._slot_of.item(sid)
+        return None if i < 0 else i
+
+    def open(self, symbol: str, qty: float, avg_price: float) -> int:
+        """Adds a new position at the end of the book and returns its slot."""
+        i = self.n
+        if i == len(self.qty):
+            capacity = 2 * i
+            self.sids = np.resize(self.sids, capacity)
+            self.qty = np.resize(self.qty, capacity)
+            self.avg_price = np.resize(self.avg_price, capacity)
+            self.realized_pnl = np.resize(self.realized_pnl, capacity)
+        sid = self.symbol_table.id(symbol)
+        if sid >= len(self._slot_of):
+            grown = np.full(max(2 * len(self._slot_of), sid + 1), -1, dtype=np.intp)
+            grown[: len(self._slot_of)] = self._slot_of
+            self._slot_of = grown
+        self._slot_of[sid] = i
+        self._symbols.append(symbol)
+        self.sids[i] = sid
+        self.qty[i] = qty
+        self.avg_price[i] = avg_price
+        self.realized_pnl[i] = 0.0
+        self.n = i + 1
+        return i
+
+    def close(self, symbol: str) -> None:
+        """Removes a position, keeping the remaining ones in order."""
+        sid = self.symbol_table.id(symbol)
+        i = self._slot_of.item(sid)
+        if i < 0:
+            raise KeyError(symbol)
+        self._slot_of[sid] = -1
+        n = self.n
+        for column in (self.sids, self.qty, self.avg_price, self.realized_pnl):
+            column[i : n - 1] = column[i + 1 : n]
+        del self._symbols[i]
+        self._slot_of[self.sids[i : n - 1]] -= 1
+        self.n = n - 1
+
+    def freeze(self) -> _Holdings:
+        """Returns a copy of the current holdings."""
+        n = self.n
+        return _Holdings(
+            symbols=list(self._symbols),
+            sids=self.sids[:n].copy(),
+            qty=self.qty[:n].copy(),
+            avg_price=self.avg_price[:n].copy(),
+            realized_pnl=self.realized_pnl[:n].copy(),
+        )
+
 
 class Portfolio:
     """
     A class to track portfolio state and performance through time.
     """
 
-    def __init__(self, initial_cash: float = 1_000_000.0) -> None:
+    def __init__(
+        self,
+        initial_cash: float = 1_000_000.0,
+        symbol_table: SymbolTable | None = None,
+        capacity: int = 0,
+    ) -> None:
         """
         Initializes the portfolio.
 
         Args:
             initial_cash: The starting cash balance.
+            symbol_table: Symbol id interner used to read price arrays;
+                defaults to the shared table.
+            capacity: Expected number of snapshots (e.g. bars). The history
+                buffers are preallocated to this size and grow geometrically
+                beyond it.
         """
+        self.symbol_table = (
+            symbol_table if symbol_table is not None else default_symbol_table
+        )
         self.initial_cash = initial_cash
         self.cash = initial_cash
-        self.positions: Dict[str, Position] = {}
-        self.history: List[PortfolioSnapshot] = []
+        self.positions = PositionBook(self.symbol_table)
+
+        # Snapshot history, stored column-wise in preallocated buffers. Each
+        # snapshot points at a positions "epoch": the copy of the holdings
+        # taken after the last fill, shared by all snapshots until the next.
+        self._n_snapshots = 0
+        self._ts_buf = np.empty(capacity, dtype=np.int64)  # UTC nanoseconds
+        self._ts_tz = None  # time zone of the recorded timestamps (None: naive)
+        self._nav_buf = np.empty(capacity, dtype=np.float64)
+        self._cash_buf = np.empty(capacity, dtype=np.float64)
+        self._epoch_buf = np.empty(capacity, dtype=np.intp)
+        self._epochs: List[_Holdings] = []
+        self._epoch_positions: List[Dict[str, Position]] = []  # materialized
+        self._epoch_stale = True
+        self._history: List[PortfolioSnapshot] = []  # materialized on demand
+        self._equity_curve: pd.Series | None = None  # cached until the next snapshot
+
+        # Snapshots recorded since the last fill. Holdings are constant over
+        # such a segment, so their NAVs are computed in one matrix product
+        # when the segment is flushed (on the next fill or history access).
+        self._segment_start: int | None = None
+        self._segment_prices: List[np.ndarray] = []
         logger.info(f"Portfolio initialized with cash: ${initial_cash:,.2f}")
 
     def update_on_fill(self, fill_event: FillEvent) -> None:
@@ -40,6 +258,14 @@ class Portfolio:
         This version correctly handles opening, increasing, reducing,
         closing, and flipping positions using a signed quantity.
         """
+        # Holdings are about to change, so value the snapshots taken so far
+        self._flush_snapshots()
+        self._epoch_stale = True
+
+        if NUMBA_AVAILABLE and len(fill_event.fills) >= _MIN_JIT_FILLS:
+            self._apply_fill_batch(fill_event)
+            return
+
         for fill in fill_event.fills:
             symbol = fill.symbol
             trade_value = fill.qty * fill.price # This will be negative for buys, positive for sells
@@ -49,82 +275,265 @@ class Portfolio:
             self.cash -= fill.fee
 
             # --- Position Update Logic ---
-            if symbol not in self.positions:
+            positions = self.positions
+            i = positions.slot(symbol)
+            if i is None:
                 # 1. Open a new position
-                new_position = Position(symbol=symbol, qty=fill.qty, avg_price=fill.price)
-                self.positions[symbol] = new_position
+                positions.open(symbol, fill.qty, fill.price)
             else:
-                # 2. Update an existing position
-                existing_position = self.positions[symbol]
-                
-                # Check if the trade is in the same direction as the existing position
-                is_same_direction = (existing_position.qty * fill.qty) > 0
-
-                if is_same_direction:
-                    # -- Increasing the position --
-                    total_qty = existing_position.qty + fill.qty
-                    total_value = (existing_position.avg_price * existing_position.qty) + (fill.price * fill.qty)
-                    existing_position.avg_price = total_value / total_qty
-                    existing_position.qty = total_qty
+                # 2. Increase, reduce, close or flip an existing position
+                new_qty, new_avg_price, pnl = _apply_fill(
+                    positions.qty.item(i), positions.avg_price.item(i), fill.qty, fill.price
+                )
+                positions.realized_pnl[i] += pnl
+                if new_qty == 0:
+                    positions.close(symbol)
                 else:
-                    # -- Reducing, closing, or flipping the position --
-                    position_direction = 1 if existing_position.qty > 0 else -1
-                    
-                    if abs(fill.qty) < abs(existing_position.qty):
-                        # -- Partially closing the position --
-                        qty_closed = abs(fill.qty)
-                        pnl = position_direction * (fill.price - existing_position.avg_price) * qty_closed
-                        existing_position.realized_pnl += pnl
-                        existing_position.qty += fill.qty
-                    else:
-                        # -- Fully closing and potentially flipping the position --
-                        qty_closed = abs(existing_position.qty)
-                        pnl = position_direction * (fill.price - existing_position.avg_price) * qty_closed
-                        existing_position.realized_pnl += pnl
-                        
-                        remaining_qty = fill.qty + existing_position.qty
-                        
-                        if remaining_qty == 0:
-                            del self.positions[symbol]
-                        else:
-                            # Position is flipped
-                            existing_position.qty = remaining_qty
-                            existing_position.avg_price = fill.price
-            
+                    positions.qty[i] = new_qty
+                    positions.avg_price[i] = new_avg_price
+
             side_log = "BUY" if fill.qty > 0 else "SELL"
             side_log = f"{side_log:<4}"
             qty_log = abs(fill.qty)
             logger.info(f"Processed fill: {side_log} {qty_log:<5} {fill.symbol:<5} @ ${fill.price:<8.2f} | Cash: ${self.cash:,.2f}")
 
-    def record_snapshot(self, timestamp: datetime, latest_prices: Dict[str, float]) -> None:
+    def update_on_fills(self, fill_events: Iterable[FillEvent]) -> None:
         """
-        Records the current state (NAV, cash, positions) of the portfolio.
+        Applies several fill events in order as one batch: the snapshots are
+        valued once, and the combined fills go through the compiled kernel
+        when there are enough of them. Equivalent to calling
+        `update_on_fill` for each event.
         """
-        market_value = 0.0
-        for symbol, position in self.positions.items():
-            price = latest_prices.get(symbol, position.avg_price)
-            market_value += position.qty * price
+        fill_events = list(fill_events)
+        if not fill_events:
+            return
+        fills = tuple(fill for event in fill_events for fill in event.fills)
+        self.update_on_fill(FillEvent(timestamp=fill_events[-1].timestamp, fills=fills))
 
-        nav = self.cash + market_value
+    def _apply_fill_batch(self, fill_event: FillEvent) -> None:
+        """
+        Applies a large batch of fills with the compiled kernel. New symbols
+        get an empty slot first, and positions that end flat are removed
+        afterwards.
+        """
+        fills = fill_event.fills
+        n = len(fills)
+        positions = self.positions
+        slots = np.empty(n, dtype=np.intp)
+        for k, fill in enumerate(fills):
+            i = positions.slot(fill.symbol)
+            slots[k] = positions.open(fill.symbol, 0.0, 0.0) if i is None else i
+        fill_qty = np.fromiter((fill.qty for fill in fills), dtype=np.float64, count=n)
+        fill_price = np.fromiter((fill.price for fill in fills), dtype=np.float64, count=n)
+        fill_fee = np.fromiter((fill.fee for fill in fills), dtype=np.float64, count=n)
 
-        snapshot = PortfolioSnapshot(
-            ts_utc=timestamp,
-            nav=nav,
-            cash=self.cash,
-            positions=self.positions.copy(),
+        cash_before = self.cash
+        self.cash = _apply_fills_nb(
+            slots,
+            fill_qty,
+            fill_price,
+            fill_fee,
+            positions.qty,
+            positions.avg_price,
+            positions.realized_pnl,
+            self.cash,
         )
-        self.history.append(snapshot)
+
+        for symbol in {fill.symbol for fill in fills}:
+            # Every filled symbol was given a slot above
+            i = positions.slot(symbol)
+            assert i is not None
+            if positions.qty.item(i) == 0:
+                positions.close(symbol)
+
+        if logger.isEnabledFor(logging.INFO):
+            cash_after = cash_before - np.cumsum(fill_qty * fill_price + fill_fee)
+            for fill, cash in zip(fills, cash_after.tolist()):
+                side_log = "BUY" if fill.qty > 0 else "SELL"
+                side_log = f"{side_log:<4}"
+                qty_log = abs(fill.qty)
+                logger.info(f"Processed fill: {side_log} {qty_log:<5} {fill.symbol:<5} @ ${fill.price:<8.2f} | Cash: ${cash:,.2f}")
+
+    def reserve_snapshots(self, n: int) -> None:
+        """
+        Preallocates room for `n` more snapshots, e.g. one per timestamp of
+        the backtest, so recording never has to grow the buffers.
+        """
+        self._reserve(self._n_snapshots + n)
+
+    @property
+    def history(self) -> List[PortfolioSnapshot]:
+        """
+        The recorded snapshots, in chronological order. Snapshot objects are
+        built from the column buffers on first access.
+        """
+        self._flush_snapshots()
+        start, stop = len(self._history), self._n_snapshots
+        if start < stop:
+            epoch_positions = self._epoch_positions
+            for holdings in self._epochs[len(epoch_positions) :]:
+                epoch_positions.append(
+                    {
+                        symbol: Position(
+                            symbol=symbol, qty=qty, avg_price=avg_price, realized_pnl=pnl
+                        )
+                        for symbol, qty, avg_price, pnl in zip(
+                            holdings.symbols,
+                            holdings.qty.tolist(),
+                            holdings.avg_price.tolist(),
+                            holdings.realized_pnl.tolist(),
+                        )
+                    }
+                )
+            self._history.extend(
+                PortfolioSnapshot(
+                    ts_utc=self._to_timestamp(ts),
+                    nav=nav,
+                    cash=cash,
+                    positions=epoch_positions[epoch],
+                )
+                for ts, nav, cash, epoch in zip(
+                    self._ts_buf[start:stop].tolist(),
+                    self._nav_buf[start:stop].tolist(),
+                    self._cash_buf[start:stop].tolist(),
+                    self._epoch_buf[start:stop].tolist(),
+                )
+            )
+        return self._history
+
+    def record_snapshot(
+        self, timestamp: datetime, latest_prices: Mapping[str, float] | np.ndarray
+    ) -> None:
+        """
+        Records the current state (NAV, cash, positions) of the portfolio.
+
+        `latest_prices` is either a symbol -> price mapping or an array
+        indexed by symbol id (NaN for unknown), as kept by the DataHandler.
+        Positions without a known price are marked at their average price.
+
+        For the array form only the held symbols' prices are copied here; the
+        NAV itself is computed lazily for the whole segment between fills.
+        """
+        if not isinstance(latest_prices, np.ndarray):
+            self._flush_snapshots()
+            holdings = self._current_holdings()
+            prices = np.fromiter(
+                (
+                    latest_prices.get(symbol, avg_price)
+                    for symbol, avg_price in zip(holdings.symbols, holdings.avg_price.tolist())
+                ),
+                dtype=np.float64,
+                count=len(holdings.symbols),
+            )
+            market_value = float(holdings.qty @ prices)
+            self._append_snapshot(timestamp, self.cash + market_value)
+            return
+
+        if self._segment_start is None:
+            self._segment_start = self._n_snapshots
+
+        sids = self._current_holdings().sids
+        n_prices = len(latest_prices)
+        known = (sids >= 0) & (sids < n_prices)
+        if known.all():
+            prices = latest_prices[sids]
+        else:
+            prices = np.full(len(sids), np.nan)
+            prices[known] = latest_prices[sids[known]]
+
+        self._append_snapshot(timestamp, np.nan)  # NAV filled in on flush
+        self._segment_prices.append(prices)
+
+    def _reserve(self, capacity: int) -> None:
+        """Grows the snapshot buffers to hold at least `capacity` rows."""
+        if capacity <= len(self._ts_buf):
+            return
+        self._ts_buf = np.resize(self._ts_buf, capacity)
+        self._nav_buf = np.resize(self._nav_buf, capacity)
+        self._cash_buf = np.resize(self._cash_buf, capacity)
+        self._epoch_buf = np.resize(self._epoch_buf, capacity)
+
+    def _current_holdings(self) -> _Holdings:
+        """Returns the frozen holdings of the current epoch."""
+        if self._epoch_stale:
+            self._epochs.append(self.positions.freeze())
+            self._epoch_stale = False
+        return self._epochs[-1]
+
+    def _to_timestamp(self, ts_ns: int) -> pd.Timestamp:
+        """Converts a buffered timestamp back to the recorded time zone."""
+        if self._ts_tz is None:
+            return pd.Timestamp(ts_ns)
+        return pd.Timestamp(ts_ns, tz="UTC").tz_convert(self._ts_tz)
+
+    def _append_snapshot(self, timestamp: datetime, nav: float) -> None:
+        """Writes one snapshot row into the column buffers."""
+        self._current_holdings()
+
+        i = self._n_snapshots
+        if i == len(self._ts_buf):
+            self._reserve(max(2 * i, 256))
+        ts = timestamp if isinstance(timestamp, pd.Timestamp) else pd.Timestamp(timestamp)
+        if i == 0:
+            self._ts_tz = ts.tz
+        self._ts_buf[i] = ts.value
+        self._nav_buf[i] = nav
+        self._cash_buf[i] = self.cash
+        self._epoch_buf[i] = len(self._epochs) - 1
+        self._n_snapshots = i + 1
+
+    def _flush_snapshots(self) -> None:
+        """
+        Values all pending snapshots at once: NAV = cash + prices @ qty.
+        """
+        start = self._segment_start
+        if start is None:
+            return
+
+        holdings = self._epochs[-1]
+        prices = np.vstack(self._segment_prices)
+        # NaN: no bar seen yet, so mark at the average price
+        prices = np.where(np.isnan(prices), holdings.avg_price, prices)
+        self._nav_buf[start : self._n_snapshots] = self.cash + prices @ holdings.qty
+
+        self._segment_start = None
+        self._segment_prices = []
+
+    def get_equity_array(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the NAV history as plain arrays: UTC timestamps in int64
+        nanoseconds and the matching float64 NAVs. Read-only views of the
+        snapshot buffers, for callers that don't need a pandas Series.
+        """
+        self._flush_snapshots()
+        n = self._n_snapshots
+        ts, nav = self._ts_buf[:n], self._nav_buf[:n]
+        ts.flags.writeable = False
+        nav.flags.writeable = False
+        return ts, nav
 
     def get_equity_curve(self) -> pd.Series:
         """
         Returns the portfolio's Net Asset Value (NAV) over time as a pandas Series.
+
+        The index keeps the time zone the timestamps were recorded in (naive
+        stays naive). Flushed NAVs never change, so the Series, a read-only
+        view of the NAV buffer, is reused until another snapshot is recorded.
         """
-        if not self.history:
+        self._flush_snapshots()
+        n = self._n_snapshots
+        if n == 0:
             return pd.Series(dtype=float)
+        equity_curve = self._equity_curve
+        if equity_curve is not None and len(equity_curve) == n:
+            return equity_curve
 
-        timestamps = [s.ts_utc for s in self.history]
-        navs = [s.nav for s in self.history]
-        
-        equity_curve = pd.Series(data=navs, index=timestamps, name="NAV")
+        # Wraps the buffers without copying
+        index = pd.DatetimeIndex(self._ts_buf[:n].view("datetime64[ns]"))
+        if self._ts_tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self._ts_tz)
+        nav = self._nav_buf[:n]
+        nav.flags.writeable = False
+        equity_curve = pd.Series(data=nav, index=index, name="NAV", copy=False)
+        self._equity_curve = equity_curve
         return equity_curve
-
@@ -0,0 +1,76 @@
+"""
+Interning of symbol strings to small, dense integer ids.
+
+Hot backtest paths (latest prices, the limit order book, per-bar arrays)
+index NumPy arrays by symbol id instead of hashing ticker strings in dicts.
+Components share the process-wide `default_symbol_table` unless given their
+own, so ids are consistent across the DataHandler, ExecutionSimulator and
+Portfolio without extra wiring.
+"""
+from __future__ import annotations
+from typing import Dict, Iterable, Iterator, List
+
+import numpy as np
+
+
+class SymbolTable:
+    """
+    A bidirectional, append-only mapping between symbols and integer ids.
+
+    Ids are assigned in order of first appearance, starting at 0, and are
+    never reused, so they can be used directly as array indices.
+    """
+
+    def __init__(self, symbols: Iterable[str] = ()) -> None:
+        self._ids: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        for symbol in symbols:
+            self.id(symbol)
+
+    def id(self, symbol: str) -> int:
+        """Returns the id for a symbol, interning it on first sight."""
+        sid = self._ids.get(symbol)
+        if sid is None:
+            sid = self._ids[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+        return sid
+
+    def ids(self, symbols: Iterable[str]) -> np.ndarray:
+        """
+        Vectorized `id` for a column of symbols. Only the unique values are
+        looked up in Python; the result is broadcast back with NumPy.
+        """
+        symbols = np.asarray(symbols, dtype=object)
+        if symbols.size == 0:
+            return np.empty(0, dtype=np.intp)
+        unique, inverse = np.unique(symbols, return_inverse=True)
+        unique_ids = np.fromiter(
+            (self.id(s) for s in unique), dtype=np.intp, count=len(unique)
+        )
+        return unique_ids[inverse.reshape(-1)]
+
+    def get(self, symbol: str, default: int | None = None) -> int | None:
+        """Returns the id for a known symbol without interning it."""
+        return self._ids.get(symbol, default)
+
+    def symbol(self, sid: int) -> str:
+        """Returns the symbol for an id."""
+        return self._symbols[sid]
+
+    @property
+    def symbols(self) -> List[str]:
+        """All interned symbols, ordered by id."""
+        return self._symbols
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._symbols)
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+
+# Process-wide table shared by backtest components by default.
+default_symbol_table = SymbolTable()
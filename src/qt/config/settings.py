@@ -10,7 +10,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DataSettings:
     """Configuration for data sources and storage."""
 
@@ -19,21 +19,21 @@ class DataSettings:
     provider: str | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AdjustmentsSettings:
     """Controls how price series are adjusted."""
 
     mode: str = "close"  # none|close|ohlc
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CalendarSettings:
     """Trading calendar settings."""
 
     default: str = "XNAS"  # Default calendar (XNAS = Nasdaq, 24x7 = crypto)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Settings:
     """Global configuration bundle."""
 
@@ -17,15 +17,16 @@ These schemas are used by:
 - The data loader to validate data upon retrieval.
 """
 
-from typing import Dict, Annotated
+import copy
+from typing import Dict, Literal, Sequence
+import pandas as pd
 import pandera as pa
-from pandera.dtypes import Timestamp
 
 
-# Type alias for a timezone-aware timestamp for clarity and reuse.
-# Annotated tells Pandera to use a Timestamp, and the "UTC" string is
-# metadata that Pandera uses to set the timezone.
-UTC_TIMESTAMP = Annotated[Timestamp, "UTC"]
+# Timezone-aware UTC timestamp dtype, shared by all schemas. A concrete
+# pandas dtype, so both coercion (strict) and the exact dtype check (fast)
+# expect `datetime64[ns, UTC]`.
+UTC_TIMESTAMP = pd.DatetimeTZDtype(unit="ns", tz="UTC")
 
 
 # Defines the schema for candlestick (bar) data.
@@ -100,3 +101,63 @@ SCHEMA_REGISTRY: Dict[str, pa.DataFrameSchema] = {
     "quotes": QuoteSchema,
     "refdata": ReferenceDataSchema,
 }
+
+
+def _without_coercion(schema: pa.DataFrameSchema) -> pa.DataFrameSchema:
+    """Returns a copy of a schema that checks dtypes instead of coercing them."""
+    fast_schema = copy.deepcopy(schema)
+    fast_schema.coerce = False
+    return fast_schema
+
+
+# Non-coercing variants for the read path. Data written by our storage
+# backends (Parquet encodes dtypes) already matches the schema, so coercion,
+# which re-walks and may copy every column, is only needed at ingestion.
+BarSchemaFast = _without_coercion(BarSchema)
+TradeSchemaFast = _without_coercion(TradeSchema)
+QuoteSchemaFast = _without_coercion(QuoteSchema)
+ReferenceDataSchemaFast = _without_coercion(ReferenceDataSchema)
+
+FAST_SCHEMA_REGISTRY: Dict[str, pa.DataFrameSchema] = {
+    "bars": BarSchemaFast,
+    "trades": TradeSchemaFast,
+    "quotes": QuoteSchemaFast,
+    "refdata": ReferenceDataSchemaFast,
+}
+
+
+def validate(
+    df: pd.DataFrame,
+    schema_name: str,
+    mode: Literal["strict", "fast"] = "strict",
+    lazy: bool = False,
+    columns: Sequence[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Validates a DataFrame against a registered schema.
+
+    Args:
+        df: The data to validate.
+        schema_name: Key into `SCHEMA_REGISTRY` ("bars", "trades", ...).
+        mode: "strict" coerces dtypes (use at ingestion); "fast" only checks
+            them (use when reading data that was validated on write).
+        lazy: Collect all schema errors instead of raising on the first.
+        columns: Only require these of the schema's columns (e.g. for a
+            projected read). Columns outside the schema are still rejected.
+
+    Returns:
+        The validated (and, in strict mode, coerced) DataFrame.
+
+    Raises:
+        ValueError: If `mode` is not "strict" or "fast".
+    """
+    if mode == "strict":
+        registry = SCHEMA_REGISTRY
+    elif mode == "fast":
+        registry = FAST_SCHEMA_REGISTRY
+    else:
+        raise ValueError(f"Unknown validation mode {mode!r}; expected 'strict' or 'fast'.")
+    schema = registry[schema_name]
+    if columns is not None:
+        schema = schema.select_columns([col for col in columns if col in schema.columns])
+    return schema.validate(df, lazy=lazy)
@@ -1,12 +1,78 @@
 from __future__ import annotations
 from pathlib import Path
 from typing import Sequence, Optional, Dict, Any
+import duckdb
 import pandas as pd
+import pyarrow as pa
+from qt.data.schema import validate
 from .base import Storage
+from .parquet import _PARTITION_COLS
+
+
+def _query_lake(
+    con: duckdb.DuckDBPyConnection,
+    path: Path,
+    schema_name: str,
+    partition_cols: Sequence[str],
+    symbols: Sequence[str],
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    columns: Optional[Sequence[str]],
+    **equals: str,
+) -> pd.DataFrame:
+    """
+    Runs a filtered scan over a hive-partitioned Parquet dataset in DuckDB.
+
+    Partition predicates prune directories, the remaining predicates and the
+    column list are pushed into DuckDB's multi-threaded Parquet reader, and
+    the result is handed over as Arrow instead of row-wise Python objects.
+    Like `ParquetStorage`, the result is checked against the `schema_name`
+    schema without coercion.
+    """
+    start = pd.Timestamp(start)
+    start = start.tz_localize("UTC") if start.tzinfo is None else start.tz_convert("UTC")
+    end = pd.Timestamp(end)
+    end = end.tz_localize("UTC") if end.tzinfo is None else end.tz_convert("UTC")
+
+    select = "* EXCLUDE (date)" if "date" in partition_cols else "*"
+    if columns is not None:
+        select = ", ".join(f'"{col}"' for col in columns)
+    hive_types = ", ".join(f"'{col}': 'VARCHAR'" for col in partition_cols)
+
+    where = ["list_contains(?, symbol)", "ts_utc BETWEEN ? AND ?"]
+    params: list = [list(symbols), start, end]
+    for field, value in equals.items():
+        where.append(f'"{field}" = ?')
+        params.append(value)
+    if "date" in partition_cols:
+        where.append("date BETWEEN ? AND ?")
+        params += [start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")]
+
+    query = (
+        f"SELECT {select} FROM read_parquet(?, hive_partitioning = true, "
+        f"hive_types = {{{hive_types}}}) WHERE {' AND '.join(where)}"
+    )
+    result = con.execute(query, [str(path / "**" / "*.parquet"), *params])
+    table = pa.table(result.arrow())
+    if "ts_utc" in table.column_names:
+        i = table.column_names.index("ts_utc")
+        table = table.set_column(
+            i, "ts_utc", table.column(i).cast(pa.timestamp("ns", tz="UTC"))
+        )
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    return validate(df, schema_name, mode="fast", columns=df.columns)
 
 
 class DuckDBStorage(Storage):
-    """DuckDB storage backend implementation."""
+    """
+    DuckDB storage backend implementation.
+
+    Reads query the hive-partitioned Parquet lake written by
+    `ParquetStorage` directly, without loading it into a database first.
+    """
+
+    def __init__(self, database: str = ":memory:") -> None:
+        self.con = duckdb.connect(database)
 
     def read_bars(
         self,
@@ -18,7 +84,17 @@ class DuckDBStorage(Storage):
         columns: Optional[Sequence[str]] = None,
     ) -> pd.DataFrame:
         """Read bars from a DuckDB database."""
-        raise NotImplementedError
+        return _query_lake(
+            self.con,
+            Path(root) / "bars",
+            "bars",
+            _PARTITION_COLS["bars"],
+            symbols,
+            start,
+            end,
+            columns,
+            interval=interval,
+        )
 
     def write_bars(
         self, df: pd.DataFrame, root: Path, partitioning: Dict[str, Any] | None = None
@@ -35,7 +111,16 @@ class DuckDBStorage(Storage):
         columns: Optional[Sequence[str]] = None,
     ) -> pd.DataFrame:
         """Read trades from a DuckDB database."""
-        raise NotImplementedError
+        return _query_lake(
+            self.con,
+            Path(root) / "trades",
+            "trades",
+            _PARTITION_COLS["trades"],
+            symbols,
+            start,
+            end,
+            columns,
+        )
 
     def write_trades(
         self, df: pd.DataFrame, root: Path, partitioning: Dict[str, Any] | None = None
@@ -52,7 +137,16 @@ class DuckDBStorage(Storage):
         columns: Optional[Sequence[str]] = None,
     ) -> pd.DataFrame:
         """Read quotes from a DuckDB database."""
-        raise NotImplementedError
+        return _query_lake(
+            self.con,
+            Path(root) / "quotes",
+            "quotes",
+            _PARTITION_COLS["quotes"],
+            symbols,
+            start,
+            end,
+            columns,
+        )
 
     def write_quotes(
         self, df: pd.DataFrame, root: Path, partitioning: Dict[str, Any] | None = None
@@ -1,12 +1,222 @@
 from __future__ import annotations
 from pathlib import Path
 from typing import Sequence, Optional, Dict, Any
+import uuid
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as pds
+from qt.data.schema import SCHEMA_REGISTRY, validate
 from .base import Storage
 
+# Default hive partition columns per dataset. "date" is the UTC calendar
+# day of `ts_utc`, derived on write.
+_PARTITION_COLS: Dict[str, Sequence[str]] = {
+    "bars": ("symbol", "interval", "date"),
+    "trades": ("symbol", "date"),
+    "quotes": ("symbol", "date"),
+}
+
+# Columns identifying a row within a partition, besides the partition
+# columns themselves. On write, incoming rows replace stored rows with the
+# same key; all other stored rows are kept. Rows with a null key column
+# (e.g. trades without a `trade_id`) have no identity and are never replaced.
+_ROW_KEYS: Dict[str, Sequence[str]] = {
+    "bars": ("ts_utc", "venue"),
+    "trades": ("ts_utc", "venue", "trade_id"),
+    "quotes": ("ts_utc", "venue"),
+}
+
+# Rows per output file; large files keep row-group metadata overhead low.
+_MAX_ROWS_PER_FILE = 1_000_000
+
+
+def _hive_partitioning(partition_cols: Sequence[str]) -> pds.Partitioning:
+    """Hive partitioning with every partition value read as a string."""
+    return pds.partitioning(
+        pa.schema([(col, pa.string()) for col in partition_cols]), flavor="hive"
+    )
+
+
+def _stored_rows(
+    path: Path, partition_cols: Sequence[str], partitions: pd.DataFrame
+) -> pd.DataFrame | None:
+    """
+    Reads the stored rows of the given partitions (one row of partition
+    values each), or None if none of them hold data yet.
+    """
+    if not path.exists():
+        return None
+    dataset = pds.dataset(
+        path, format="parquet", partitioning=_hive_partitioning(partition_cols)
+    )
+    expr = None
+    for col in partition_cols:
+        cond = pds.field(col).isin(partitions[col].unique().tolist())
+        expr = cond if expr is None else expr & cond
+    stored = dataset.to_table(filter=expr).to_pandas()
+    if stored.empty:
+        return None
+    # The filter is per column; keep only the exact partitions being written
+    touched = pd.MultiIndex.from_frame(partitions)
+    return stored[pd.MultiIndex.from_frame(stored[partition_cols]).isin(touched)]
+
+
+def _merge_rows(df: pd.DataFrame, key: Sequence[str]) -> pd.DataFrame:
+    """
+    Keeps the last row for each `key`; rows with a null or missing key
+    column are all kept, since nothing identifies them as duplicates.
+    """
+    keyed = df.reindex(columns=list(key)).notna().all(axis=1)
+    if keyed.all():
+        return df.drop_duplicates(subset=key, keep="last")
+    if not keyed.any():
+        return df
+    return pd.concat(
+        [df[keyed].drop_duplicates(subset=key, keep="last"), df[~keyed]],
+        ignore_index=True,
+    )
+
+
+def _write_dataset(
+    df: pd.DataFrame,
+    path: Path,
+    schema_name: str,
+    partition_cols: Sequence[str],
+    row_keys: Sequence[str],
+    partitioning: Dict[str, Any] | None,
+) -> None:
+    """
+    Writes a DataFrame into a hive-partitioned Parquet dataset.
+
+    The frame is first validated against the full `schema_name` schema in
+    strict mode, coercing dtypes (e.g. integer volumes to float), so
+    everything in the lake passes the fast, non-coercing check on read.
+    Missing optional (nullable) columns are added as nulls; frames missing
+    a required column are rejected.
+
+    Rows are merged into their partitions: an incoming row replaces any
+    stored or earlier incoming row with the same partition values and
+    `row_keys` (so re-writing a slice is idempotent), and every other row is
+    kept. Only the partitions that receive data are read and rewritten.
+
+    The frame is converted to Arrow once and split into partitions by
+    PyArrow's multi-threaded dataset writer. `ts_utc` may be a column or
+    the index (as in the DataHandler layout). `partitioning` may set
+    "max_rows_per_file"; the partition columns are fixed, since the readers
+    rely on them.
+
+    Raises:
+        ValueError: If `partitioning` holds any other key.
+    """
+    partitioning = partitioning or {}
+    unknown = set(partitioning) - {"max_rows_per_file"}
+    if unknown:
+        raise ValueError(
+            f"Unsupported partitioning options {sorted(unknown)}; "
+            "only 'max_rows_per_file' can be set."
+        )
+    partition_cols = list(partition_cols)
+
+    if "ts_utc" not in df.columns and df.index.name == "ts_utc":
+        df = df.reset_index()
+    df = df.assign(ts_utc=pd.to_datetime(df["ts_utc"], utc=True))
+    # Optional (nullable) columns the frame lacks are stored as nulls, so
+    # every file in the lake has the full schema
+    schema = SCHEMA_REGISTRY[schema_name]
+    missing = [
+        name for name, col in schema.columns.items() if col.nullable and name not in df.columns
+    ]
+    df = validate(df.assign(**{name: None for name in missing}), schema_name, mode="strict")
+    if "date" in partition_cols:
+        df = df.assign(date=df["ts_utc"].dt.strftime("%Y-%m-%d"))
+    # Hive partition values are path strings
+    df = df.astype({col: str for col in partition_cols})
+
+    stored = _stored_rows(path, partition_cols, df[partition_cols].drop_duplicates())
+    if stored is not None:
+        df = pd.concat([stored, df], ignore_index=True)
+    df = _merge_rows(df, [*partition_cols, *row_keys])
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # All-null columns are untyped in Arrow; only string columns can end up
+    # that way (numeric ones are coerced to float), so store them as such
+    table = table.cast(
+        pa.schema(
+            [pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f for f in table.schema],
+            metadata=table.schema.metadata,
+        )
+    )
+    max_rows = partitioning.get("max_rows_per_file", _MAX_ROWS_PER_FILE)
+    pds.write_dataset(
+        table,
+        path,
+        format="parquet",
+        partitioning=_hive_partitioning(partition_cols),
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="delete_matching",
+        max_rows_per_file=max_rows,
+        max_rows_per_group=max_rows,
+        use_threads=True,
+    )
+
+
+def _utc_scalar(ts: pd.Timestamp) -> pa.Scalar:
+    """Converts a timestamp (naive means UTC) to an Arrow UTC scalar."""
+    ts = pd.Timestamp(ts)
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return pa.scalar(ts, type=pa.timestamp("ns", tz="UTC"))
+
+
+def _read_dataset(
+    path: Path,
+    schema_name: str,
+    partition_cols: Sequence[str],
+    symbols: Sequence[str],
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    columns: Optional[Sequence[str]],
+    **equals: str,
+) -> pd.DataFrame:
+    """
+    Reads the rows of a partitioned dataset for the given symbols and
+    [start, end] range.
+
+    The filter is pushed down to PyArrow: symbol/date (and any `equals`)
+    conditions prune whole partition directories, and the ts_utc range
+    skips row groups via Parquet statistics. Only the requested columns are
+    decoded. The result is checked against the `schema_name` schema without
+    coercion (it was written from validated data).
+    """
+    dataset = pds.dataset(
+        path, format="parquet", partitioning=_hive_partitioning(partition_cols)
+    )
+
+    start_utc, end_utc = _utc_scalar(start), _utc_scalar(end)
+    expr = pds.field("symbol").isin(list(symbols))
+    for field, value in equals.items():
+        expr &= pds.field(field) == value
+    if "date" in partition_cols:
+        expr &= (pds.field("date") >= start_utc.as_py().strftime("%Y-%m-%d")) & (
+            pds.field("date") <= end_utc.as_py().strftime("%Y-%m-%d")
+        )
+    expr &= (pds.field("ts_utc") >= start_utc) & (pds.field("ts_utc") <= end_utc)
+
+    if columns is None:
+        # The "date" partition is derived on write, not part of the data
+        columns = [name for name in dataset.schema.names if name != "date"]
+    table = dataset.to_table(columns=list(columns), filter=expr)
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    return validate(df, schema_name, mode="fast", columns=df.columns)
+
 
 class ParquetStorage(Storage):
-    """Parquet storage backend implementation."""
+    """
+    Parquet storage backend implementation.
+
+    Each data type is a hive-partitioned dataset under `root`: bars in
+    `root/bars/symbol=*/interval=*/date=*/`, trades and quotes in
+    `root/{trades,quotes}/symbol=*/date=*/`.
+    """
 
     def read_bars(
         self,
@@ -18,13 +228,29 @@ class ParquetStorage(Storage):
         columns: Optional[Sequence[str]] = None,
     ) -> pd.DataFrame:
         """Read bars from a Parquet lake (partitioned by symbol/interval/date)."""
-        raise NotImplementedError
+        return _read_dataset(
+            Path(root) / "bars",
+            "bars",
+            _PARTITION_COLS["bars"],
+            symbols,
+            start,
+            end,
+            columns,
+            interval=interval,
+        )
 
     def write_bars(
         self, df: pd.DataFrame, root: Path, partitioning: Dict[str, Any] | None = None
     ) -> None:
         """Write bars to a Parquet lake."""
-        raise NotImplementedError
+        _write_dataset(
+            df,
+            Path(root) / "bars",
+            "bars",
+            _PARTITION_COLS["bars"],
+            _ROW_KEYS["bars"],
+            partitioning,
+        )
 
     def read_trades(
         self,
@@ -35,13 +261,28 @@ class ParquetStorage(Storage):
         columns: Optional[Sequence[str]] = None,
     ) -> pd.DataFrame:
         """Read trades from a Parquet lake."""
-        raise NotImplementedError
+        return _read_dataset(
+            Path(root) / "trades",
+            "trades",
+            _PARTITION_COLS["trades"],
+            symbols,
+            start,
+            end,
+            columns,
+        )
 
     def write_trades(
         self, df: pd.DataFrame, root: Path, partitioning: Dict[str, Any] | None = None
     ) -> None:
         """Write trades to a Parquet lake."""
-        raise NotImplementedError
+        _write_dataset(
+            df,
+            Path(root) / "trades",
+            "trades",
+            _PARTITION_COLS["trades"],
+            _ROW_KEYS["trades"],
+            partitioning,
+        )
 
     def read_quotes(
         self,
@@ -52,10 +293,25 @@ class ParquetStorage(Storage):
         columns: Optional[Sequence[str]] = None,
     ) -> pd.DataFrame:
         """Read quotes from a Parquet lake."""
-        raise NotImplementedError
+        return _read_dataset(
+            Path(root) / "quotes",
+            "quotes",
+            _PARTITION_COLS["quotes"],
+            symbols,
+            start,
+            end,
+            columns,
+        )
 
     def write_quotes(
         self, df: pd.DataFrame, root: Path, partitioning: Dict[str, Any] | None = None
     ) -> None:
         """Write quotes to a Parquet lake."""
-        raise NotImplementedError
+        _write_dataset(
+            df,
+            Path(root) / "quotes",
+            "quotes",
+            _PARTITION_COLS["quotes"],
+            _ROW_KEYS["quotes"],
+            partitioning,
+        )
@@ -2,6 +2,8 @@
 Functions for creating interactive, visual performance reports (tearsheets) using Plotly.
 """
 from __future__ import annotations
+import hashlib
+import math
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
@@ -9,43 +11,245 @@ from plotly.subplots import make_subplots
 import webbrowser
 import tempfile
 import os
-from typing import List
+from typing import Dict, List
 
 from qt.backtest.metrics import generate_performance_summary
 from qt.types import Fill
+from qt.utils.jit import NUMBA_AVAILABLE, njit
 from qt.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Fill fields used by the tearsheet. Timestamps and symbols stay Python
+# objects (tz-aware datetimes have no NumPy representation).
+_FILL_DTYPE = np.dtype(
+    [('ts_utc', 'O'), ('symbol', 'O'), ('qty', 'f8'), ('price', 'f8')]
+)
 
-def _show_fig_full_screen(fig, title: str = "Backtest Report"):
+# Rendered report files keyed by a hash of the tearsheet inputs, so
+# re-running the same tearsheet (e.g. in a parameter sweep) reopens the
+# existing file instead of rebuilding and re-serializing the figure. The
+# files themselves outlive the process, as the browser may still be
+# loading them when it exits.
+_REPORT_CACHE: Dict[str, str] = {}
+
+# Performance summaries keyed by equity curve digest (oldest evicted first).
+_SUMMARY_CACHE: Dict[bytes, dict] = {}
+_SUMMARY_CACHE_SIZE = 64
+
+
+def _equity_digest(equity_curve: pd.Series) -> bytes:
     """
-    Generates a full-screen HTML file for a Plotly figure with a dark theme.
+    Hashes an equity curve's values and timestamps. The index dtype is
+    included because the hash ignores the time zone.
+    """
+    h = hashlib.blake2b(str(equity_curve.index.dtype).encode(), digest_size=16)
+    h.update(pd.util.hash_pandas_object(equity_curve).to_numpy().tobytes())
+    return h.digest()
+
+
+def _report_key(
+    equity_digest: bytes,
+    fills: List[Fill],
+    historical_data: pd.DataFrame,
+    strategy_name: str,
+) -> str:
+    """
+    Hashes the tearsheet inputs into a report cache key: the equity curve
+    digest, the contents (and index time zone) of the market data, the
+    fills, and the name.
+    """
+    h = hashlib.blake2b(equity_digest, digest_size=16)
+    h.update(repr((list(historical_data.columns), str(historical_data.index.dtype))).encode())
+    h.update(pd.util.hash_pandas_object(historical_data, index=True).to_numpy())
+    if fills:
+        records = np.fromiter(
+            ((f.ts_utc, f.symbol, f.qty, f.price) for f in fills),
+            dtype=_FILL_DTYPE,
+            count=len(fills),
+        )
+        h.update(
+            pd.util.hash_pandas_object(pd.DataFrame.from_records(records), index=False).to_numpy()
+        )
+    h.update(f"{len(fills)}|{strategy_name}".encode())
+    return h.hexdigest()
+
+
+def _performance_summary(equity_curve: pd.Series, equity_digest: bytes) -> dict:
+    """`generate_performance_summary`, memoized on the equity curve digest."""
+    summary = _SUMMARY_CACHE.get(equity_digest)
+    if summary is None:
+        summary = generate_performance_summary(equity_curve)
+        if len(_SUMMARY_CACHE) >= _SUMMARY_CACHE_SIZE:
+            del _SUMMARY_CACHE[next(iter(_SUMMARY_CACHE))]
+        _SUMMARY_CACHE[equity_digest] = summary
+    return dict(summary)
+
+
+def _open_cached_reports(keys: List[str]) -> bool:
+    """
+    Opens previously rendered reports. Returns False, opening nothing,
+    unless every key is cached.
+    """
+    cached = [_REPORT_CACHE.get(key) for key in keys]
+    if not all(filepath and os.path.exists(filepath) for filepath in cached):
+        return False
+    filepaths = [filepath for filepath in cached if filepath]
+    for filepath in filepaths:
+        webbrowser.open('file://' + filepath)
+        logger.info(f"Report opened in a new browser tab. Cached file: {filepath}")
+    return True
+
+
+@njit(cache=True)
+def _drawdown_and_pnl_nb(nav):
+    """
+    Numba kernel: drawdown (%) from the running peak and period PnL in a
+    single pass over the NAV array. The first PnL value is NaN.
+    """
+    n = nav.shape[0]
+    drawdown = np.empty(n)
+    pnl = np.empty(n)
+    peak = nav[0]
+    prev = np.nan
+    for i in range(n):
+        x = nav[i]
+        if x > peak:
+            peak = x
+        drawdown[i] = 100.0 * (x / peak - 1.0)
+        pnl[i] = x - prev
+        prev = x
+    return drawdown, pnl
+
+
+def _drawdown_and_pnl_np(nav):
+    """Vectorized NumPy equivalent of `_drawdown_and_pnl_nb`."""
+    drawdown = 100.0 * (nav / np.maximum.accumulate(nav) - 1.0)
+    return drawdown, np.diff(nav, prepend=np.nan)
+
+
+_drawdown_and_pnl = _drawdown_and_pnl_nb if NUMBA_AVAILABLE else _drawdown_and_pnl_np
+
+
+def _symbols_in(symbols: pd.Series) -> List[str]:
+    """
+    Returns the sorted distinct symbols of a column. For a categorical
+    column this reads the categories that occur in the integer codes
+    instead of hashing every string.
+    """
+    if isinstance(symbols.dtype, pd.CategoricalDtype):
+        codes = symbols.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(symbols.cat.categories))
+        return sorted(symbols.cat.categories[counts > 0])
+    return sorted(symbols.unique())
+
+
+def _nice_step(raw: float) -> float:
+    """Rounds a tick spacing up to 1, 2 or 5 times a power of ten."""
+    magnitude = 10.0 ** math.floor(math.log10(raw))
+    for multiple in (1.0, 2.0, 5.0):
+        if multiple * magnitude >= raw:
+            return multiple * magnitude
+    return 10.0 * magnitude
+
+
+def _log_axis_ticks(nav: np.ndarray) -> tuple[np.ndarray, List[str]]:
+    """
+    Tick positions (log10 of dollar values) and dollar labels for an equity
+    curve plotted as log10(NAV) on a linear axis. Curves spanning a decade
+    or more get 1-2-5 ticks per decade; narrower ones get evenly spaced
+    round dollar values.
+    """
+    positive = nav[nav > 0]
+    if positive.size == 0:
+        return np.empty(0), []
+    lo, hi = float(positive.min()), float(positive.max())
+    if hi / lo >= 10:
+        values = np.array([
+            m * 10.0 ** e
+            for e in range(math.floor(math.log10(lo)), math.ceil(math.log10(hi)) + 1)
+            for m in (1, 2, 5)
+            if lo <= m * 10.0 ** e <= hi
+        ])
+        step = float(values.min())
+    elif hi > lo:
+        step = _nice_step((hi - lo) / 5)
+        values = np.arange(math.ceil(lo / step) * step, hi + step / 2, step)
+    else:
+        step, values = lo, np.array([lo])
+    decimals = max(0, -math.floor(math.log10(step)))
+    return np.log10(values), [f"${v:,.{decimals}f}" for v in values]
+
+
+def _typed(values) -> np.ndarray:
+    """
+    Returns trace data as a contiguous float64 array, which Plotly encodes
+    as a compact base64 typed array instead of a JSON list of numbers.
     """
-    html = fig.to_html(full_html=True, include_plotlyjs='cdn')
-    style = f"""
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+# Page chrome around the figure div: a full-screen dark background.
+_PAGE_STYLE = """
     <style>
-        body {{
+        body {
             background-color: #111111;
             margin: 0;
             padding: 0;
-        }}
-        .plotly-graph-div {{
+        }
+        .plotly-graph-div {
             height: 100vh !important;
-        }}
+        }
     </style>
-    <title>{title}</title>
+"""
+
+
+def _show_fig_full_screen(fig, title: str = "Backtest Report", cache_key: str | None = None):
     """
-    html = html.replace('</head>', f'{style}</head>')
+    Generates a full-screen HTML file for a Plotly figure with a dark theme.
+    With a `cache_key`, the file is remembered for `_open_cached_reports`.
+
+    The page is assembled around Plotly's figure div (`full_html=False`)
+    instead of patching a full document with string replaces, and written
+    as a single UTF-8 payload.
+    """
+    head = (
+        '<html>\n<head><meta charset="utf-8" />'
+        f'{_PAGE_STYLE}    <title>{title}</title>\n</head>\n<body>\n'
+    )
+    body = fig.to_html(full_html=False, include_plotlyjs='cdn')
+    payload = ''.join((head, body, '\n</body>\n</html>')).encode('utf-8')
+
+    fd, path = tempfile.mkstemp(suffix='.html')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(payload)
+    path = os.path.abspath(path)
+    filepath = 'file://' + path
+    if cache_key is not None:
+        _REPORT_CACHE[cache_key] = path
 
-    with tempfile.NamedTemporaryFile('w', delete=False, suffix='.html', encoding='utf-8') as f:
-        f.write(html)
-        filepath = 'file://' + os.path.abspath(f.name)
-    
     webbrowser.open(filepath)
     logger.info(f"Report opened in a new browser tab. Temp file: {filepath}")
 
 
+def _fills_frame(fills: List[Fill], tz) -> pd.DataFrame:
+    """
+    Converts Fill objects to a DataFrame via one structured array, with the
+    fill times in the chart's time zone `tz` (None for naive charts, whose
+    times are UTC wall clock), so markers line up with their bars.
+    """
+    if not fills:
+        return pd.DataFrame()
+    records = np.fromiter(
+        ((f.ts_utc, f.symbol, f.qty, f.price) for f in fills),
+        dtype=_FILL_DTYPE,
+        count=len(fills),
+    )
+    fills_df = pd.DataFrame.from_records(records)
+    fills_df['ts_utc'] = pd.to_datetime(fills_df['ts_utc'], utc=True).dt.tz_convert(tz)
+    return fills_df
+
+
 def create_plotly_tearsheet(
     equity_curve: pd.Series,
     fills: List[Fill],
@@ -65,86 +269,109 @@ def create_plotly_tearsheet(
         logger.warning("Equity curve is empty, skipping tearsheet generation.")
         return
 
+    equity_digest = _equity_digest(equity_curve)
+    key = _report_key(equity_digest, fills, historical_data, strategy_name)
+    performance_key, analysis_key = f"{key}:performance", f"{key}:analysis"
+    if _open_cached_reports([performance_key, analysis_key]):
+        return
+
     # --- 1. Data Pre-processing ---
-    # Convert equity Series to DataFrame for easier plotting
-    equity_df = pd.DataFrame(equity_curve).rename(columns={'NAV': 'total'})
-    
-    # Convert list of Fill objects to a DataFrame
-    fills_df = pd.DataFrame()
-    if fills:
-        fills_df = pd.DataFrame([f.__dict__ for f in fills])
-        # Create a 'side' column from the signed quantity for plotting
-        fills_df['side'] = np.where(fills_df['qty'] > 0, 'BUY', 'SELL')
+    # Plot straight from the NAV array and index; no intermediate frames
+    nav = _typed(equity_curve)
+    timestamps = equity_curve.index
+
+    fills_df = _fills_frame(fills, getattr(timestamps, "tz", None))
 
     # --- 2. Performance Summary Plot ---
-    summary = generate_performance_summary(equity_curve)
-    drawdown_series = (equity_df['total'] - equity_df['total'].cummax()) / equity_df['total'].cummax()
-    daily_pnl = equity_df['total'].diff() # Simple daily PnL
+    summary = _performance_summary(equity_curve, equity_digest)
+    # Drawdown and simple daily PnL from one pass over the NAV array
+    drawdown_pct, daily_pnl = _drawdown_and_pnl(nav)
 
     fig1 = make_subplots(rows=3, cols=1, shared_xaxes=True, vertical_spacing=0.05, row_heights=[0.6, 0.2, 0.2])
-    fig1.add_trace(go.Scatter(x=equity_df.index, y=equity_df['total'], name='Equity [$]', line=dict(color='cornflowerblue')), row=1, col=1)
-    fig1.add_trace(go.Bar(x=daily_pnl.index, y=daily_pnl, name='Daily PnL [$]', marker_color=['red' if x < 0 else 'green' for x in daily_pnl]), row=2, col=1)
-    fig1.add_trace(go.Scatter(x=drawdown_series.index, y=100 * drawdown_series, name='Drawdown [%]', fill='tozeroy', line=dict(color='crimson', width=0.5)), row=3, col=1)
+    # Log scale is applied here rather than by the browser on every pan/zoom
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_nav = np.where(nav > 0, np.log10(nav), np.nan)
+    log_tickvals, log_ticktext = _log_axis_ticks(nav)
+    # All traces are added in one call rather than one validation pass each
+    fig1.add_traces(
+        [
+            go.Scatter(x=timestamps, y=log_nav, customdata=nav, hovertemplate='$%{customdata:,.2f}', name='Equity [$]', line=dict(color='cornflowerblue')),
+            go.Bar(x=timestamps, y=daily_pnl, name='Daily PnL [$]', marker_color=np.where(daily_pnl < 0, 'red', 'green')),
+            go.Scatter(x=timestamps, y=drawdown_pct, name='Drawdown [%]', fill='tozeroy', line=dict(color='crimson', width=0.5)),
+        ],
+        rows=[1, 2, 3],
+        cols=[1, 1, 1],
+    )
 
     # Add metrics as an annotation
     stats_text = "<br>".join([f"<b>{key.replace('_', ' ').title()}:</b> {val:.2f}" if isinstance(val, float) else f"{key}: {val}" for key, val in summary.items()])
     fig1.add_annotation(x=0.01, y=0.99, xref="paper", yref="paper", text=stats_text, showarrow=False, align="left", bgcolor="rgba(255, 255, 255, 0.5)", font=dict(family="monospace"))
     
-    fig1.update_yaxes(title_text='Equity [$]', row=1, col=1, type="log")
+    fig1.update_yaxes(title_text='Equity [$]', row=1, col=1, tickvals=log_tickvals, ticktext=log_ticktext)
     fig1.update_yaxes(title_text='PnL [$]', row=2, col=1)
     fig1.update_yaxes(title_text='Drawdown [%]', row=3, col=1)
     fig1.update_layout(title_text=f'Performance Summary: {strategy_name}', template='plotly_dark')
-    _show_fig_full_screen(fig1, title=f"Performance: {strategy_name}")
+    _show_fig_full_screen(fig1, title=f"Performance: {strategy_name}", cache_key=performance_key)
 
     # --- 3. Strategy Analysis Plot ---
-    symbols_to_plot = sorted(historical_data['symbol'].unique())
+    symbols_to_plot = _symbols_in(historical_data['symbol'])
     if not symbols_to_plot:
         logger.warning("No symbols found in historical data to plot.")
         return
 
-    # Create the second figure
+    # Collect the second figure's traces and build it once at the end
+    traces = []
     num_assets = len(symbols_to_plot)
     if num_assets > 1:
         # Normalized plot for multiple assets
-        fig2 = go.Figure()
-        price_data_normalized = historical_data.copy()
-        first_prices = price_data_normalized.groupby('symbol')['close'].transform('first')
-        price_data_normalized['normalized'] = 100 * price_data_normalized['close'] / first_prices
-        
+        first_prices = historical_data.groupby('symbol', observed=True)['close'].transform('first')
+        normalized = 100 * historical_data['close'] / first_prices
+
+        # One grouping pass instead of a mask per symbol
+        groups = dict(iter(normalized.groupby(historical_data['symbol'], observed=True, sort=False)))
         for symbol in symbols_to_plot:
-            symbol_data = price_data_normalized[price_data_normalized['symbol'] == symbol]
-            fig2.add_trace(go.Scatter(x=symbol_data.index, y=symbol_data['normalized'], name=symbol, legendgroup='prices'))
-        
-        fig2.update_yaxes(title_text="Normalized Price (Base 100)")
-        fig2.update_layout(title_text=f'Strategy Analysis: Normalized Asset Performance ({strategy_name})')
+            symbol_data = groups[symbol]
+            traces.append(go.Scatter(x=symbol_data.index, y=_typed(symbol_data), name=symbol, legendgroup='prices'))
+
+        y_title = "Normalized Price (Base 100)"
+        title = f'Strategy Analysis: Normalized Asset Performance ({strategy_name})'
 
     else:
         # Candlestick plot for a single asset
         symbol = symbols_to_plot[0]
-        fig2 = go.Figure()
         price_data = historical_data[historical_data['symbol'] == symbol]
-        fig2.add_trace(go.Candlestick(x=price_data.index, open=price_data['open'], high=price_data['high'], low=price_data['low'], close=price_data['close'], name=symbol))
-        fig2.update_yaxes(title_text="Price [$]")
-        fig2.update_layout(title_text=f'Strategy Analysis: Trades on {symbol} ({strategy_name})')
+        traces.append(go.Candlestick(x=price_data.index, open=_typed(price_data['open']), high=_typed(price_data['high']), low=_typed(price_data['low']), close=_typed(price_data['close']), name=symbol))
+        y_title = "Price [$]"
+        title = f'Strategy Analysis: Trades on {symbol} ({strategy_name})'
 
-    # Add buy/sell markers to the second figure
+    # Add buy/sell markers
     if not fills_df.empty:
-        buys = fills_df[fills_df['side'] == 'BUY']
-        sells = fills_df[fills_df['side'] == 'SELL']
-        
+        # Side straight from the sign bit of the signed quantity
+        is_sell = np.signbit(fills_df['qty'].to_numpy(dtype=np.float64))
+        buys_idx, sells_idx = np.flatnonzero(~is_sell), np.flatnonzero(is_sell)
+        ts = fills_df['ts_utc']
+
         # Plot markers based on normalized or absolute price
-        y_buy = buys['price']
-        y_sell = sells['price']
+        y = fills_df['price'].to_numpy(dtype=np.float64)
         if num_assets > 1:
-            first_prices_map = historical_data.groupby('symbol')['close'].first()
-            buys['first_price'] = buys['symbol'].map(first_prices_map)
-            sells['first_price'] = sells['symbol'].map(first_prices_map)
-            y_buy = 100 * buys['price'] / buys['first_price']
-            y_sell = 100 * sells['price'] / sells['first_price']
-
-        fig2.add_trace(go.Scatter(x=buys['ts_utc'], y=y_buy, mode='markers', marker=dict(symbol='triangle-up', color='lime', size=12, line=dict(width=1, color='black')), name='Buy'))
-        fig2.add_trace(go.Scatter(x=sells['ts_utc'], y=y_sell, mode='markers', marker=dict(symbol='triangle-down', color='red', size=12, line=dict(width=1, color='black')), name='Sell'))
-        
-    fig2.update_layout(template='plotly_dark', xaxis_rangeslider_visible=False)
-    _show_fig_full_screen(fig2, title=f"Analysis: {strategy_name}")
+            # Look up each fill's first close by symbol code instead of .map
+            codes = pd.Categorical(fills_df['symbol'], categories=symbols_to_plot).codes
+            first_prices = historical_data.groupby('symbol', observed=True)['close'].first().reindex(symbols_to_plot).to_numpy(dtype=np.float64)
+            first_per_fill = np.where(codes >= 0, first_prices[codes], np.nan)
+            y = 100 * y / first_per_fill
+        y_buy, y_sell = y[buys_idx], y[sells_idx]
+
+        traces.append(go.Scatter(x=ts.iloc[buys_idx], y=_typed(y_buy), mode='markers', marker=dict(symbol='triangle-up', color='lime', size=12, line=dict(width=1, color='black')), name='Buy'))
+        traces.append(go.Scatter(x=ts.iloc[sells_idx], y=_typed(y_sell), mode='markers', marker=dict(symbol='triangle-down', color='red', size=12, line=dict(width=1, color='black')), name='Sell'))
+
+    fig2 = go.Figure(
+        data=traces,
+        layout=go.Layout(
+            title_text=title,
+            yaxis_title_text=y_title,
+            template='plotly_dark',
+            xaxis_rangeslider_visible=False,
+        ),
+    )
+    _show_fig_full_screen(fig2, title=f"Analysis: {strategy_name}", cache_key=analysis_key)
 
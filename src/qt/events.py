@@ -3,49 +3,98 @@ Defines the base Event class and all specific event types used in the system.
 """
 from __future__ import annotations
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Dict, List
+from datetime import datetime, timedelta, timezone
+from typing import ClassVar, Dict, List, Optional, Tuple
+import numpy as np
 
 from qt.types import Bar, Order, Fill
 
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_EPOCH_NAIVE = datetime(1970, 1, 1)
+_ONE_US = timedelta(microseconds=1)
 
-@dataclass(frozen=True)
+
+def _timestamp_ns(ts: datetime) -> int:
+    """
+    Exact integer nanoseconds since the epoch (UTC for aware timestamps,
+    wall time for naive ones). pandas Timestamps carry this as `.value`.
+    """
+    ns = getattr(ts, "value", None)
+    if ns is not None:
+        return ns
+    epoch = _EPOCH_NAIVE if ts.tzinfo is None else _EPOCH_UTC
+    return (ts - epoch) // _ONE_US * 1000
+
+
+@dataclass(frozen=True, slots=True, eq=False)
 class Event:
     """
     Base class for all events in the system.
     Makes events comparable based on their timestamp for the priority queue.
+
+    Each concrete event type sets `KIND`, a small integer the engine uses to
+    index its handler table instead of chaining `isinstance` checks.
+
+    The timestamp is also cached as integer nanoseconds (`_ns`), so queue
+    ordering compares plain ints instead of `datetime` objects. Events are
+    slotted and compare equal only by identity; the queue needs `__lt__`
+    alone.
     """
+    KIND: ClassVar[int] = -1
     timestamp: datetime
+    _ns: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_ns", _timestamp_ns(self.timestamp))
 
     def __lt__(self, other):
-        return self.timestamp < other.timestamp
+        return self._ns < other._ns
+
+    @property
+    def timestamp_ns(self) -> int:
+        """The timestamp as integer nanoseconds since the epoch."""
+        return self._ns
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True, eq=False)
 class BarEvent(Event):
     """
     Handles the event of receiving a collection of new market data bars
     for a single timestamp. This represents one "tick" of the backtest clock.
+
+    The optional array fields carry the same bars column-wise, aligned with
+    each other and keyed by symbol id (see `qt.backtest.symbol_table`), so
+    hot paths can work on NumPy arrays instead of the `bars` dict.
     """
+    KIND: ClassVar[int] = 0
     bars: Dict[str, Bar]
     event_type: str = field(default="BAR", init=False)
+    sym_ids: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    lows: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    highs: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    closes: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True, eq=False)
 class OrderEvent(Event):
     """
     Handles the event of sending a list of Orders to the execution system.
     This typically represents a single portfolio rebalancing decision.
     """
+    KIND: ClassVar[int] = 1
     orders: List[Order]
     event_type: str = field(default="ORDER", init=False)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True, eq=False)
 class FillEvent(Event):
     """
     Handles the event of a list of Orders being filled.
+
+    The fills are a tuple: like the event itself they never change, and a
+    tuple is a single, exactly-sized allocation.
     """
-    fills: List[Fill]
+    KIND: ClassVar[int] = 2
+    fills: Tuple[Fill, ...]
     event_type: str = field(default="FILL", init=False)
 
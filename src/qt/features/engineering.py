@@ -11,15 +11,210 @@ These functions are designed to be:
 - Composable
 """
 from __future__ import annotations
+import functools
+import numpy as np
 import pandas as pd
 
+from qt.utils.jit import NUMBA_AVAILABLE, njit, prange
+from qt.utils.math import rolling_mean_f64
+
+
+@njit(cache=True)
+def _sma_crossover_into_nb(x, fast_window, slow_window, out):
+    """
+    Numba kernel: fast/slow SMA crossover events in a single pass, without
+    materializing either average. Each window keeps the same Kahan sum and
+    NaN count as `rolling_mean_f64`, so the comparison sees exactly the values
+    `calculate_sma` returns. Emits +1 when the fast SMA moves above the
+    slow one, -1 when it drops back to or below it, 0 otherwise. A missing
+    SMA counts as "not above". The events are written into `out` (int8,
+    same length as `x`).
+    """
+    n = x.shape[0]
+    if n > 0:
+        out[0] = 0
+    f_total, f_comp, f_nans = 0.0, 0.0, 0
+    s_total, s_comp, s_nans = 0.0, 0.0, 0
+    prev_above = 0
+    warmup = max(fast_window, slow_window) - 1
+    for i in range(n):
+        v = x[i]
+        if np.isnan(v):
+            f_nans += 1
+            s_nans += 1
+        else:
+            y = v - f_comp
+            t = f_total + y
+            f_comp = (t - f_total) - y
+            f_total = t
+            y = v - s_comp
+            t = s_total + y
+            s_comp = (t - s_total) - y
+            s_total = t
+        if i >= fast_window:
+            old = x[i - fast_window]
+            if np.isnan(old):
+                f_nans -= 1
+            else:
+                y = -old - f_comp
+                t = f_total + y
+                f_comp = (t - f_total) - y
+                f_total = t
+        if i >= slow_window:
+            old = x[i - slow_window]
+            if np.isnan(old):
+                s_nans -= 1
+            else:
+                y = -old - s_comp
+                t = s_total + y
+                s_comp = (t - s_total) - y
+                s_total = t
+        above = 0
+        if (
+            i >= warmup
+            and f_nans == 0
+            and s_nans == 0
+            and f_total / fast_window > s_total / slow_window
+        ):
+            above = 1
+        if i > 0:
+            out[i] = above - prev_above
+        prev_above = above
+
+
+@njit(cache=True)
+def _sma_crossover_nb(x, fast_window, slow_window):
+    """Numba kernel: `_sma_crossover_into_nb` into a new int8 array."""
+    out = np.empty(x.shape[0], dtype=np.int8)
+    _sma_crossover_into_nb(x, fast_window, slow_window, out)
+    return out
+
+
+@functools.cache
+def get_sma_crossover_cfunc():
+    """
+    Returns the C-callable SMA crossover, compiling it on first use:
+    `void (const double *close, intptr_t n, intptr_t fast_window,
+    intptr_t slow_window, int8_t *out)`.
+
+    It writes the same events as `calculate_sma_crossover` into `out`. The
+    raw function pointer is `.address` (or `.ctypes`), so a native engine
+    can call it without Python. Requires Numba.
+    """
+    if not NUMBA_AVAILABLE:
+        raise RuntimeError("The C-callable SMA crossover requires Numba.")
+    from numba import carray, cfunc, types
+
+    @cfunc(
+        types.void(
+            types.CPointer(types.float64),
+            types.intp,
+            types.intp,
+            types.intp,
+            types.CPointer(types.int8),
+        ),
+        cache=True,
+    )
+    def sma_crossover_cfunc(close_ptr, n, fast_window, slow_window, out_ptr):
+        _sma_crossover_into_nb(
+            carray(close_ptr, (n,)), fast_window, slow_window, carray(out_ptr, (n,))
+        )
+
+    return sma_crossover_cfunc
+
+
+@njit(parallel=True, cache=True)
+def _sma_crossover_2d_nb(x, fast_window, slow_window):
+    """
+    Numba kernel: `_sma_crossover_nb` for every column of a 2-D array.
+    Columns are independent, so they are processed in parallel.
+    """
+    n, m = x.shape
+    out = np.empty((n, m), dtype=np.int8)
+    for j in prange(m):
+        out[:, j] = _sma_crossover_nb(x[:, j], fast_window, slow_window)
+    return out
+
+
+@njit(cache=True)
+def _ema_nb(x, alpha):
+    """
+    Numba kernel: the recursive EMA `y[i] = alpha * x[i] + (1 - alpha) * y[i-1]`,
+    matching `ewm(alpha=alpha, adjust=False).mean()`. Leading NaNs stay NaN;
+    a NaN later on repeats the previous value, and the old value's weight
+    decays over the gap as pandas does.
+    """
+    n = x.shape[0]
+    out = np.empty(n)
+    decay = 1.0 - alpha
+    y = np.nan
+    old_weight = 1.0
+    for i in range(n):
+        v = x[i]
+        if np.isnan(y):
+            y = v
+        elif np.isnan(v):
+            old_weight *= decay
+        else:
+            old_weight *= decay
+            y = (old_weight * y + alpha * v) / (old_weight + alpha)
+            old_weight = 1.0
+        out[i] = y
+    return out
+
+
 def calculate_sma(prices: pd.Series, window: int = 20) -> pd.Series:
     """
     Calculates the Simple Moving Average (SMA).
     """
     if window <= 0:
         raise ValueError("Window for SMA must be positive.")
-    return prices.rolling(window=window).mean()
+    if not NUMBA_AVAILABLE:
+        return prices.rolling(window=window).mean()
+    out = rolling_mean_f64(prices.to_numpy(dtype=np.float64), window)
+    return pd.Series(out, index=prices.index, name=prices.name)
+
+def calculate_sma_crossover(
+    prices: pd.Series, fast_window: int, slow_window: int
+) -> pd.Series:
+    """
+    Calculates fast/slow SMA crossover events as int8: +1 where the fast SMA
+    crosses above the slow SMA, -1 where it crosses back below, else 0.
+    """
+    if fast_window <= 0 or slow_window <= 0:
+        raise ValueError("Windows for SMA must be positive.")
+    if NUMBA_AVAILABLE:
+        events = _sma_crossover_nb(
+            prices.to_numpy(dtype=np.float64), fast_window, slow_window
+        )
+    else:
+        above = (
+            calculate_sma(prices, fast_window).to_numpy()
+            > calculate_sma(prices, slow_window).to_numpy()
+        ).astype(np.int8)
+        events = np.empty_like(above)
+        events[:1] = 0
+        np.subtract(above[1:], above[:-1], out=events[1:])
+    return pd.Series(events, index=prices.index, name=prices.name)
+
+def calculate_sma_crossover_panel(
+    prices: pd.DataFrame, fast_window: int, slow_window: int
+) -> pd.DataFrame:
+    """
+    Calculates SMA crossover events for a panel of prices (one column per
+    symbol) in one call. Each column gives the same events as
+    `calculate_sma_crossover`; with Numba, the columns run in parallel.
+    """
+    if fast_window <= 0 or slow_window <= 0:
+        raise ValueError("Windows for SMA must be positive.")
+    if not NUMBA_AVAILABLE:
+        return prices.apply(
+            lambda col: calculate_sma_crossover(col, fast_window, slow_window)
+        )
+    # Column-major, so each symbol's series is contiguous
+    x = np.asfortranarray(prices.to_numpy(dtype=np.float64))
+    events = _sma_crossover_2d_nb(x, fast_window, slow_window)
+    return pd.DataFrame(events, index=prices.index, columns=prices.columns)
 
 def calculate_returns(prices: pd.Series, periods: int = 1) -> pd.Series:
     """Calculates the percentage change in price over a given period."""
@@ -31,4 +226,9 @@ def calculate_rolling_volatility(prices: pd.Series, window: int = 20) -> pd.Seri
 
 def calculate_ema(prices: pd.Series, window: int = 20) -> pd.Series:
     """Calculates the Exponential Moving Average (EMA)."""
-    raise NotImplementedError
+    if window <= 0:
+        raise ValueError("Window for EMA must be positive.")
+    if not NUMBA_AVAILABLE:
+        return prices.ewm(span=window, adjust=False).mean()
+    out = _ema_nb(prices.to_numpy(dtype=np.float64), 2.0 / (window + 1))
+    return pd.Series(out, index=prices.index, name=prices.name)
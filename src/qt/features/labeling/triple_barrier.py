@@ -5,8 +5,49 @@ Implementation of the Triple-Barrier Labeling method.
 From "Advances in Financial Machine Learning" by Marcos Lopez de Prado.
 """
 from __future__ import annotations
+import numpy as np
 import pandas as pd
 
+from qt.utils.jit import njit, prange
+
+
+@njit(parallel=True, cache=True)
+def _triple_barrier_nb(prices, ts_ns, event_idx, upper_mult, lower_mult, horizon_ns):
+    """
+    Numba kernel: for each event starting at bar `event_idx[i]`, scans
+    forward until the price reaches the upper or lower barrier or the time
+    barrier passes. Events are independent, so they are scanned in parallel.
+
+    Returns the touch bar index (-1 for events after the last bar) and the
+    label (1 upper, -1 lower, 0 time barrier) per event.
+    """
+    n_events = event_idx.shape[0]
+    n = prices.shape[0]
+    touch = np.full(n_events, -1, dtype=np.int64)
+    label = np.zeros(n_events, dtype=np.int8)
+    for i in prange(n_events):
+        j = event_idx[i]
+        if j >= n:
+            continue
+        p0 = prices[j]
+        upper = p0 * upper_mult
+        lower = p0 * lower_mult
+        t_end = ts_ns[j] + horizon_ns
+        k = j + 1
+        hit = j
+        while k < n and ts_ns[k] <= t_end:
+            hit = k
+            if prices[k] >= upper:
+                label[i] = 1
+                break
+            if prices[k] <= lower:
+                label[i] = -1
+                break
+            k += 1
+        touch[i] = hit
+    return touch, label
+
+
 def apply_triple_barrier(
     prices: pd.Series,
     events: pd.Series,
@@ -23,5 +64,31 @@ def apply_triple_barrier(
     3. Vertical barrier (time limit)
 
     Returns a DataFrame with event timestamps, barrier touch times, and labels.
+
+    Each event starts at the first bar at or after its timestamp. The label
+    is 1 (upper), -1 (lower) or 0 (time barrier, touched at the last bar
+    within `time_barrier`). Events after the last bar get a NaT touch time
+    and label 0. `prices` must be sorted by its DatetimeIndex.
     """
-    raise NotImplementedError
\ No newline at end of file
+    if profit_take_pct <= 0 or stop_loss_pct <= 0:
+        raise ValueError("Barrier percentages must be positive.")
+
+    index = pd.DatetimeIndex(prices.index)
+    ts_ns = index.as_unit("ns").asi8
+    event_idx = index.searchsorted(pd.DatetimeIndex(events.index)).astype(np.int64)
+    touch, label = _triple_barrier_nb(
+        prices.to_numpy(dtype=np.float64),
+        ts_ns,
+        event_idx,
+        1.0 + profit_take_pct,
+        1.0 - stop_loss_pct,
+        pd.Timedelta(time_barrier).value,
+    )
+
+    return pd.DataFrame(
+        {
+            "touch_time": index.take(touch, allow_fill=True, fill_value=pd.NaT),
+            "label": label,
+        },
+        index=events.index,
+    )
@@ -1,11 +1,70 @@
 # src/qt/features/signals/mean_reversion.py
 """Mean-reversion signal functions."""
 from __future__ import annotations
+import numpy as np
 import pandas as pd
 
+from qt.utils.jit import NUMBA_AVAILABLE, njit
+
+
+@njit(cache=True)
+def _kahan_add(total, comp, v):
+    """One step of Kahan summation; returns the new (total, compensation)."""
+    y = v - comp
+    t = total + y
+    return t, (t - total) - y
+
+
+@njit(cache=True)
+def _zscore_nb(x, window):
+    """
+    Numba kernel: rolling z-score with the window mean and sample std
+    (ddof=1) from one sliding pass. The running sums are Kahan-compensated
+    and taken of values shifted by the first finite value, which keeps the
+    variance accurate for prices far from zero. NaN while the window is
+    incomplete, holds a NaN, or has zero variance.
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    shift = 0.0
+    for i in range(n):
+        if not np.isnan(x[i]):
+            shift = x[i]
+            break
+    s, s_comp = 0.0, 0.0
+    q, q_comp = 0.0, 0.0
+    nans = 0
+    for i in range(n):
+        v = x[i] - shift
+        if np.isnan(v):
+            nans += 1
+        else:
+            s, s_comp = _kahan_add(s, s_comp, v)
+            q, q_comp = _kahan_add(q, q_comp, v * v)
+        if i >= window:
+            old = x[i - window] - shift
+            if np.isnan(old):
+                nans -= 1
+            else:
+                s, s_comp = _kahan_add(s, s_comp, -old)
+                q, q_comp = _kahan_add(q, q_comp, -old * old)
+        if i >= window - 1 and nans == 0:
+            mean = s / window
+            var = (q - s * mean) / (window - 1)
+            if var > 0.0:
+                out[i] = (v - mean) / np.sqrt(var)
+    return out
+
+
 def calculate_zscore(prices: pd.Series, window: int = 20) -> pd.Series:
     """Calculates the rolling z-score of a price series."""
-    raise NotImplementedError
+    if window < 2:
+        raise ValueError("Window for z-score must be at least 2.")
+    if not NUMBA_AVAILABLE:
+        rolling = prices.rolling(window=window)
+        return (prices - rolling.mean()) / rolling.std()
+    out = _zscore_nb(prices.to_numpy(dtype=np.float64), window)
+    return pd.Series(out, index=prices.index, name=prices.name)
 
 def calculate_bollinger_bands(
     prices: pd.Series, window: int = 20, num_std: float = 2.0
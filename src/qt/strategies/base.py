@@ -3,12 +3,60 @@ Defines the abstract base class for all trading strategies.
 """
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from collections import OrderedDict
+from typing import Any, ClassVar, Dict, Hashable, List, Tuple
+import hashlib
+import numpy as np
 import pandas as pd
 
 from qt.events import BarEvent
 from qt.types import Fill, Order, TargetPositions
 
+# Memoized results of `Strategy.initialize`, keyed on (class, params, data hash).
+# Bounded LRU so long parameter sweeps don't grow memory without limit.
+_INITIALIZE_CACHE: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+_INITIALIZE_CACHE_SIZE = 128
+
+
+def _hash_frame(df: pd.DataFrame, columns: Tuple[str, ...]) -> bytes:
+    """
+    Content hash of the index and the given columns of a DataFrame (all
+    columns if empty). Datetime and numeric data are hashed from their raw
+    buffers; only object columns go through `hash_pandas_object`.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for values in [df.index] + [df[col] for col in (columns or df.columns)]:
+        digest.update(repr((values.name, str(values.dtype))).encode())
+        if isinstance(values.dtype, pd.DatetimeTZDtype):
+            arr = values.array.asi8
+        else:
+            arr = values.to_numpy()
+        if arr.dtype.kind in "biufcmM":
+            digest.update(np.ascontiguousarray(arr).view(np.uint8))
+        else:
+            digest.update(pd.util.hash_pandas_object(values, index=False).to_numpy())
+    return digest.digest()
+
+
+def _hash_frames(
+    frames: Dict[str, pd.DataFrame], symbols: List[str], columns: Tuple[str, ...]
+) -> str:
+    """
+    Content hash of the frames for the given symbols (missing ones included
+    as such), restricted to `columns`.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for symbol in sorted(set(symbols)):
+        digest.update(repr(symbol).encode())
+        frame = frames.get(symbol)
+        digest.update(b"\0" if frame is None else _hash_frame(frame, columns))
+    return digest.hexdigest()
+
+
+def _split_by_symbol(historical_data: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """Splits a multi-symbol bar table into one frame per symbol in one pass."""
+    return dict(iter(historical_data.groupby("symbol", sort=False, observed=True)))
+
 
 class Strategy(ABC):
     """
@@ -16,6 +64,22 @@ class Strategy(ABC):
     based on market data and its internal logic.
     """
 
+    # Slotted so per-bar attribute reads skip the instance `__dict__`.
+    # Subclasses that don't declare `__slots__` still get a `__dict__`.
+    __slots__ = ("params", "universe", "_signals")
+
+    # Attributes computed by `initialize` that depend only on the params and
+    # the historical data. Listing them opts the strategy into memoization of
+    # `initialize` across runs (see `initialize_cached`).
+    cached_attributes: ClassVar[Tuple[str, ...]] = ()
+    # The historical data columns `initialize` reads (all if empty). Only
+    # these, for the symbols in the universe, make up the cache key.
+    cached_columns: ClassVar[Tuple[str, ...]] = ()
+
+    # Strategies whose targets depend only on precomputed signals can set this
+    # and implement `process_batch`; the engine then skips `on_data`.
+    supports_batch: ClassVar[bool] = False
+
     def __init__(self, params: Dict[str, Any] | None = None) -> None:
         """
         Initializes the strategy with a set of parameters.
@@ -24,23 +88,105 @@ class Strategy(ABC):
         self.universe: List[str] = self.params.get("universe", [])
         if not self.universe:
             raise ValueError("Strategy must be initialized with a non-empty 'universe' in its parameters.")
-        self.signals: pd.DataFrame | None = None
+        self._signals: pd.DataFrame | None = None
+
+    @property
+    def signals(self) -> pd.DataFrame | None:
+        """
+        Pre-computed signals, if the strategy keeps them as a DataFrame.
+        Strategies may assign it, or override the property to derive it.
+        """
+        return self._signals
+
+    @signals.setter
+    def signals(self, value: pd.DataFrame | None) -> None:
+        self._signals = value
 
-    @abstractmethod
     def initialize(self, historical_data: pd.DataFrame) -> None:
         """
         Called once at the start to pre-calculate signals.
 
+        Strategies override either this or `initialize_symbols`, which gets
+        the same data already split by symbol. By default the data is split
+        once and handed to `initialize_symbols`.
+
         Args:
             historical_data: A single DataFrame containing the historical
                              bar data for all symbols in the universe.
         """
-        raise NotImplementedError
+        self.initialize_symbols(_split_by_symbol(historical_data))
+
+    def initialize_symbols(self, bars_by_symbol: Dict[str, pd.DataFrame]) -> None:
+        """
+        Called once at the start (through `initialize`) to pre-calculate
+        signals. Lets a strategy look up the bars of its symbols instead of
+        scanning the whole table with a boolean mask.
+
+        Args:
+            bars_by_symbol: The historical bar data, one DataFrame per
+                            symbol, keyed by symbol.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} must override initialize or initialize_symbols."
+        )
+
+    def initialize_cached(self, historical_data: pd.DataFrame) -> None:
+        """
+        Calls `initialize`, reusing the results of a previous call with the same
+        strategy class, params and data (e.g. across a parameter sweep or
+        walk-forward runs). Strategies that don't declare `cached_attributes`
+        are always initialized from scratch.
+
+        The data part of the key covers only the universe's bars (the
+        `cached_columns` of them), so `initialize` must not read other data.
+        """
+        if not self.cached_attributes:
+            self.initialize(historical_data)
+            return
+
+        bars_by_symbol = _split_by_symbol(historical_data)
+        key = (
+            type(self),
+            repr(sorted(self.params.items())),
+            _hash_frames(bars_by_symbol, self.universe, self.cached_columns),
+        )
+        state = _INITIALIZE_CACHE.get(key)
+        if state is None:
+            # Reuse the split made for the key unless `initialize` is overridden
+            if type(self).initialize is Strategy.initialize:
+                self.initialize_symbols(bars_by_symbol)
+            else:
+                self.initialize(historical_data)
+            state = {name: getattr(self, name) for name in self.cached_attributes}
+            _INITIALIZE_CACHE[key] = state
+            if len(_INITIALIZE_CACHE) > _INITIALIZE_CACHE_SIZE:
+                _INITIALIZE_CACHE.popitem(last=False)
+        else:
+            _INITIALIZE_CACHE.move_to_end(key)
+            for name, value in state.items():
+                setattr(self, name, value)
 
     @abstractmethod
     def on_data(self, bar_event: BarEvent) -> TargetPositions:
         """
         Called by the engine for each new market data event.
+
+        The engine only reads the returned targets, so a strategy may return
+        the same (e.g. shared empty) mapping from several calls.
+        """
+        raise NotImplementedError
+
+    def process_batch(self, timestamps_i8: np.ndarray) -> np.ndarray:
+        """
+        Optional: computes the target weights for many bars at once.
+
+        Args:
+            timestamps_i8: Sorted bar timestamps as int64 nanoseconds since
+                           the epoch (UTC).
+
+        Returns:
+            A float array of shape (len(timestamps_i8), len(self.universe))
+            of target weights. NaN means "no new target" for that symbol.
         """
         raise NotImplementedError
 
@@ -10,6 +10,7 @@ Strategies are registered using the `@register_strategy` decorator.
 """
 from __future__ import annotations
 from typing import Dict, Type
+import sys
 
 from .base import Strategy
 
@@ -30,6 +31,9 @@ def register_strategy(name: str):
             ...
     """
 
+    # Interned so lookups of the same literal name compare by identity
+    name = sys.intern(name)
+
     def decorator(cls: Type[Strategy]) -> Type[Strategy]:
         if name in _STRATEGY_REGISTRY:
             raise ValueError(f"Strategy with name '{name}' is already registered.")
@@ -52,9 +56,10 @@ def get_strategy(name: str) -> Type[Strategy]:
     Raises:
         KeyError: If no strategy with the given name is registered.
     """
-    if name not in _STRATEGY_REGISTRY:
+    cls = _STRATEGY_REGISTRY.get(name)
+    if cls is None:
         raise KeyError(
             f"No strategy registered with the name '{name}'. "
             f"Available strategies are: {list(_STRATEGY_REGISTRY.keys())}"
         )
-    return _STRATEGY_REGISTRY[name]
\ No newline at end of file
+    return cls
\ No newline at end of file
@@ -3,18 +3,23 @@ A classic Simple Moving Average (SMA) Crossover strategy.
 """
 from __future__ import annotations
 from typing import Dict, Any
+import logging
 import pandas as pd
 import numpy as np
 
 from qt.events import BarEvent
 from qt.types import TargetPositions
-from qt.features.engineering import calculate_sma
+from qt.features.engineering import calculate_sma_crossover
 from qt.utils.logger import get_logger
 from .base import Strategy
 from .registry import register_strategy
 
 logger = get_logger(__name__)
 
+# Shared result for the (vast majority of) bars without a new target. The
+# engine never mutates returned targets, so one empty dict serves them all.
+_NO_TARGETS: TargetPositions = {}
+
 @register_strategy("sma_crossover")
 class SmaCrossoverStrategy(Strategy):
     """
@@ -23,6 +28,15 @@ class SmaCrossoverStrategy(Strategy):
     - Signals a flat position (weight=0.0) when the fast SMA crosses below.
     """
 
+    __slots__ = (
+        "fast_window", "slow_window", "traded_symbol", "_signal_arr", "_ts_int64", "_ts_tz",
+        "_cursor",
+    )
+
+    cached_attributes = ("_signal_arr", "_ts_int64", "_ts_tz")
+    cached_columns = ("close",)
+    supports_batch = True
+
     def __init__(self, params: Dict[str, Any] | None = None) -> None:
         """
         Initializes the strategy.
@@ -37,52 +51,118 @@ class SmaCrossoverStrategy(Strategy):
         if self.fast_window >= self.slow_window:
             raise ValueError("Fast window must be smaller than slow window.")
 
-    def initialize(self, historical_data: pd.DataFrame) -> None:
+        # Position in `_ts_int64` of the next expected bar (see `on_data`)
+        self._cursor = 0
+
+    def initialize_symbols(self, bars_by_symbol: Dict[str, pd.DataFrame]) -> None:
         """
         Pre-calculates the moving averages and the trading signal.
-        The strategy is responsible for filtering the data for the symbol it needs.
+        The strategy is responsible for picking the data for the symbol it needs.
         """
         logger.info(f"[{self.__class__.__name__}] Calculating signals for {self.traded_symbol}...")
 
-        # Filter the main DataFrame to get the data for the symbol we care about
-        bars_df = historical_data[historical_data["symbol"] == self.traded_symbol]
-        
-        fast_sma = calculate_sma(bars_df["close"], window=self.fast_window)
-        slow_sma = calculate_sma(bars_df["close"], window=self.slow_window)
-
-        signals_df = pd.DataFrame(index=bars_df.index)
-        signals_df["signal"] = np.where(fast_sma > slow_sma, 1, 0)
-        signals_df["signal"] = signals_df["signal"].diff()
-        
-        self.signals = signals_df
+        bars_df = bars_by_symbol.get(self.traded_symbol)
+        if bars_df is None:
+            logger.warning(f"No historical data for {self.traded_symbol}; no signals generated.")
+            self._signal_arr = np.empty(0, dtype=np.int8)
+            self._ts_int64 = np.empty(0, dtype=np.int64)
+            self._ts_tz = None
+            self._cursor = 0
+            return
+
+        # Crossover events (+1 bullish, -1 bearish, 0 none) from one fused
+        # pass, kept as int8: 1 byte per bar instead of 8
+        self._signal_arr = calculate_sma_crossover(
+            bars_df["close"], self.fast_window, self.slow_window
+        ).to_numpy(dtype=np.int8)
+
+        # Sorted int64 timestamps for the per-bar lookup in `on_data`
+        index = pd.DatetimeIndex(bars_df.index)
+        ts_int64 = index.as_unit("ns").asi8
+        if not index.is_monotonic_increasing:
+            order = np.argsort(ts_int64, kind="stable")
+            ts_int64, self._signal_arr = ts_int64[order], self._signal_arr[order]
+        self._ts_int64 = ts_int64
+        self._ts_tz = index.tz
+        self._cursor = 0
         logger.info("Signal calculation complete.")
 
+    @property
+    def signals(self) -> pd.DataFrame | None:
+        """
+        The crossover events per bar of the traded symbol, materialized from
+        the signal arrays on demand (for inspection and reporting). Read-only.
+        """
+        if not hasattr(self, "_signal_arr"):
+            return None
+        # `_ts_int64` holds the wall-clock nanoseconds of a naive index, or
+        # UTC nanoseconds of a tz-aware one
+        index = pd.DatetimeIndex(self._ts_int64.view("datetime64[ns]"), name="ts_utc")
+        if self._ts_tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self._ts_tz)
+        return pd.DataFrame({"signal": self._signal_arr}, index=index)
+
+    @signals.setter
+    def signals(self, value: pd.DataFrame | None) -> None:
+        raise AttributeError(
+            f"{type(self).__name__}.signals is derived from the signal arrays and can't be assigned."
+        )
+
     def on_data(self, bar_event: BarEvent) -> TargetPositions:
         """
         This is the event-driven part. It looks up the pre-computed signal
         for the current timestamp and emits a target position.
         """
-        targets: TargetPositions = {}
-        
-        if self.traded_symbol not in bar_event.bars:
-            return targets
+        symbol = self.traded_symbol
+        if symbol not in bar_event.bars:
+            return _NO_TARGETS
 
-        current_timestamp = bar_event.timestamp
-        
-        try:
-            signal_change = self.signals.loc[current_timestamp, "signal"]
-        except (KeyError, IndexError):
-            return targets
+        # Bars arrive in time order, so the next bar is almost always at the
+        # cursor; otherwise fall back to a binary search.
+        t = bar_event.timestamp_ns
+        ts_int64 = self._ts_int64
+        n = len(ts_int64)
+        idx = self._cursor
+        if idx >= n or ts_int64.item(idx) != t:
+            idx = int(np.searchsorted(ts_int64, t))
+            if idx == n or ts_int64.item(idx) != t:
+                return _NO_TARGETS
+        self._cursor = idx + 1
+        signal_change = self._signal_arr.item(idx)
+        # 0 means "no crossover" (including the first bar), the common case
+        if signal_change == 0:
+            return _NO_TARGETS
 
-        if pd.isna(signal_change):
+        # Messages are only formatted when INFO logging is enabled
+        if signal_change == 1:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "%s | Bullish crossover detected for %s. Target: 100%%",
+                    bar_event.timestamp, symbol,
+                )
+            return {symbol: 1.0}
+        else:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "%s | Bearish crossover detected for %s. Target: 0%%",
+                    bar_event.timestamp, symbol,
+                )
+            return {symbol: 0.0}
+
+    def process_batch(self, timestamps_i8: np.ndarray) -> np.ndarray:
+        """
+        Vectorized `on_data`: maps every timestamp to its signal with one
+        binary search. Timestamps without a bar for the traded symbol get NaN.
+        """
+        targets = np.full((len(timestamps_i8), len(self.universe)), np.nan)
+        ts_int64 = self._ts_int64
+        if len(ts_int64) == 0:
             return targets
 
-        if signal_change > 0:
-            logger.info(f"{current_timestamp} | Bullish crossover detected for {self.traded_symbol}. Target: 100%")
-            targets[self.traded_symbol] = 1.0
-        elif signal_change < 0:
-            logger.info(f"{current_timestamp} | Bearish crossover detected for {self.traded_symbol}. Target: 0%")
-            targets[self.traded_symbol] = 0.0
+        idx = np.searchsorted(ts_int64, timestamps_i8)
+        found = idx < len(ts_int64)
+        found[found] = ts_int64[idx[found]] == timestamps_i8[found]
+        signal = np.where(found, self._signal_arr[np.minimum(idx, len(ts_int64) - 1)], 0)
 
+        targets[:, 0] = np.where(signal == 1, 1.0, np.where(signal == -1, 0.0, np.nan))
         return targets
-
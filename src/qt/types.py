@@ -3,6 +3,8 @@ Core data contracts used across the framework.
 
 These are lightweight, immutable dataclasses that define the shape of data
 as it moves through the system. They are intentionally simple and free of logic.
+They use `slots=True`: millions of bars and fills flow through a backtest, and
+slotted instances are smaller and faster to read than `__dict__`-backed ones.
 """
 
 from __future__ import annotations
@@ -15,7 +17,7 @@ from typing import Optional, Dict, Literal
 # A type alias for the target portfolio weights generated by a strategy.
 TargetPositions = Dict[str, float]
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Bar:
     """
     Aggregated price/volume information over a fixed interval.
@@ -37,7 +39,7 @@ class Bar:
     source: Optional[str] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Trade:
     """
     A single market trade (tick-level).
@@ -53,7 +55,7 @@ class Trade:
     trade_id: Optional[str] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Quote:
     """
     Top-of-book quote (bid/ask) snapshot at a given time.
@@ -70,7 +72,7 @@ class Quote:
     venue: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Signal:
     """
     A numeric score expressing conviction for a symbol.
@@ -84,7 +86,7 @@ class Signal:
     source: str  # strategy/factor name
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Order:
     """
     An instruction to buy or sell a security.
@@ -103,7 +105,7 @@ class Order:
     meta: Optional[Dict[str, str]] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Fill:
     """
     Confirmation that part or all of an order was executed.
@@ -120,12 +122,14 @@ class Fill:
     liquidity_flag: Optional[Literal["T", "M"]] = None  # Taker/Maker
 
 
-@dataclass(frozen=False)
+@dataclass(frozen=True, slots=True)
 class Position:
     """
     Current holdings in a single symbol.
 
-    Tracks size, average price, and realized/unrealized PnL.
+    Tracks size, average price, and realized/unrealized PnL. Positions are
+    read-only views built from the portfolio's position arrays, so they are
+    frozen like the other contracts.
     """
 
     symbol: str
@@ -135,7 +139,7 @@ class Position:
     realized_pnl: float = 0.0
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PortfolioSnapshot:
     """
     Snapshot of the portfolio state at a given timestamp.
@@ -0,0 +1,45 @@
+"""Optional Numba JIT support.
+
+Numba is an optional accelerator for the framework's numeric kernels. When it
+is installed, `njit` and `prange` are the real Numba objects. When it is not,
+`njit` degrades to a no-op decorator and `prange` to `range`, so every kernel
+still runs. Callers that have a vectorized NumPy equivalent should check
+`NUMBA_AVAILABLE` and prefer that over an interpreted Python loop.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Callable, TypeVar, overload
+
+if TYPE_CHECKING:
+    # Type checkers see a signature-preserving decorator, so calls into
+    # compiled kernels are checked against the kernels' own annotations.
+    F = TypeVar("F", bound=Callable[..., Any])
+
+    @overload
+    def njit(func: F, /) -> F: ...
+    @overload
+    def njit(*args: Any, **kwargs: Any) -> Callable[[F], F]: ...
+    def njit(*args: Any, **kwargs: Any) -> Any: ...
+
+    prange = range
+    NUMBA_AVAILABLE: bool
+else:
+    try:
+        from numba import njit, prange
+
+        NUMBA_AVAILABLE = True
+    except ImportError:  # pragma: no cover - depends on the environment
+        NUMBA_AVAILABLE = False
+        prange = range
+
+        def njit(*args, **kwargs):
+            """No-op stand-in for `numba.njit` (supports both decorator forms)."""
+            if len(args) == 1 and callable(args[0]) and not kwargs:
+                return args[0]
+
+            def decorator(func):
+                return func
+
+            return decorator
+
+
+__all__ = ["NUMBA_AVAILABLE", "njit", "prange"]
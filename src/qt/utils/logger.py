@@ -32,12 +32,22 @@ class ColoredFormatter(logging.Formatter):
         logging.CRITICAL: BOLD_RED + log_format + RESET,
     }
 
+    DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+    def __init__(self):
+        super().__init__()
+        # One formatter per level, built once instead of on every record
+        self._formatters = {
+            level: logging.Formatter(fmt, datefmt=self.DATE_FORMAT)
+            for level, fmt in self.FORMATS.items()
+        }
+        self._default_formatter = logging.Formatter(datefmt=self.DATE_FORMAT)
+
     def format(self, record):
         """
         Overrides the default format method to apply color.
         """
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt, datefmt="%Y-%m-%d %H:%M:%S")
+        formatter = self._formatters.get(record.levelno, self._default_formatter)
         return formatter.format(record)
 
 
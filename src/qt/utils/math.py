@@ -6,3 +6,45 @@ Will contain helpers for:
 - safe division/clipping
 - vectorized math shared across features and risk
 """
+from __future__ import annotations
+import numpy as np
+
+from qt.utils.jit import njit
+
+
+@njit(cache=True)
+def rolling_mean_f64(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling mean of a 1-D float64 array in O(N), independent of `window`.
+
+    Keeps one running sum (add the new value, subtract the one leaving the
+    window) and matches `pd.Series.rolling(window).mean()`: NaN until the
+    window is full or while it contains a NaN. The sum is Kahan-compensated
+    so rounding error does not accumulate over long series.
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    total = 0.0
+    comp = 0.0
+    nans = 0
+    for i in range(n):
+        v = x[i]
+        if np.isnan(v):
+            nans += 1
+        else:
+            y = v - comp
+            t = total + y
+            comp = (t - total) - y
+            total = t
+        if i >= window:
+            old = x[i - window]
+            if np.isnan(old):
+                nans -= 1
+            else:
+                y = -old - comp
+                t = total + y
+                comp = (t - total) - y
+                total = t
+        if i >= window - 1 and nans == 0:
+            out[i] = total / window
+    return out
@@ -2,6 +2,7 @@
 Integration test for the full backtesting engine pipeline.
 """
 from typing import Dict, List
+import numpy as np
 import pandas as pd
 import pytest
 from datetime import datetime, timezone
@@ -14,6 +15,7 @@ from qt.backtest.portfolio import Portfolio
 from qt.backtest.execution_sim import ExecutionSimulator
 from qt.backtest.slippage import NoSlippage
 from qt.backtest.costs import NoCost
+from qt.backtest.symbol_table import SymbolTable
 from qt.events import BarEvent
 from qt.strategies.base import Strategy
 from qt.types import TargetPositions
@@ -49,7 +51,7 @@ class BuyAndHoldStrategy(Strategy):
         self.first_event = True
         self.last_event_timestamp = params.get("last_event_timestamp")
 
-    def initialize(self, historical_data: Dict[str, pd.DataFrame]) -> None:
+    def initialize(self, historical_data: pd.DataFrame) -> None:
         # No pre-computation needed for this simple strategy
         pass
 
@@ -70,6 +72,23 @@ class BuyAndHoldStrategy(Strategy):
         return targets
 
 
+class BatchBuyAndHoldStrategy(BuyAndHoldStrategy):
+    """
+    The same strategy, emitting all of its targets through `process_batch`.
+    """
+    supports_batch = True
+
+    def on_data(self, bar_event: BarEvent) -> TargetPositions:
+        raise AssertionError("on_data must not be called for batch strategies")
+
+    def process_batch(self, timestamps_i8: np.ndarray) -> np.ndarray:
+        targets = np.full((len(timestamps_i8), 1), np.nan)
+        targets[0, 0] = 1.0
+        last_ns = pd.Timestamp(self.last_event_timestamp).value
+        targets[timestamps_i8 == last_ns, 0] = 0.0
+        return targets
+
+
 # --- The Integration Test ---
 
 def test_full_backtest_run(sample_backtest_data: pd.DataFrame):
@@ -120,3 +139,64 @@ def test_full_backtest_run(sample_backtest_data: pd.DataFrame):
     assert not equity_curve.empty
     final_nav = equity_curve.iloc[-1]
     assert final_nav == pytest.approx(100_300.0)
+
+
+def test_batch_strategy_matches_event_strategy(sample_backtest_data: pd.DataFrame):
+    """
+    Targets precomputed by `process_batch` drive the same trades as `on_data`.
+    """
+    event_queue = EventQueue()
+    portfolio = Portfolio(initial_cash=100_000.0)
+    strategy = BatchBuyAndHoldStrategy(
+        params={"universe": ["TEST"], "last_event_timestamp": sample_backtest_data.index[-1]}
+    )
+    engine = BacktestEngine(
+        event_queue=event_queue,
+        data_handler=DataHandler(event_queue=event_queue, historical_data=sample_backtest_data),
+        strategy=strategy,
+        portfolio=portfolio,
+        execution_simulator=ExecutionSimulator(slippage_model=NoSlippage(), cost_model=NoCost()),
+    )
+    engine.run()
+
+    assert portfolio.cash == pytest.approx(100_300.0)
+    assert not portfolio.positions
+
+
+def test_backtest_with_custom_symbol_table(sample_backtest_data: pd.DataFrame):
+    """
+    A fresh (empty, hence falsy) SymbolTable is honoured, not replaced by the
+    shared default, and components on different tables are rejected.
+    """
+    symbol_table = SymbolTable()
+    event_queue = EventQueue()
+    data_handler = DataHandler(event_queue, sample_backtest_data, symbol_table=symbol_table)
+    portfolio = Portfolio(initial_cash=100_000.0, symbol_table=symbol_table)
+    execution_simulator = ExecutionSimulator(
+        slippage_model=NoSlippage(), cost_model=NoCost(), symbol_table=symbol_table
+    )
+    assert data_handler.symbol_table is symbol_table
+    assert execution_simulator.open_limit_orders.symbol_table is symbol_table
+
+    strategy = BuyAndHoldStrategy(
+        params={"universe": ["TEST"], "last_event_timestamp": sample_backtest_data.index[-1]}
+    )
+    with pytest.raises(ValueError, match="SymbolTable"):
+        BacktestEngine(
+            event_queue=event_queue,
+            data_handler=data_handler,
+            strategy=strategy,
+            portfolio=Portfolio(initial_cash=100_000.0),
+            execution_simulator=execution_simulator,
+        )
+
+    engine = BacktestEngine(
+        event_queue=event_queue,
+        data_handler=data_handler,
+        strategy=strategy,
+        portfolio=portfolio,
+        execution_simulator=execution_simulator,
+    )
+    engine.run()
+
+    assert portfolio.get_equity_curve().tolist() == pytest.approx([100_000.0, 100_100.0, 100_300.0])
@@ -1,6 +1,7 @@
 """
 Unit tests for the DataHandler class.
 """
+import dataclasses
 import pandas as pd
 import pytest
 from datetime import datetime, timezone
@@ -105,3 +106,46 @@ def test_history_and_price_tracking_after_update(sample_market_data: pd.DataFram
     short_history_handler.update_data()
     assert short_history_handler.get_history("AAPL", lookback=5).empty
 
+
+
+def test_iter_bar_events_streams_point_in_time(sample_market_data: pd.DataFrame):
+    """
+    Verifies that `iter_bar_events` yields the same events regardless of
+    chunk size, and that history only covers bars already yielded.
+    """
+    data_handler = DataHandler(EventQueue(), sample_market_data)
+
+    # A chunk size of one row still keeps each timestamp's bars together
+    events = data_handler.iter_bar_events(chunk_size=1)
+    first_event = next(events)
+    assert len(first_event.bars) == 2
+    assert data_handler.get_latest_prices() == {"AAPL": 150.5, "MSFT": 299.5}
+    assert len(data_handler.get_history("AAPL")) == 1
+
+    second_event = next(events)
+    assert second_event.bars["AAPL"].close == 151.8
+    assert data_handler.get_latest_prices() == {"AAPL": 151.8, "MSFT": 301.0}
+    assert len(data_handler.get_history("AAPL")) == 2
+    assert next(events, None) is None
+
+
+@pytest.mark.parametrize("tz", ["UTC", None])
+def test_get_history_matches_bar_records(sample_market_data: pd.DataFrame, tz):
+    """
+    Verifies that `get_history` returns the same columns and index dtype as a
+    DataFrame built directly from the recorded Bar objects, for both
+    tz-aware and naive timestamps.
+    """
+    data = sample_market_data
+    if tz is None:
+        data = data.tz_localize(None)
+    data_handler = DataHandler(EventQueue(), data)
+    bars = [event.bars["AAPL"] for event in data_handler.iter_bar_events()]
+
+    expected = pd.DataFrame([dataclasses.asdict(bar) for bar in bars]).set_index("ts_utc")
+    history = data_handler.get_history("AAPL")
+
+    assert list(history.columns) == list(expected.columns)
+    assert history.index.dtype == expected.index.dtype
+    assert history.index.name == "ts_utc"
+    pd.testing.assert_index_equal(history.index, expected.index)
@@ -0,0 +1,48 @@
+"""
+Unit tests for the EventQueue class.
+"""
+from datetime import datetime, timezone
+
+from qt.backtest.event_queue import EventQueue
+from qt.events import BarEvent, OrderEvent, FillEvent
+
+
+def _ts(minute: int) -> datetime:
+    return datetime(2025, 1, 1, 10, minute, 0, tzinfo=timezone.utc)
+
+
+def test_events_are_yielded_in_chronological_order():
+    """
+    Tests that events pushed out of order are still popped chronologically.
+    """
+    event_queue = EventQueue()
+    event_queue.put_many([BarEvent(timestamp=_ts(m), bars={}) for m in (0, 1, 2)])
+    event_queue.put(OrderEvent(timestamp=_ts(0), orders=[]))
+    event_queue.put(FillEvent(timestamp=_ts(1), fills=()))
+    event_queue.put(OrderEvent(timestamp=_ts(0), orders=[]))
+
+    popped = []
+    while not event_queue.is_empty():
+        popped.append(event_queue.get())
+
+    assert [e.timestamp for e in popped] == [_ts(0)] * 3 + [_ts(1)] * 2 + [_ts(2)]
+
+
+def test_same_tick_events_are_drained_before_next_bar():
+    """
+    Tests that an order stamped with the current bar's timestamp is popped
+    before the following bar, in insertion (FIFO) order.
+    """
+    event_queue = EventQueue()
+    event_queue.put_many([BarEvent(timestamp=_ts(m), bars={}) for m in (0, 1)])
+
+    first_bar = event_queue.get()
+    order_event = OrderEvent(timestamp=first_bar.timestamp, orders=[])
+    fill_event = FillEvent(timestamp=first_bar.timestamp, fills=())
+    event_queue.put(order_event)
+    event_queue.put(fill_event)
+
+    assert event_queue.get() is order_event
+    assert event_queue.get() is fill_event
+    assert isinstance(event_queue.get(), BarEvent)
+    assert event_queue.is_empty()
@@ -1,27 +1,41 @@
 """
 Comprehensive unit tests for the ExecutionSimulator class.
 """
-import uuid
+import itertools
 from datetime import datetime, timezone
 import pytest
 
 # Import the components to be tested
 from qt.backtest.execution_sim import ExecutionSimulator
 from qt.backtest.slippage import NoSlippage
-from qt.backtest.costs import NoCost
+from qt.backtest.costs import CostModel, NoCost
 from qt.events import OrderEvent, BarEvent
-from qt.types import Order, Bar
+from qt.types import Order, Bar, Fill
 from qt.enums import OrderType
 
+# Every test gets its own simulator; the shared market data is read-only
+pytestmark = pytest.mark.parallel_safe
+
 # --- Helper Functions and Fixtures ---
 
+# Order ids only need to be unique, and no test depends on the order time
+_ORDER_IDS = itertools.count(1)
+_TS = datetime(2025, 1, 1, 10, 0, 0, tzinfo=timezone.utc)
+
+# The sample market data, shared read-only by all tests
+_AAPL_BAR = Bar(
+    ts_utc=_TS, symbol="AAPL", open=150, high=152, low=148, close=151,
+    volume=1e6, interval="1m", venue="XNAS"
+)
+_BARS = {"AAPL": _AAPL_BAR}
+
 def create_order(
     symbol: str, side: str, order_type: OrderType, qty: float, limit_price: float | None = None
 ) -> Order:
     """Creates a single Order object for convenience."""
     return Order(
-        id=str(uuid.uuid4()),
-        ts_utc=datetime.now(timezone.utc),
+        id=f"ord-{next(_ORDER_IDS)}",
+        ts_utc=_TS,
         symbol=symbol,
         side=side,
         type=order_type,
@@ -34,17 +48,13 @@ def execution_simulator() -> ExecutionSimulator:
     """Returns a new ExecutionSimulator with ideal (zero) frictions."""
     return ExecutionSimulator(slippage_model=NoSlippage(), cost_model=NoCost())
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_bar_event() -> BarEvent:
-    """Provides a sample BarEvent for testing limit order fills."""
-    ts = datetime(2025, 1, 1, 10, 0, 0, tzinfo=timezone.utc)
-    bars = {
-        "AAPL": Bar(
-            ts_utc=ts, symbol="AAPL", open=150, high=152, low=148, close=151,
-            volume=1e6, interval="1m", venue="XNAS"
-        )
-    }
-    return BarEvent(timestamp=ts, bars=bars)
+    """
+    Provides a sample BarEvent for testing limit order fills. Built once per
+    module: the event is frozen and tests only read its bars.
+    """
+    return BarEvent(timestamp=_TS, bars=_BARS)
 
 
 # --- Test Cases ---
@@ -72,6 +82,131 @@ def test_market_order_fills_immediately(execution_simulator: ExecutionSimulator,
     assert not execution_simulator.open_limit_orders
 
 
+def test_frictionless_fill_matches_general_path(sample_bar_event: BarEvent):
+    """
+    Tests that the NoSlippage + NoCost fast path fills like the general
+    path, which a NoSlippage subclass still takes.
+    """
+    class CloseSlippage(NoSlippage):
+        pass
+
+    fast = ExecutionSimulator(slippage_model=NoSlippage(), cost_model=NoCost())
+    general = ExecutionSimulator(slippage_model=CloseSlippage(), cost_model=NoCost())
+    assert fast._frictionless and not general._frictionless
+
+    orders = [
+        create_order("AAPL", "BUY", OrderType.MARKET, 100),
+        create_order("AAPL", "SELL", OrderType.MARKET, 40),
+        create_order("MSFT", "BUY", OrderType.MARKET, 10),
+    ]
+    order_event = OrderEvent(timestamp=sample_bar_event.timestamp, orders=orders)
+    fast_event = fast.process_new_orders(order_event, sample_bar_event.bars)
+    general_event = general.process_new_orders(order_event, sample_bar_event.bars)
+
+    assert fast_event is not None
+    assert general_event is not None
+    assert fast_event.fills == general_event.fills
+    assert [fill.qty for fill in fast_event.fills] == [100, -40]
+
+
+def test_no_cost_subclass_skips_fee_model(sample_bar_event: BarEvent):
+    """
+    Tests that NoCost subclasses, which can't override the final fee
+    methods, take the zero-cost path too.
+    """
+    class TaggedNoCost(NoCost):
+        pass
+
+    simulator = ExecutionSimulator(slippage_model=NoSlippage(), cost_model=TaggedNoCost())
+    assert simulator._frictionless
+
+    market_order = create_order("AAPL", "BUY", OrderType.MARKET, 100)
+    order_event = OrderEvent(timestamp=sample_bar_event.timestamp, orders=[market_order])
+    fill_event = simulator.process_new_orders(order_event, sample_bar_event.bars)
+    assert fill_event is not None
+    assert fill_event.fills[0].fee == 0.0
+
+
+def test_market_order_fill_includes_cost_model_fee(sample_bar_event: BarEvent):
+    """
+    Tests that a non-zero fee from the cost model is carried on the fill.
+    """
+    class PerShareCost(CostModel):
+        def calculate_fee(self, fill: Fill) -> float:
+            return 0.01 * abs(fill.qty)
+
+    simulator = ExecutionSimulator(slippage_model=NoSlippage(), cost_model=PerShareCost())
+    market_order = create_order("AAPL", "SELL", OrderType.MARKET, 100)
+    order_event = OrderEvent(timestamp=sample_bar_event.timestamp, orders=[market_order])
+
+    fill_event = simulator.process_new_orders(order_event, sample_bar_event.bars)
+    assert fill_event is not None
+    fill = fill_event.fills[0]
+    assert fill.qty == -100
+    assert fill.fee == pytest.approx(1.0)
+
+
+def test_cost_model_sees_order_id_and_time(sample_bar_event: BarEvent):
+    """
+    Tests that the default raw fee hook hands `calculate_fee` the real
+    order id and fill time.
+    """
+    seen = []
+
+    class RecordingCost(CostModel):
+        def calculate_fee(self, fill: Fill) -> float:
+            seen.append((fill.order_id, fill.ts_utc))
+            return 0.0
+
+    simulator = ExecutionSimulator(slippage_model=NoSlippage(), cost_model=RecordingCost())
+    market_order = create_order("AAPL", "BUY", OrderType.MARKET, 100)
+    order_event = OrderEvent(timestamp=sample_bar_event.timestamp, orders=[market_order])
+
+    simulator.process_new_orders(order_event, sample_bar_event.bars)
+    assert seen == [(market_order.id, market_order.ts_utc)]
+
+
+def test_market_order_uses_raw_fee_override(sample_bar_event: BarEvent):
+    """
+    Tests that a cost model overriding `calculate_fee_raw` prices the fill
+    without going through `calculate_fee`.
+    """
+    class FlatCost(CostModel):
+        def calculate_fee(self, fill: Fill) -> float:
+            raise AssertionError("calculate_fee should not be called")
+
+        def calculate_fee_raw(
+            self, order_id: str, ts_utc: datetime, symbol: str, qty: float, price: float
+        ) -> float:
+            return 2.5
+
+    simulator = ExecutionSimulator(slippage_model=NoSlippage(), cost_model=FlatCost())
+    market_order = create_order("AAPL", "BUY", OrderType.MARKET, 100)
+    order_event = OrderEvent(timestamp=sample_bar_event.timestamp, orders=[market_order])
+
+    fill_event = simulator.process_new_orders(order_event, sample_bar_event.bars)
+    assert fill_event is not None
+    fill = fill_event.fills[0]
+    assert fill.order_id == market_order.id
+    assert fill.fee == 2.5
+
+
+def test_market_order_uses_callable_slippage(sample_bar_event: BarEvent):
+    """
+    Tests that a plain `(order, bar) -> price` callable works as a slippage model.
+    """
+    simulator = ExecutionSimulator(
+        slippage_model=lambda order, bar: bar.close + 0.05, cost_model=NoCost()
+    )
+    market_order = create_order("AAPL", "BUY", OrderType.MARKET, 100)
+    order_event = OrderEvent(timestamp=sample_bar_event.timestamp, orders=[market_order])
+
+    fill_event = simulator.process_new_orders(order_event, sample_bar_event.bars)
+    assert fill_event is not None
+    fill = fill_event.fills[0]
+    assert fill.price == pytest.approx(151.05)
+
+
 def test_limit_order_is_placed_on_book(execution_simulator: ExecutionSimulator, sample_bar_event: BarEvent):
     """
     Tests that a new LIMIT order is not filled immediately but is added to the
@@ -89,62 +224,68 @@ def test_limit_order_is_placed_on_book(execution_simulator: ExecutionSimulator,
     assert execution_simulator.open_limit_orders[limit_order.id] == limit_order
 
 
-def test_buy_limit_order_fills_on_price_drop(execution_simulator: ExecutionSimulator, sample_bar_event: BarEvent):
+@pytest.mark.parametrize(
+    "side, qty, limit_price, expected_fill_qty",
+    [
+        # BUY fills when the bar's low (148) drops to the limit
+        ("BUY", 100, 148.0, 100),
+        # SELL fills when the bar's high (152) rises to the limit
+        ("SELL", 50, 152.0, -50),
+        # BUY far below the market: the low (148) never reaches 140
+        ("BUY", 100, 140.0, None),
+    ],
+    ids=["buy_fills_on_price_drop", "sell_fills_on_price_rise", "not_reached"],
+)
+def test_open_limit_order_fills_when_price_reached(
+    execution_simulator: ExecutionSimulator,
+    sample_bar_event: BarEvent,
+    side: str,
+    qty: float,
+    limit_price: float,
+    expected_fill_qty: float | None,
+):
     """
-    Tests that an open BUY LIMIT order is filled when the market low drops to
-    or below its limit price.
+    Tests that an open LIMIT order is filled at its limit price when the bar
+    reaches it (low for BUY, high for SELL), and otherwise stays on the book.
     """
-    # Arrange: Place a BUY LIMIT order on the book
-    buy_limit = create_order("AAPL", "BUY", OrderType.LIMIT, 100, limit_price=148.0)
-    execution_simulator.open_limit_orders[buy_limit.id] = buy_limit
-    
-    # Action: The next bar's low price touches the limit price (low is 148)
+    # Arrange: Place the LIMIT order on the book
+    limit_order = create_order("AAPL", side, OrderType.LIMIT, qty, limit_price=limit_price)
+    execution_simulator.open_limit_orders[limit_order.id] = limit_order
+
+    # Action
     fill_event = execution_simulator.check_open_orders(sample_bar_event)
 
     # Assertions
+    if expected_fill_qty is None:
+        assert fill_event is None, "No fills should have occurred"
+        assert len(execution_simulator.open_limit_orders) == 1, "Order should remain on the book"
+        assert limit_order.id in execution_simulator.open_limit_orders
+        return
+
     assert fill_event is not None
     assert len(fill_event.fills) == 1
     fill = fill_event.fills[0]
-    assert fill.order_id == buy_limit.id
-    assert fill.qty == 100
-    assert fill.price == 148.0 # Fills at the limit price
+    assert fill.order_id == limit_order.id
+    assert fill.qty == expected_fill_qty
+    assert fill.price == limit_price  # Fills at the limit price
     assert not execution_simulator.open_limit_orders, "Filled order should be removed from the book"
 
 
-def test_sell_limit_order_fills_on_price_rise(execution_simulator: ExecutionSimulator, sample_bar_event: BarEvent):
+def test_mixed_limit_book_only_fills_reached_orders(execution_simulator: ExecutionSimulator, sample_bar_event: BarEvent):
     """
-    Tests that an open SELL LIMIT order is filled when the market high rises to
-    or above its limit price.
+    Tests a book with several resting orders: only those whose limit was
+    reached are filled (in book order), and orders for symbols without a
+    bar in the event stay on the book.
     """
-    # Arrange: Place a SELL LIMIT order on the book
-    sell_limit = create_order("AAPL", "SELL", OrderType.LIMIT, 50, limit_price=152.0)
-    execution_simulator.open_limit_orders[sell_limit.id] = sell_limit
-    
-    # Action: The next bar's high price touches the limit price (high is 152)
-    fill_event = execution_simulator.check_open_orders(sample_bar_event)
-
-    # Assertions
-    assert fill_event is not None
-    assert len(fill_event.fills) == 1
-    fill = fill_event.fills[0]
-    assert fill.qty == -50
-    assert fill.price == 152.0
-    assert not execution_simulator.open_limit_orders
-
+    buy_fill = create_order("AAPL", "BUY", OrderType.LIMIT, 10, limit_price=149.0)
+    buy_rest = create_order("AAPL", "BUY", OrderType.LIMIT, 10, limit_price=147.0)
+    sell_fill = create_order("AAPL", "SELL", OrderType.LIMIT, 5, limit_price=151.5)
+    other_symbol = create_order("MSFT", "BUY", OrderType.LIMIT, 10, limit_price=1e9)
+    for order in (buy_fill, buy_rest, sell_fill, other_symbol):
+        execution_simulator.open_limit_orders[order.id] = order
 
-def test_limit_order_does_not_fill_if_price_not_reached(execution_simulator: ExecutionSimulator, sample_bar_event: BarEvent):
-    """
-    Tests that an open LIMIT order remains on the book if the market price
-    does not reach its limit.
-    """
-    # Arrange: Place a BUY LIMIT order with a price far below the market
-    buy_limit = create_order("AAPL", "BUY", OrderType.LIMIT, 100, limit_price=140.0)
-    execution_simulator.open_limit_orders[buy_limit.id] = buy_limit
-    
-    # Action: The bar's low (148) does not reach the limit price (140)
     fill_event = execution_simulator.check_open_orders(sample_bar_event)
 
-    # Assertions
-    assert fill_event is None, "No fills should have occurred"
-    assert len(execution_simulator.open_limit_orders) == 1, "Order should remain on the book"
-    assert buy_limit.id in execution_simulator.open_limit_orders
+    assert fill_event is not None
+    assert [f.order_id for f in fill_event.fills] == [buy_fill.id, sell_fill.id]
+    assert list(execution_simulator.open_limit_orders) == [buy_rest.id, other_symbol.id]
@@ -0,0 +1,70 @@
+"""
+Unit tests for the performance metrics.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from qt.backtest.metrics import (
+    calculate_max_drawdown,
+    calculate_rolling_sharpe,
+    calculate_sharpe_ratio,
+    calculate_sortino_ratio,
+    generate_performance_summary,
+)
+
+
+@pytest.fixture
+def equity_curve() -> pd.Series:
+    """A short daily equity curve with a single drawdown."""
+    index = pd.date_range("2025-01-01", periods=6, freq="D", tz="UTC")
+    return pd.Series([100.0, 110.0, 99.0, 104.5, 121.0, 115.0], index=index)
+
+
+def test_summary_matches_pandas_reference(equity_curve: pd.Series):
+    """
+    Tests the array-based summary against the equivalent pandas expressions.
+    """
+    summary = generate_performance_summary(equity_curve)
+    returns = equity_curve.pct_change().dropna()
+
+    assert summary["total_return"] == pytest.approx(0.15)
+    assert summary["max_drawdown"] == pytest.approx(-0.1)
+    assert summary["annualized_volatility"] == pytest.approx(returns.std() * np.sqrt(365))
+    assert summary["sharpe_ratio"] == pytest.approx(
+        returns.mean() / returns.std() * np.sqrt(365)
+    )
+    assert summary["sharpe_ratio"] == pytest.approx(calculate_sharpe_ratio(equity_curve, 0.0, 365))
+    assert summary["calmar_ratio"] == pytest.approx(summary["cagr"] / 0.1)
+
+
+def test_sortino_uses_target_downside_deviation(equity_curve: pd.Series):
+    """
+    Tests that the downside deviation is the RMS shortfall below the target
+    over all periods, not the std of the losing periods alone.
+    """
+    returns = equity_curve.pct_change().dropna().to_numpy()
+    downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2))
+
+    assert calculate_sortino_ratio(equity_curve, 0.0, 365) == pytest.approx(
+        returns.mean() / downside * np.sqrt(365)
+    )
+
+
+def test_rolling_sharpe_matches_pandas_rolling(equity_curve: pd.Series):
+    """
+    Tests the running-sum rolling Sharpe against a pandas rolling window.
+    """
+    returns = equity_curve.pct_change()
+    rolling = returns.rolling(3)
+    expected = rolling.mean() / rolling.std() * np.sqrt(365)
+
+    result = calculate_rolling_sharpe(equity_curve, 3, trading_periods_per_year=365)
+
+    pd.testing.assert_series_equal(result, expected, check_names=False)
+
+
+def test_max_drawdown_of_rising_curve_is_zero():
+    """Tests that a monotonically rising curve has no drawdown."""
+    index = pd.date_range("2025-01-01", periods=3, freq="D", tz="UTC")
+    assert calculate_max_drawdown(pd.Series([1.0, 2.0, 3.0], index=index)) == 0.0
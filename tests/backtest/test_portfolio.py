@@ -2,14 +2,31 @@
 Comprehensive unit tests for the Portfolio class.
 """
 from datetime import datetime, timezone
+import math
 import pytest
+import numpy as np
 import pandas as pd
 
 # Import the components to be tested
 from qt.backtest.portfolio import Portfolio
+from qt.backtest.symbol_table import SymbolTable
 from qt.events import FillEvent
 from qt.types import Fill
 
+# Every test builds its own Portfolio: no shared mutable state
+pytestmark = pytest.mark.parallel_safe
+
+def _close(a: float, b: float, rel: float = 1e-9, abs_: float = 1e-12) -> bool:
+    """Scalar float comparison; cheaper than wrapping each value in pytest.approx."""
+    return math.isclose(a, b, rel_tol=rel, abs_tol=abs_)
+
+
+# Snapshot times: one-minute bars from 2025-01-01 10:00 UTC, built once
+_BAR_TS = [datetime(2025, 1, 1, 10, m, 0, tzinfo=timezone.utc) for m in range(5)]
+
+# No test depends on the fill time, so every fill shares one timestamp
+_FILL_TS = _BAR_TS[0]
+
 # Helper function to create a FillEvent for convenience
 def create_fill_event(
     symbol: str, side: str, qty: float, price: float, fee: float = 0.0
@@ -19,13 +36,30 @@ def create_fill_event(
     signed_qty = qty if side == "BUY" else -qty
     fill = Fill(
         order_id="dummy_order_id",
-        ts_utc=datetime.now(timezone.utc),
+        ts_utc=_FILL_TS,
         symbol=symbol,
         qty=signed_qty, # Use the signed quantity
         price=price,
         fee=fee,
     )
-    return FillEvent(timestamp=fill.ts_utc, fills=[fill])
+    return FillEvent(timestamp=fill.ts_utc, fills=(fill,))
+
+
+def create_fill_events_bulk(
+    symbols, sides, qtys, prices, fee: float = 0.0
+) -> FillEvent:
+    """
+    Creates one FillEvent holding many fills. The quantities are signed in
+    one vectorized pass (BUY +, SELL -) instead of a branch per fill.
+    """
+    signed_qty = np.asarray(qtys, dtype=np.float64) * np.where(
+        np.asarray(sides) == "BUY", 1.0, -1.0
+    )
+    fills = tuple(
+        Fill(order_id="dummy_order_id", ts_utc=_FILL_TS, symbol=symbol, qty=qty, price=price, fee=fee)
+        for symbol, qty, price in zip(symbols, signed_qty.tolist(), prices)
+    )
+    return FillEvent(timestamp=_FILL_TS, fills=fills)
 
 
 @pytest.fixture
@@ -68,14 +102,14 @@ def test_increase_long_position(portfolio: Portfolio):
 
     # Assertions
     expected_cash = 100_000.0 - (100 * 150.0) - (50 * 160.0)
-    assert portfolio.cash == pytest.approx(expected_cash)
+    assert _close(portfolio.cash, expected_cash)
     
     aapl_pos = portfolio.positions["AAPL"]
     assert aapl_pos.qty == 150
     
     # Check that average price is correctly recalculated
     expected_avg_price = ((100 * 150.0) + (50 * 160.0)) / 150
-    assert aapl_pos.avg_price == pytest.approx(expected_avg_price)
+    assert _close(aapl_pos.avg_price, expected_avg_price)
 
 
 def test_partially_close_long_position_for_profit(portfolio: Portfolio):
@@ -87,7 +121,7 @@ def test_partially_close_long_position_for_profit(portfolio: Portfolio):
 
     # Assertions
     expected_cash = 100_000.0 - (100 * 150.0) + (40 * 160.0)
-    assert portfolio.cash == pytest.approx(expected_cash)
+    assert _close(portfolio.cash, expected_cash)
 
     aapl_pos = portfolio.positions["AAPL"]
     assert aapl_pos.qty == 60 # Remaining position
@@ -95,7 +129,7 @@ def test_partially_close_long_position_for_profit(portfolio: Portfolio):
     
     # Check that P&L was realized
     expected_pnl = (160.0 - 150.0) * 40
-    assert aapl_pos.realized_pnl == pytest.approx(expected_pnl)
+    assert _close(aapl_pos.realized_pnl, expected_pnl)
 
 
 def test_fully_close_long_position(portfolio: Portfolio):
@@ -105,7 +139,7 @@ def test_fully_close_long_position(portfolio: Portfolio):
 
     assert "AAPL" not in portfolio.positions, "Position should be removed after closing"
     expected_cash = 100_000.0 - (100 * 150.0) + (100 * 155.0)
-    assert portfolio.cash == pytest.approx(expected_cash)
+    assert _close(portfolio.cash, expected_cash)
 
 
 def test_flip_position_from_long_to_short(portfolio: Portfolio):
@@ -121,10 +155,10 @@ def test_flip_position_from_long_to_short(portfolio: Portfolio):
     aapl_pos = portfolio.positions["AAPL"]
     assert aapl_pos.qty == -50 # New short position
     assert aapl_pos.avg_price == 160.0 # Avg price of the new short position is the flip price
-    assert aapl_pos.realized_pnl == pytest.approx(expected_pnl)
+    assert _close(aapl_pos.realized_pnl, expected_pnl)
     
     expected_cash = 100_000.0 - (100 * 150.0) + (150 * 160.0)
-    assert portfolio.cash == pytest.approx(expected_cash)
+    assert _close(portfolio.cash, expected_cash)
 
 
 def test_open_new_short_position(portfolio: Portfolio):
@@ -147,13 +181,12 @@ def test_fully_close_short_position_for_loss(portfolio: Portfolio):
 
     assert "TSLA" not in portfolio.positions
     expected_cash = 100_000.0 + (50 * 200.0) - (50 * 210.0)
-    assert portfolio.cash == pytest.approx(expected_cash)
+    assert _close(portfolio.cash, expected_cash)
 
 
 def test_snapshot_and_equity_curve(portfolio: Portfolio):
     """Tests the NAV calculation and history tracking."""
-    ts1 = datetime(2025, 1, 1, 10, 0, 0, tzinfo=timezone.utc)
-    ts2 = datetime(2025, 1, 1, 10, 1, 0, tzinfo=timezone.utc)
+    ts1, ts2 = _BAR_TS[0], _BAR_TS[1]
     
     # Time 1: Initial state
     portfolio.record_snapshot(ts1, {})
@@ -170,11 +203,134 @@ def test_snapshot_and_equity_curve(portfolio: Portfolio):
     expected_cash = 100_000.0 - (100 * 150.0) # 85,000
     expected_nav = expected_cash + expected_market_value # 100,200
     
-    assert portfolio.history[1].nav == pytest.approx(expected_nav)
+    assert _close(portfolio.history[1].nav, expected_nav)
     
     # Test equity curve generation
     equity_curve = portfolio.get_equity_curve()
     assert isinstance(equity_curve, pd.Series)
     assert len(equity_curve) == 2
-    assert equity_curve.iloc[1] == pytest.approx(expected_nav)
+    assert _close(equity_curve.iloc[1], expected_nav)
+
+    # The same history as plain arrays
+    ts_ns, nav = portfolio.get_equity_array()
+    assert ts_ns.tolist() == [pd.Timestamp(ts1).value, pd.Timestamp(ts2).value]
+    assert _close(nav[1], expected_nav)
+
 
+def test_equity_curve_is_read_only_and_keeps_timestamps(portfolio: Portfolio):
+    """
+    The cached equity curve can't be used to overwrite the NAV history, and
+    its index keeps the recorded timestamps (naive stays naive).
+    """
+    naive_ts = [datetime(2025, 1, 1, 10, m) for m in range(3)]
+    for ts in naive_ts:
+        portfolio.record_snapshot(ts, {})
+
+    equity_curve = portfolio.get_equity_curve()
+    assert equity_curve.index.tz is None
+    assert list(equity_curve.index) == [pd.Timestamp(ts) for ts in naive_ts]
+    assert portfolio.history[0].ts_utc == pd.Timestamp(naive_ts[0])
+
+    with pytest.raises(ValueError):
+        equity_curve.iloc[0] = -1.0
+    assert portfolio.get_equity_curve().iloc[0] == 100_000.0
+    assert portfolio.get_equity_array()[1][0] == 100_000.0
+
+
+
+def test_snapshots_from_price_arrays():
+    """Tests NAVs recorded from symbol-id price arrays across a fill."""
+    symbol_table = SymbolTable(["AAPL", "MSFT"])
+    portfolio = Portfolio(initial_cash=100_000.0, symbol_table=symbol_table)
+    ts = _BAR_TS[:4]
+
+    portfolio.record_snapshot(ts[0], np.array([150.0, np.nan]))
+    portfolio.update_on_fill(create_fill_event("AAPL", "BUY", 100, 150.0))
+    portfolio.update_on_fill(create_fill_event("MSFT", "SELL", 10, 300.0))
+    # MSFT has no price yet, so it is marked at its average price
+    portfolio.record_snapshot(ts[1], np.array([152.0, np.nan]))
+    portfolio.record_snapshot(ts[2], np.array([151.0, 310.0]))
+    portfolio.record_snapshot(ts[3], np.array([155.0, 290.0]))
+
+    cash = 100_000.0 - 15_000.0 + 3_000.0
+    navs = [s.nav for s in portfolio.history]
+    assert navs == pytest.approx([
+        100_000.0,
+        cash + 15_200.0 - 3_000.0,
+        cash + 15_100.0 - 3_100.0,
+        cash + 15_500.0 - 2_900.0,
+    ])
+    assert portfolio.history[2].positions["AAPL"].qty == 100
+    assert portfolio.get_equity_curve().index.tolist() == ts
+
+
+def test_closing_position_keeps_other_positions(portfolio: Portfolio):
+    """Tests that removing a position from the book leaves the rest intact."""
+    for symbol, price in (("AAPL", 150.0), ("MSFT", 300.0), ("TSLA", 200.0)):
+        portfolio.update_on_fill(create_fill_event(symbol, "BUY", 10, price))
+    portfolio.update_on_fill(create_fill_event("MSFT", "SELL", 10, 310.0))
+    portfolio.update_on_fill(create_fill_event("TSLA", "BUY", 10, 220.0))
+
+    assert list(portfolio.positions) == ["AAPL", "TSLA"]
+    assert _close(portfolio.positions["AAPL"].avg_price, 150.0)
+    assert portfolio.positions["TSLA"].qty == 20
+    assert _close(portfolio.positions["TSLA"].avg_price, 210.0)
+
+
+def test_history_grows_past_capacity():
+    """Tests that snapshots beyond the preallocated capacity are kept."""
+    portfolio = Portfolio(initial_cash=100_000.0, capacity=2)
+    ts = _BAR_TS[:5]
+    for t in ts:
+        portfolio.record_snapshot(t, {})
+
+    equity_curve = portfolio.get_equity_curve()
+    assert equity_curve.index.tolist() == ts
+    assert equity_curve.tolist() == [100_000.0] * 5
+    assert [s.ts_utc for s in portfolio.history] == ts
+
+
+def test_large_fill_batch_matches_individual_fills():
+    """Tests that a batch of fills gives the same state as one-by-one fills."""
+    symbols, sides, qtys, prices = zip(*[
+        ("AAPL", "BUY", 10, 150.0), ("MSFT", "SELL", 5, 300.0),
+        ("AAPL", "BUY", 10, 152.0), ("AAPL", "SELL", 5, 155.0),
+        ("MSFT", "BUY", 5, 290.0), ("TSLA", "BUY", 8, 200.0),
+        ("AAPL", "SELL", 25, 151.0), ("TSLA", "SELL", 3, 210.0),
+    ] * 3)
+    batch = create_fill_events_bulk(symbols, sides, qtys, prices, fee=1.0)
+    batched = Portfolio(initial_cash=100_000.0)
+    batched.update_on_fill(batch)
+    sequential = Portfolio(initial_cash=100_000.0)
+    for symbol, side, qty, price in zip(symbols, sides, qtys, prices):
+        sequential.update_on_fill(create_fill_event(symbol, side, qty, price, fee=1.0))
+
+    assert _close(batched.cash, sequential.cash)
+    assert sorted(batched.positions) == sorted(sequential.positions)
+    for symbol, position in sequential.positions.items():
+        assert _close(batched.positions[symbol].qty, position.qty)
+        assert _close(batched.positions[symbol].avg_price, position.avg_price)
+        assert _close(batched.positions[symbol].realized_pnl, position.realized_pnl)
+
+
+def test_update_on_fills_matches_individual_fills():
+    """Tests that applying several fill events at once matches applying each."""
+    events = [
+        create_fill_event(symbol, side, qty, price)
+        for symbol, side, qty, price in [
+            ("AAPL", "BUY", 10, 150.0), ("MSFT", "BUY", 5, 300.0),
+            ("AAPL", "SELL", 4, 155.0), ("MSFT", "SELL", 5, 310.0),
+        ] * 5
+    ]
+    batched = Portfolio(initial_cash=100_000.0)
+    batched.update_on_fills(events)
+    sequential = Portfolio(initial_cash=100_000.0)
+    for event in events:
+        sequential.update_on_fill(event)
+
+    assert _close(batched.cash, sequential.cash)
+    assert sorted(batched.positions) == sorted(sequential.positions) == ["AAPL"]
+    assert _close(batched.positions["AAPL"].qty, sequential.positions["AAPL"].qty)
+    assert _close(
+        batched.positions["AAPL"].realized_pnl, sequential.positions["AAPL"].realized_pnl
+    )
@@ -0,0 +1,278 @@
+"""
+Tests for the hive-partitioned Parquet lake written by ParquetStorage and
+read by ParquetStorage and DuckDBStorage.
+"""
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from pandera.errors import SchemaError
+
+from qt.data.storage.duckdb import DuckDBStorage
+from qt.data.storage.parquet import ParquetStorage
+
+_START = pd.Timestamp("2025-01-01", tz="UTC")
+_END = pd.Timestamp("2025-01-03", tz="UTC")
+
+
+def make_bars(symbol: str, minutes, day: str = "2025-01-01", close_offset: float = 0.0) -> pd.DataFrame:
+    """One-minute bars for `symbol` at the given minutes past 10:00 on `day`."""
+    ts = pd.Timestamp(f"{day} 10:00", tz="UTC") + pd.to_timedelta(list(minutes), unit="min")
+    close = 100.0 + np.arange(len(ts), dtype=np.float64) + close_offset
+    return pd.DataFrame(
+        {
+            "ts_utc": ts,
+            "symbol": symbol,
+            "open": close,
+            "high": close + 1.0,
+            "low": close - 1.0,
+            "close": close,
+            "volume": 1e6,
+            "interval": "1m",
+            "venue": "XNAS",
+        }
+    )
+
+
+def read_bars(root: Path, symbols) -> pd.DataFrame:
+    df = ParquetStorage().read_bars(root, symbols, _START, _END, "1m")
+    return df.sort_values(["symbol", "ts_utc"], ignore_index=True)
+
+
+def test_partial_rewrite_keeps_rest_of_partition(tmp_path: Path):
+    """
+    Re-writing some bars of a (symbol, interval, date) partition replaces
+    just those bars; the rest of the day, and other symbols, are kept.
+    """
+    storage = ParquetStorage()
+    storage.write_bars(pd.concat([make_bars("A", range(5)), make_bars("B", range(5))]), tmp_path)
+    storage.write_bars(make_bars("A", [1, 3], close_offset=50.0), tmp_path)
+
+    df = read_bars(tmp_path, ["A", "B"])
+    assert len(df) == 10
+    a = df[df["symbol"] == "A"]
+    assert a["close"].tolist() == [100.0, 150.0, 102.0, 151.0, 104.0]
+    assert df[df["symbol"] == "B"]["close"].tolist() == [100.0, 101.0, 102.0, 103.0, 104.0]
+
+
+def test_rewrite_is_idempotent_and_appends_new_days(tmp_path: Path):
+    """Writing the same bars twice stores them once; new days are added."""
+    storage = ParquetStorage()
+    day1 = make_bars("A", range(3))
+    storage.write_bars(day1, tmp_path)
+    storage.write_bars(day1, tmp_path)
+    storage.write_bars(make_bars("A", range(2), day="2025-01-02"), tmp_path)
+
+    df = read_bars(tmp_path, ["A"])
+    assert len(df) == 5
+    assert df["ts_utc"].is_monotonic_increasing
+    assert sorted(p.name for p in (tmp_path / "bars" / "symbol=A" / "interval=1m").iterdir()) == [
+        "date=2025-01-01",
+        "date=2025-01-02",
+    ]
+
+
+def test_write_accepts_ts_utc_index(tmp_path: Path):
+    """Frames indexed by ts_utc (the DataHandler layout) keep their timestamps."""
+    bars = make_bars("A", range(3))
+    ParquetStorage().write_bars(bars.set_index("ts_utc"), tmp_path)
+
+    df = read_bars(tmp_path, ["A"])
+    pd.testing.assert_series_equal(df["ts_utc"], bars["ts_utc"], check_names=False)
+    assert df["close"].tolist() == bars["close"].tolist()
+
+
+def make_trades(symbol: str, n: int) -> pd.DataFrame:
+    ts = pd.Timestamp("2025-01-01 10:00", tz="UTC") + pd.to_timedelta(np.arange(n), unit="s")
+    return pd.DataFrame(
+        {
+            "ts_utc": ts,
+            "symbol": symbol,
+            "price": 100.0 + np.arange(n),
+            "size": 10.0,
+            "venue": "XNAS",
+            "trade_id": [f"{symbol}-{i}" for i in range(n)],
+        }
+    )
+
+
+def make_quotes(symbol: str, n: int) -> pd.DataFrame:
+    ts = pd.Timestamp("2025-01-01 10:00", tz="UTC") + pd.to_timedelta(np.arange(n), unit="s")
+    return pd.DataFrame(
+        {
+            "ts_utc": ts,
+            "symbol": symbol,
+            "bid_px": 99.0 + np.arange(n),
+            "bid_sz": 5.0,
+            "ask_px": 101.0 + np.arange(n),
+            "ask_sz": 7.0,
+            "venue": "XNAS",
+        }
+    )
+
+
+def test_rewrite_keeps_rows_from_other_venues(tmp_path: Path):
+    """Quotes from different venues at the same timestamp are distinct rows."""
+    storage = ParquetStorage()
+    quotes = pd.concat([make_quotes("A", 2), make_quotes("A", 2).assign(venue="ARCX")])
+    storage.write_quotes(quotes, tmp_path)
+    storage.write_quotes(quotes, tmp_path)
+
+    df = storage.read_quotes(tmp_path, ["A"], _START, _END)
+    assert len(df) == 4
+    assert sorted(df["venue"].tolist()) == ["ARCX", "ARCX", "XNAS", "XNAS"]
+
+
+def test_trades_without_id_are_never_merged(tmp_path: Path):
+    """Trades without a trade_id have no identity, so none are dropped."""
+    storage = ParquetStorage()
+    trades = make_trades("A", 2).assign(trade_id=None)
+    same_ts = pd.concat([trades, trades])
+    storage.write_trades(same_ts, tmp_path)
+    assert len(storage.read_trades(tmp_path, ["A"], _START, _END)) == 4
+
+    storage.write_trades(trades, tmp_path)
+    assert len(storage.read_trades(tmp_path, ["A"], _START, _END)) == 6
+
+
+def test_duplicate_keys_in_first_write_are_merged(tmp_path: Path):
+    """The first write merges repeated keys just like later writes do."""
+    storage = ParquetStorage()
+    bars = make_bars("A", range(2))
+    storage.write_bars(pd.concat([bars, bars.assign(close=bars["close"] + 50.0)]), tmp_path)
+
+    assert read_bars(tmp_path, ["A"])["close"].tolist() == [150.0, 151.0]
+
+
+def test_write_splits_files_by_max_rows(tmp_path: Path):
+    """max_rows_per_file splits a partition into files that read back whole."""
+    bars = make_bars("A", range(5))
+    ParquetStorage().write_bars(bars, tmp_path, partitioning={"max_rows_per_file": 2})
+
+    partition = tmp_path / "bars" / "symbol=A" / "interval=1m" / "date=2025-01-01"
+    assert len(list(partition.iterdir())) == 3
+    assert read_bars(tmp_path, ["A"])["close"].tolist() == bars["close"].tolist()
+
+
+def test_write_rejects_partition_column_override(tmp_path: Path):
+    """The readers expect the fixed layout, so it can't be overridden."""
+    with pytest.raises(ValueError, match="columns"):
+        ParquetStorage().write_bars(
+            make_bars("A", range(3)), tmp_path, partitioning={"columns": ["symbol", "interval"]}
+        )
+    assert not (tmp_path / "bars").exists()
+
+
+@pytest.mark.parametrize(
+    "kind, make",
+    [("bars", make_bars), ("trades", make_trades), ("quotes", make_quotes)],
+)
+def test_round_trip(tmp_path: Path, kind: str, make):
+    """Written data reads back unchanged, filtered by symbol and time range."""
+    storage = ParquetStorage()
+    wanted = make("A", range(4)) if kind == "bars" else make("A", 4)
+    other = make("B", range(4)) if kind == "bars" else make("B", 4)
+    getattr(storage, f"write_{kind}")(pd.concat([wanted, other]), tmp_path)
+
+    read = getattr(storage, f"read_{kind}")
+    args = ("1m",) if kind == "bars" else ()
+    df = read(tmp_path, ["A"], _START, _END, *args)
+    if kind == "bars":
+        # Optional columns the frame lacked are stored as nulls
+        wanted = wanted.assign(currency=None, adj_close=np.nan, source=None)
+    pd.testing.assert_frame_equal(
+        df.sort_values("ts_utc", ignore_index=True), wanted, check_like=True
+    )
+
+    # The time range is inclusive on both ends
+    end = wanted["ts_utc"].iloc[1]
+    df = read(tmp_path, ["A"], _START, end, *args)
+    assert df["ts_utc"].sort_values().tolist() == wanted["ts_utc"].iloc[:2].tolist()
+
+
+def test_read_projects_columns(tmp_path: Path):
+    """Only the requested columns are returned (and validated)."""
+    storage = ParquetStorage()
+    storage.write_bars(make_bars("A", range(3)), tmp_path)
+    df = storage.read_bars(tmp_path, ["A"], _START, _END, "1m", columns=["ts_utc", "close"])
+    assert list(df.columns) == ["ts_utc", "close"]
+    assert df["close"].tolist() == [100.0, 101.0, 102.0]
+
+
+@pytest.mark.parametrize("reader", [ParquetStorage, DuckDBStorage])
+def test_write_coerces_to_schema(tmp_path: Path, reader):
+    """Integer volumes are stored as float, so the lake stays readable."""
+    bars = make_bars("A", range(3))
+    ParquetStorage().write_bars(bars.assign(volume=1_000_000), tmp_path)
+
+    df = reader().read_bars(tmp_path, ["A"], _START, _END, "1m")
+    assert df["volume"].dtype == np.float64
+    assert df["volume"].tolist() == [1e6, 1e6, 1e6]
+
+
+def test_write_rejects_invalid_data(tmp_path: Path):
+    """Data that can't be coerced to the schema is never written."""
+    bars = make_bars("A", range(3)).assign(close=["a", "b", "c"])
+    with pytest.raises(SchemaError, match="close"):
+        ParquetStorage().write_bars(bars, tmp_path)
+    assert not (tmp_path / "bars").exists()
+
+
+def test_write_rejects_missing_required_columns(tmp_path: Path):
+    """
+    A frame without a required column (here the venue key) is rejected
+    instead of leaving rows that make the partition unreadable.
+    """
+    storage = ParquetStorage()
+    storage.write_bars(make_bars("A", range(3)), tmp_path)
+    with pytest.raises(SchemaError, match="venue"):
+        storage.write_bars(make_bars("A", [5]).drop(columns="venue"), tmp_path)
+
+    assert read_bars(tmp_path, ["A"])["close"].tolist() == [100.0, 101.0, 102.0]
+
+
+def test_read_rejects_mistyped_data(tmp_path: Path):
+    """The read path checks stored dtypes against the schema (no coercion)."""
+    partition = tmp_path / "bars" / "symbol=A" / "interval=1m" / "date=2025-01-01"
+    partition.mkdir(parents=True)
+    bars = make_bars("A", range(3)).drop(columns=["symbol", "interval"])
+    pq.write_table(
+        pa.Table.from_pandas(bars.assign(volume=1_000_000), preserve_index=False),
+        partition / "part-0.parquet",
+    )
+    with pytest.raises(SchemaError, match="volume"):
+        ParquetStorage().read_bars(tmp_path, ["A"], _START, _END, "1m")
+
+
+@pytest.mark.parametrize(
+    "kind, make",
+    [("bars", make_bars), ("trades", make_trades), ("quotes", make_quotes)],
+)
+def test_duckdb_reads_match_parquet_reads(tmp_path: Path, kind: str, make):
+    """Both backends return the same rows and dtypes for the same query."""
+    data = [make(s, range(4)) if kind == "bars" else make(s, 4) for s in ("A", "B")]
+    getattr(ParquetStorage(), f"write_{kind}")(pd.concat(data), tmp_path)
+
+    args = ("1m",) if kind == "bars" else ()
+    end = data[0]["ts_utc"].iloc[2]
+    expected = getattr(ParquetStorage(), f"read_{kind}")(tmp_path, ["A"], _START, end, *args)
+    df = getattr(DuckDBStorage(), f"read_{kind}")(tmp_path, ["A"], _START, end, *args)
+
+    assert len(df) == 3
+    pd.testing.assert_frame_equal(
+        df.sort_values("ts_utc", ignore_index=True),
+        expected.sort_values("ts_utc", ignore_index=True),
+        check_like=True,
+    )
+
+
+def test_duckdb_read_projects_columns(tmp_path: Path):
+    """Only the requested columns are returned, in the requested order."""
+    ParquetStorage().write_bars(make_bars("A", range(3)), tmp_path)
+    df = DuckDBStorage().read_bars(
+        tmp_path, ["A"], _START, _END, "1m", columns=["close", "ts_utc"]
+    )
+    assert list(df.columns) == ["close", "ts_utc"]
+    assert sorted(df["close"].tolist()) == [100.0, 101.0, 102.0]
@@ -0,0 +1,81 @@
+"""
+Tests for schema validation in strict (coercing) and fast (checking) mode.
+"""
+from typing import Literal, cast
+import numpy as np
+import pandas as pd
+from pandera.errors import SchemaError
+import pytest
+
+from qt.data.schema import validate
+
+Mode = Literal["strict", "fast"]
+
+
+def make_bars() -> pd.DataFrame:
+    """A correctly typed bar frame, as the storage backends return it."""
+    return pd.DataFrame(
+        {
+            "ts_utc": pd.to_datetime(["2025-01-01 10:00", "2025-01-01 10:01"], utc=True),
+            "symbol": ["AAPL", "AAPL"],
+            "open": [100.0, 101.0],
+            "high": [102.0, 103.0],
+            "low": [99.0, 100.0],
+            "close": [101.0, 102.0],
+            "volume": [1e6, 2e6],
+            "interval": ["1m", "1m"],
+            "venue": ["XNAS", "XNAS"],
+            "currency": ["USD", None],
+            "adj_close": [101.0, np.nan],
+            "source": [None, None],
+        }
+    )
+
+
+@pytest.mark.parametrize("mode", ["strict", "fast"])
+def test_validate_accepts_typed_bars(mode: Mode):
+    """A frame with tz-aware UTC timestamps passes both modes unchanged."""
+    df = make_bars()
+    validated = validate(df, "bars", mode=mode)
+    assert validated["ts_utc"].dtype == pd.DatetimeTZDtype(unit="ns", tz="UTC")
+    pd.testing.assert_frame_equal(validated, df)
+
+
+def test_strict_mode_coerces_raw_bars():
+    """Strict mode (ingestion) coerces timestamps and numbers to the schema."""
+    raw = make_bars().assign(
+        ts_utc=["2025-01-01T10:00:00Z", "2025-01-01T10:01:00Z"], volume=[1_000_000, 2_000_000]
+    )
+    validated = validate(raw, "bars", mode="strict")
+    pd.testing.assert_frame_equal(validated, make_bars())
+
+
+@pytest.mark.parametrize(
+    "column, values",
+    [
+        ("ts_utc", pd.to_datetime(["2025-01-01 10:00", "2025-01-01 10:01"])),  # naive
+        ("ts_utc", ["2025-01-01T10:00:00Z", "2025-01-01T10:01:00Z"]),
+        ("volume", [1_000_000, 2_000_000]),
+    ],
+)
+def test_fast_mode_rejects_wrong_dtypes(column, values):
+    """Fast mode only checks dtypes, so untyped data is rejected, not coerced."""
+    df = make_bars().assign(**{column: values})
+    with pytest.raises(SchemaError):
+        validate(df, "bars", mode="fast")
+
+
+@pytest.mark.parametrize("mode", ["strict", "fast"])
+def test_validate_rejects_missing_and_extra_columns(mode: Mode):
+    """Both modes enforce the column set."""
+    with pytest.raises(SchemaError):
+        validate(make_bars().drop(columns="close"), "bars", mode=mode)
+    with pytest.raises(SchemaError):
+        validate(make_bars().assign(extra=1.0), "bars", mode=mode)
+
+
+@pytest.mark.parametrize("mode", ["Strict", "lazy", ""])
+def test_validate_rejects_unknown_mode(mode: str):
+    """A misspelled mode is an error rather than a silent fast-mode check."""
+    with pytest.raises(ValueError, match="mode"):
+        validate(make_bars(), "bars", mode=cast(Mode, mode))
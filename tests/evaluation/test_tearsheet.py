@@ -0,0 +1,62 @@
+"""
+Tests for the tearsheet report cache key and fill markers.
+"""
+from datetime import datetime, timezone
+import pandas as pd
+import pytest
+
+from qt.evaluation.tearsheet import _equity_digest, _fills_frame, _report_key
+from qt.types import Fill
+
+_INDEX = pd.date_range("2025-01-01", periods=3, freq="D", tz="UTC", name="ts_utc")
+_EQUITY_DIGEST = _equity_digest(pd.Series([100_000.0] * 3, index=_INDEX, name="NAV"))
+
+
+def _bars(symbol: str, closes) -> pd.DataFrame:
+    return pd.DataFrame({"symbol": symbol, "close": closes}, index=_INDEX)
+
+
+def _fill(qty: float, price: float) -> Fill:
+    ts = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return Fill(order_id="1", ts_utc=ts, symbol="AAA", qty=qty, price=price, fee=0.0)
+
+
+def test_report_key_depends_on_data_and_fill_contents():
+    """
+    Runs with the same NAV, number of fills and data length, but different
+    market data or fills, must not share a cached report.
+    """
+    bars = _bars("AAA", [1.0, 2.0, 3.0])
+    fills = [_fill(10, 1.0)]
+    key = _report_key(_EQUITY_DIGEST, fills, bars, "Strategy")
+
+    assert key == _report_key(_EQUITY_DIGEST, [_fill(10, 1.0)], bars.copy(), "Strategy")
+    assert key != _report_key(_EQUITY_DIGEST, fills, _bars("BBB", [1.0, 2.0, 3.0]), "Strategy")
+    assert key != _report_key(_EQUITY_DIGEST, fills, _bars("AAA", [1.0, 2.0, 4.0]), "Strategy")
+    assert key != _report_key(_EQUITY_DIGEST, [_fill(10, 1.5)], bars, "Strategy")
+    assert key != _report_key(_EQUITY_DIGEST, [_fill(-10, 1.0)], bars, "Strategy")
+    assert key != _report_key(_EQUITY_DIGEST, fills, bars, "Other")
+
+
+def test_cache_keys_depend_on_the_time_zone():
+    """Naive and UTC inputs with the same values don't share a report."""
+    naive = _INDEX.tz_localize(None)
+    nav = [100_000.0] * 3
+    assert _equity_digest(pd.Series(nav, index=naive)) != _equity_digest(pd.Series(nav, index=_INDEX))
+
+    bars = _bars("AAA", [1.0, 2.0, 3.0])
+    assert _report_key(_EQUITY_DIGEST, [], bars, "Strategy") != _report_key(
+        _EQUITY_DIGEST, [], bars.set_axis(naive), "Strategy"
+    )
+
+
+@pytest.mark.parametrize("tz", [None, "UTC", "America/New_York"])
+def test_fill_times_match_the_chart_time_zone(tz):
+    """Fill markers are placed in the time zone of the bars they belong to."""
+    bar_ts = pd.Timestamp("2025-01-02 15:00", tz=tz)
+    fill_ts = bar_ts.to_pydatetime()
+    fill = Fill(order_id="1", ts_utc=fill_ts, symbol="AAA", qty=1, price=1.0, fee=0.0)
+
+    ts = _fills_frame([fill], bar_ts.tz)["ts_utc"]
+    assert str(ts.dt.tz) == str(bar_ts.tz)
+    assert ts.iloc[0] == bar_ts
@@ -0,0 +1,146 @@
+"""
+Tests for the moving-average feature kernels against their pandas references.
+
+Every public function is run both with the Numba kernels and with the
+NumPy/pandas fallback used when Numba is not installed.
+"""
+import ctypes
+import numpy as np
+import pandas as pd
+import pytest
+
+from qt.features import engineering
+from qt.features.engineering import (
+    calculate_ema,
+    calculate_sma,
+    calculate_sma_crossover,
+    calculate_sma_crossover_panel,
+)
+from qt.utils.jit import NUMBA_AVAILABLE
+
+
+@pytest.fixture(params=[True, False], ids=["numba", "fallback"])
+def use_numba(request, monkeypatch):
+    """Runs a test with the kernels and again with the fallback path."""
+    monkeypatch.setattr(engineering, "NUMBA_AVAILABLE", request.param)
+    return request.param
+
+
+def make_prices(n: int = 300, seed: int = 0, nans=()) -> pd.Series:
+    """A random-walk price series, with NaNs at the given positions."""
+    values = 100.0 + np.random.default_rng(seed).standard_normal(n).cumsum()
+    values[list(nans)] = np.nan
+    index = pd.date_range("2025-01-01", periods=n, freq="min", tz="UTC", name="ts_utc")
+    return pd.Series(values, index=index, name="close")
+
+
+def reference_crossover(prices: pd.Series, fast_window: int, slow_window: int) -> pd.Series:
+    """Crossover events from pandas rolling means (a missing SMA is not above)."""
+    fast = prices.rolling(fast_window).mean()
+    slow = prices.rolling(slow_window).mean()
+    above = (fast > slow).astype(np.int8)
+    return above.diff().fillna(0).astype(np.int8)
+
+
+_NAN_CASES = [(), (0, 1, 2), (50,), (120, 121, 199)]
+
+
+@pytest.mark.parametrize("nans", _NAN_CASES)
+@pytest.mark.parametrize("window", [1, 5, 20])
+def test_sma_matches_rolling_mean(use_numba, nans, window):
+    prices = make_prices(nans=nans)
+    pd.testing.assert_series_equal(
+        calculate_sma(prices, window), prices.rolling(window).mean(), rtol=1e-12
+    )
+
+
+@pytest.mark.parametrize("nans", _NAN_CASES)
+@pytest.mark.parametrize("window", [1, 5, 20])
+def test_ema_matches_ewm(use_numba, nans, window):
+    prices = make_prices(nans=nans)
+    pd.testing.assert_series_equal(
+        calculate_ema(prices, window),
+        prices.ewm(span=window, adjust=False).mean(),
+        rtol=1e-12,
+    )
+
+
+@pytest.mark.parametrize("nans", _NAN_CASES)
+@pytest.mark.parametrize("fast_window, slow_window", [(3, 10), (5, 20), (10, 50)])
+def test_sma_crossover_matches_rolling_reference(use_numba, nans, fast_window, slow_window):
+    prices = make_prices(nans=nans)
+    events = calculate_sma_crossover(prices, fast_window, slow_window)
+    assert events.dtype == np.int8
+    pd.testing.assert_series_equal(
+        events, reference_crossover(prices, fast_window, slow_window)
+    )
+    # Events alternate: every -1 closes an earlier +1
+    nonzero = events[events != 0].to_numpy()
+    assert np.all(nonzero[::2] == 1) and np.all(nonzero[1::2] == -1)
+
+
+def test_sma_crossover_panel_matches_per_column(use_numba):
+    panel = pd.DataFrame(
+        {
+            "AAA": make_prices(seed=1),
+            "BBB": make_prices(seed=2, nans=(40, 41)),
+            "CCC": make_prices(seed=3, nans=range(10)),
+        }
+    )
+    events = calculate_sma_crossover_panel(panel, 5, 20)
+    assert (events.dtypes == np.int8).all()
+    for symbol in panel.columns:
+        expected = reference_crossover(panel[symbol], 5, 20).rename(symbol)
+        pd.testing.assert_series_equal(events[symbol], expected)
+
+
+def test_empty_input(use_numba):
+    prices = make_prices(n=0)
+    assert calculate_sma(prices, 5).empty
+    assert calculate_ema(prices, 5).empty
+    events = calculate_sma_crossover(prices, 3, 10)
+    assert events.empty and events.dtype == np.int8
+    assert calculate_sma_crossover_panel(pd.DataFrame({"AAA": prices}), 3, 10).empty
+
+
+def test_short_input_has_no_crossovers(use_numba):
+    prices = make_prices(n=5)
+    assert calculate_sma(prices, 10).isna().all()
+    assert (calculate_sma_crossover(prices, 3, 10) == 0).all()
+
+
+def test_invalid_windows():
+    prices = make_prices(n=10)
+    with pytest.raises(ValueError):
+        calculate_sma(prices, 0)
+    with pytest.raises(ValueError):
+        calculate_ema(prices, 0)
+    with pytest.raises(ValueError):
+        calculate_sma_crossover(prices, 0, 5)
+    with pytest.raises(ValueError):
+        calculate_sma_crossover_panel(prices.to_frame(), 3, -1)
+
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="cfunc requires Numba")
+@pytest.mark.parametrize("nans", [(), (30, 31)])
+def test_sma_crossover_cfunc_matches_python_api(nans):
+    """The C-callable kernel writes the same events through raw pointers."""
+    prices = make_prices(nans=nans)
+    close = np.ascontiguousarray(prices.to_numpy(dtype=np.float64))
+    out = np.full(len(close), 7, dtype=np.int8)
+    engineering.get_sma_crossover_cfunc().ctypes(
+        close.ctypes.data_as(ctypes.POINTER(ctypes.c_double)),
+        len(close),
+        5,
+        20,
+        out.ctypes.data_as(ctypes.POINTER(ctypes.c_int8)),
+    )
+    np.testing.assert_array_equal(out, calculate_sma_crossover(prices, 5, 20).to_numpy())
+
+
+def test_sma_crossover_cfunc_requires_numba(monkeypatch):
+    """Without Numba the C-callable kernel cannot be built."""
+    monkeypatch.setattr(engineering, "NUMBA_AVAILABLE", False)
+    engineering.get_sma_crossover_cfunc.cache_clear()
+    with pytest.raises(RuntimeError):
+        engineering.get_sma_crossover_cfunc()
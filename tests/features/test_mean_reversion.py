@@ -0,0 +1,74 @@
+"""
+Tests for the rolling z-score kernel against its pandas reference.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from qt.features.signals import mean_reversion
+from qt.features.signals.mean_reversion import calculate_zscore
+
+
+@pytest.fixture(params=[True, False], ids=["numba", "fallback"])
+def use_numba(request, monkeypatch):
+    """Runs a test with the kernel and again with the pandas fallback."""
+    monkeypatch.setattr(mean_reversion, "NUMBA_AVAILABLE", request.param)
+    return request.param
+
+
+def reference_zscore(prices: pd.Series, window: int) -> pd.Series:
+    """
+    Two-pass z-score over explicit windows. More accurate than pandas'
+    online rolling std when a window's values are nearly equal.
+    """
+    x = prices.to_numpy(dtype=np.float64)
+    out = np.full(len(x), np.nan)
+    if len(x) >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(x, window)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z = (x[window - 1 :] - windows.mean(axis=1)) / windows.std(axis=1, ddof=1)
+        out[window - 1 :] = np.where(np.isfinite(z), z, np.nan)
+    return pd.Series(out, index=prices.index, name=prices.name)
+
+
+def make_prices(n: int = 300, level: float = 100.0, nans=()) -> pd.Series:
+    values = level + np.random.default_rng(0).standard_normal(n).cumsum()
+    values[list(nans)] = np.nan
+    index = pd.date_range("2025-01-01", periods=n, freq="min", tz="UTC", name="ts_utc")
+    return pd.Series(values, index=index, name="close")
+
+
+@pytest.mark.parametrize("nans", [(), (0, 1), (100,), (150, 151, 152)])
+@pytest.mark.parametrize("window", [2, 5, 20])
+def test_zscore_matches_rolling_reference(use_numba, nans, window):
+    prices = make_prices(nans=nans)
+    pd.testing.assert_series_equal(
+        calculate_zscore(prices, window), reference_zscore(prices, window), rtol=1e-6
+    )
+
+
+def test_zscore_is_accurate_far_from_zero(use_numba):
+    """Prices with a large level don't lose the variance to cancellation."""
+    prices = make_prices(level=1e7)
+    pd.testing.assert_series_equal(
+        calculate_zscore(prices, 20), reference_zscore(prices, 20), rtol=1e-6
+    )
+
+
+def test_zscore_flat_window_is_nan(use_numba):
+    """A window with zero variance has no z-score."""
+    prices = pd.Series([1.0, 2.0, 3.0, 3.0, 3.0, 3.0, 4.0])
+    zscore = calculate_zscore(prices, 3)
+    assert zscore.iloc[:2].isna().all()
+    assert zscore.iloc[4:6].isna().all()
+    assert zscore.iloc[6] == pytest.approx(reference_zscore(prices, 3).iloc[6])
+
+
+def test_zscore_empty_and_short_input(use_numba):
+    assert calculate_zscore(make_prices(n=0), 5).empty
+    assert calculate_zscore(make_prices(n=3), 5).isna().all()
+
+
+def test_zscore_rejects_small_window():
+    with pytest.raises(ValueError):
+        calculate_zscore(make_prices(n=10), 1)
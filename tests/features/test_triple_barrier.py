@@ -0,0 +1,92 @@
+"""
+Tests for the triple-barrier labeling kernel against a pandas reference.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from qt.features.labeling.triple_barrier import apply_triple_barrier
+
+_INDEX = pd.date_range("2025-01-01", periods=200, freq="h", tz="UTC", name="ts_utc")
+
+
+def make_prices(seed: int = 0) -> pd.Series:
+    steps = np.random.default_rng(seed).standard_normal(len(_INDEX)) * 0.01
+    return pd.Series(100.0 * np.exp(steps.cumsum()), index=_INDEX, name="close")
+
+
+def reference_labels(prices, events, profit_take_pct, stop_loss_pct, time_barrier):
+    """Labels each event by slicing the price path up to its time barrier."""
+    touch_times, labels = [], []
+    for t in events.index:
+        path = prices[prices.index >= t]
+        if path.empty:
+            touch_times.append(pd.NaT)
+            labels.append(0)
+            continue
+        start = path.index[0]
+        path = path[path.index <= start + time_barrier]
+        p0 = path.iloc[0]
+        after = path.iloc[1:]
+        hits = after[(after >= p0 * (1 + profit_take_pct)) | (after <= p0 * (1 - stop_loss_pct))]
+        if hits.empty:
+            touch_times.append(path.index[-1])
+            labels.append(0)
+        else:
+            touch_times.append(hits.index[0])
+            labels.append(1 if hits.iloc[0] > p0 else -1)
+    return pd.DataFrame(
+        {
+            "touch_time": pd.DatetimeIndex(touch_times, tz="UTC"),
+            "label": np.array(labels, dtype=np.int8),
+        },
+        index=events.index,
+    )
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize(
+    "profit_take_pct, stop_loss_pct, time_barrier",
+    [(0.02, 0.02, pd.Timedelta(hours=12)), (0.05, 0.01, pd.Timedelta(days=3))],
+)
+def test_triple_barrier_matches_reference(seed, profit_take_pct, stop_loss_pct, time_barrier):
+    prices = make_prices(seed)
+    # Events on and between bars, one after the last bar
+    event_times = list(_INDEX[::7]) + [_INDEX[3] + pd.Timedelta(minutes=30)]
+    event_times.append(_INDEX[-1] + pd.Timedelta(hours=1))
+    events = pd.Series(1.0, index=pd.DatetimeIndex(sorted(event_times)))
+
+    labels = apply_triple_barrier(prices, events, profit_take_pct, stop_loss_pct, time_barrier)
+    expected = reference_labels(prices, events, profit_take_pct, stop_loss_pct, time_barrier)
+    pd.testing.assert_frame_equal(labels, expected, check_freq=False)
+    # All three barriers are exercised
+    assert set(labels["label"]) == {-1, 0, 1}
+
+
+def test_triple_barrier_late_event_is_unlabeled():
+    prices = make_prices()
+    events = pd.Series(1.0, index=pd.DatetimeIndex([_INDEX[-1] + pd.Timedelta(hours=1)]))
+    labels = apply_triple_barrier(prices, events, 0.01, 0.01, pd.Timedelta(hours=5))
+    assert labels["touch_time"].isna().all()
+    assert labels["label"].tolist() == [0]
+
+
+def test_triple_barrier_empty_inputs():
+    prices = make_prices()
+    no_events = pd.Series(dtype=float, index=pd.DatetimeIndex([], tz="UTC"))
+    labels = apply_triple_barrier(prices, no_events, 0.01, 0.01, pd.Timedelta(hours=5))
+    assert labels.empty
+    assert list(labels.columns) == ["touch_time", "label"]
+
+    no_prices = prices.iloc[:0]
+    events = pd.Series(1.0, index=_INDEX[:2])
+    labels = apply_triple_barrier(no_prices, events, 0.01, 0.01, pd.Timedelta(hours=5))
+    assert labels["touch_time"].isna().all()
+    assert labels["label"].tolist() == [0, 0]
+
+
+def test_triple_barrier_rejects_non_positive_barriers():
+    prices = make_prices()
+    events = pd.Series(1.0, index=_INDEX[:2])
+    with pytest.raises(ValueError):
+        apply_triple_barrier(prices, events, 0.0, 0.01, pd.Timedelta(hours=5))
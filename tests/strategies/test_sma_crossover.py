@@ -0,0 +1,40 @@
+"""
+Tests for the SMA crossover strategy's signal inspection.
+"""
+import pickle
+import pandas as pd
+import pytest
+
+from qt.strategies.sma_crossover import SmaCrossoverStrategy
+
+_PARAMS = {"universe": ["AAA"], "fast_window": 2, "slow_window": 3}
+_INDEX = pd.date_range("2025-01-01", periods=6, freq="D", tz="UTC", name="ts_utc")
+
+
+def test_signals_property_is_read_only():
+    """`signals` is derived from the signal arrays and can't be assigned."""
+    strategy = SmaCrossoverStrategy(_PARAMS)
+    assert strategy.signals is None
+
+    strategy.initialize(
+        pd.DataFrame({"symbol": "AAA", "close": [1.0, 2.0, 3.0, 2.0, 1.0, 3.0]}, index=_INDEX)
+    )
+    assert strategy.signals["signal"].tolist() == [0, 0, 1, 0, -1, 0]
+    pd.testing.assert_index_equal(strategy.signals.index, _INDEX)
+
+    with pytest.raises(AttributeError):
+        strategy.signals = pd.DataFrame()
+
+    restored = pickle.loads(pickle.dumps(strategy))
+    pd.testing.assert_frame_equal(restored.signals, strategy.signals)
+
+
+@pytest.mark.parametrize("tz", [None, "America/New_York"])
+def test_signals_keep_the_input_time_zone(tz):
+    """Naive input stays naive; tz-aware input keeps its zone."""
+    index = pd.date_range("2025-01-01 09:30", periods=6, freq="D", tz=tz, name="ts_utc")
+    strategy = SmaCrossoverStrategy(_PARAMS)
+    strategy.initialize(
+        pd.DataFrame({"symbol": "AAA", "close": [1.0, 2.0, 3.0, 2.0, 1.0, 3.0]}, index=index)
+    )
+    pd.testing.assert_index_equal(strategy.signals.index, index)
@@ -0,0 +1,103 @@
+"""
+Tests for the memoization of `Strategy.initialize` across runs.
+"""
+from typing import Dict
+import numpy as np
+import pandas as pd
+
+from qt.events import BarEvent
+from qt.strategies.base import Strategy
+from qt.strategies.sma_crossover import SmaCrossoverStrategy
+from qt.types import TargetPositions
+
+_INDEX = pd.date_range("2025-01-01", periods=60, freq="D", tz="UTC", name="ts_utc")
+
+
+def _bars(symbol: str, seed: int) -> pd.DataFrame:
+    close = 100.0 + np.random.default_rng(seed).standard_normal(len(_INDEX)).cumsum()
+    return pd.DataFrame(
+        {"symbol": symbol, "close": close, "volume": 1e6, "venue": "XNYS"}, index=_INDEX
+    )
+
+
+class CountingStrategy(Strategy):
+    """Records how often `initialize` actually runs."""
+
+    cached_attributes = ("closes",)
+    cached_columns = ("close",)
+    calls = 0
+
+    def initialize_symbols(self, bars_by_symbol: Dict[str, pd.DataFrame]) -> None:
+        type(self).calls += 1
+        self.closes = bars_by_symbol[self.universe[0]]["close"].to_numpy().copy()
+
+    def on_data(self, bar_event: BarEvent) -> TargetPositions:
+        return {}
+
+
+def test_cache_hit_skips_initialize():
+    """
+    Re-initializing on the same inputs restores the cached state without
+    calling `initialize`; only the data the strategy reads is part of the key.
+    """
+    params = {"universe": ["AAA"], "seed": 1}
+    aaa = _bars("AAA", 0)
+    data = pd.concat([aaa, _bars("BBB", 1)])
+    CountingStrategy.calls = 0
+
+    first = CountingStrategy(params)
+    first.initialize_cached(data)
+    second = CountingStrategy(params)
+    second.initialize_cached(data)
+    assert CountingStrategy.calls == 1
+    assert second.closes is first.closes
+
+    # Columns and symbols outside the key don't invalidate it
+    other = pd.concat([aaa.assign(volume=2e6, venue="XNAS"), _bars("BBB", 2)])
+    CountingStrategy(params).initialize_cached(other)
+    assert CountingStrategy.calls == 1
+
+    # A changed close price, or different params, is a miss
+    changed = aaa.assign(close=aaa["close"] + 1.0)
+    CountingStrategy(params).initialize_cached(changed)
+    assert CountingStrategy.calls == 2
+    CountingStrategy({**params, "seed": 2}).initialize_cached(data)
+    assert CountingStrategy.calls == 3
+
+
+def test_sma_crossover_cache_hit_matches_fresh_initialize():
+    """A cache hit leaves the SMA strategy in the same state as `initialize`."""
+    params = {"universe": ["AAA"], "fast_window": 3, "slow_window": 10}
+    data = _bars("AAA", 3)
+
+    SmaCrossoverStrategy(params).initialize_cached(data)
+    cached = SmaCrossoverStrategy(params)
+    cached.initialize_cached(data)
+    fresh = SmaCrossoverStrategy(params)
+    fresh.initialize(data)
+
+    np.testing.assert_array_equal(cached._signal_arr, fresh._signal_arr)
+    np.testing.assert_array_equal(cached._ts_int64, fresh._ts_int64)
+
+
+class FrameStrategy(Strategy):
+    """Written against the single-DataFrame `initialize`."""
+
+    cached_attributes = ("rows",)
+
+    def initialize(self, historical_data: pd.DataFrame) -> None:
+        self.rows = int((historical_data["symbol"] == self.universe[0]).sum())
+        self.signals = historical_data[["close"]]
+
+    def on_data(self, bar_event: BarEvent) -> TargetPositions:
+        return {}
+
+
+def test_initialize_overrides_get_the_whole_frame():
+    """Strategies overriding `initialize` still receive the full DataFrame."""
+    data = pd.concat([_bars("AAA", 0), _bars("BBB", 1).iloc[:5]])
+    strategy = FrameStrategy({"universe": ["BBB"]})
+    assert strategy.signals is None
+    strategy.initialize_cached(data)
+    assert strategy.rows == 5
+    assert len(strategy.signals) == len(data)